@@ -0,0 +1,20 @@
+"""EventFlow page-load probe.
+
+Loads many ``base URL x route`` targets through one shared Chromium and a
+bounded pool of browser contexts, and reports structured timings per target.
+
+Run ``python -m eventflow_probe --help`` for the CLI.
+"""
+
+from .engine import ProbeEngine, ProbeResult, Target
+from .routes import APP_TSX, RouteSpec, build_targets, load_routes
+
+__all__ = [
+    "APP_TSX",
+    "ProbeEngine",
+    "ProbeResult",
+    "RouteSpec",
+    "Target",
+    "build_targets",
+    "load_routes",
+]
@@ -0,0 +1,180 @@
+"""Benchmark result store and baseline regression check.
+
+Runs are kept in a small SQLite file, one row per sample::
+
+    runs(id, git_sha, git_dirty, created_at, label, is_baseline)
+    samples(run_id, route, cache, metric, value)
+
+Samples are keyed by route rather than full URL, so a baseline recorded on
+one dev server compares against a run on another.
+"""
+
+import sqlite3
+import subprocess
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from . import stats
+
+DEFAULT_DB = Path(__file__).resolve().parent.parent / ".perf" / "bench.sqlite"
+
+# Metrics the regression gate looks at unless told otherwise.
+GATE_METRICS = ("root_content_ms", "lcp_ms", "total_blocking_time_ms")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    git_sha TEXT NOT NULL,
+    git_dirty INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    label TEXT,
+    is_baseline INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS samples (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    route TEXT NOT NULL,
+    cache TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS samples_run ON samples(run_id, route, cache, metric);
+CREATE INDEX IF NOT EXISTS runs_sha ON runs(git_sha);
+"""
+
+
+def git_revision(cwd=None):
+    """Return ``(sha, dirty)`` for the working tree, or ``("unknown", False)``."""
+    try:
+        sha = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=cwd, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+    return sha, bool(status.strip())
+
+
+class ResultStore:
+    def __init__(self, path=DEFAULT_DB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path)
+        self._db.execute("PRAGMA foreign_keys = ON")
+        self._db.executescript(_SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def save_run(self, results, metrics, git_sha, git_dirty=False, label=None, is_baseline=False):
+        """Store every successful result's metrics; returns the new run id."""
+        with self._db:
+            if is_baseline:
+                self._db.execute("UPDATE runs SET is_baseline = 0")
+            run_id = self._db.execute(
+                "INSERT INTO runs (git_sha, git_dirty, created_at, label, is_baseline) VALUES (?, ?, ?, ?, ?)",
+                (git_sha, int(git_dirty), time.time(), label, int(is_baseline)),
+            ).lastrowid
+            rows = [
+                (run_id, urlsplit(r.target.url).path or "/", r.cache or "cold", name, r.metrics[name])
+                for r in results
+                if r.ok
+                for name in metrics
+                if r.metrics.get(name) is not None
+            ]
+            self._db.executemany(
+                "INSERT INTO samples (run_id, route, cache, metric, value) VALUES (?, ?, ?, ?, ?)", rows
+            )
+        return run_id
+
+    def mark_baseline(self, run_id):
+        """Make ``run_id`` the only baseline; returns False, leaving the baseline as it was, if no such run."""
+        with self._db:
+            if self._db.execute("SELECT 1 FROM runs WHERE id = ?", (run_id,)).fetchone() is None:
+                return False
+            self._db.execute("UPDATE runs SET is_baseline = 0")
+            self._db.execute("UPDATE runs SET is_baseline = 1 WHERE id = ?", (run_id,))
+        return True
+
+    def resolve(self, ref):
+        """Find a run id from ``baseline``, ``latest``, a numeric id or a SHA prefix."""
+        if ref == "baseline":
+            query, args = "SELECT id FROM runs WHERE is_baseline = 1", ()
+        elif ref == "latest":
+            query, args = "SELECT id FROM runs", ()
+        elif ref.isdigit():
+            query, args = "SELECT id FROM runs WHERE id = ?", (int(ref),)
+        else:
+            query, args = "SELECT id FROM runs WHERE git_sha LIKE ?", (ref + "%",)
+        row = self._db.execute(query + " ORDER BY id DESC LIMIT 1", args).fetchone()
+        return row[0] if row else None
+
+    def samples(self, run_id):
+        """``{(route, cache, metric): [values]}`` for one run."""
+        grouped = {}
+        for route, cache, metric, value in self._db.execute(
+            "SELECT route, cache, metric, value FROM samples WHERE run_id = ?", (run_id,)
+        ):
+            grouped.setdefault((route, cache, metric), []).append(value)
+        return grouped
+
+    def runs(self, limit=20):
+        return self._db.execute(
+            "SELECT r.id, r.git_sha, r.git_dirty, r.created_at, r.label, r.is_baseline, COUNT(s.value)"
+            " FROM runs r LEFT JOIN samples s ON s.run_id = r.id"
+            " GROUP BY r.id ORDER BY r.id DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+
+
+@dataclass
+class Comparison:
+    route: str
+    cache: str
+    metric: str
+    baseline_p50: float
+    candidate_p50: float
+    change: float
+    p_value: float
+    adjusted_p: float = None
+    regression: bool = False
+
+
+def compare(baseline, candidate, metrics=GATE_METRICS, alpha=0.05, min_effect=0.05):
+    """Compare two sample sets from :meth:`ResultStore.samples`.
+
+    A key is flagged as a regression when a one-sided Mann-Whitney U test is
+    significant after Holm correction across all compared keys, and the
+    median also moved by more than ``min_effect`` (relative).
+    """
+    comparisons = []
+    for key in sorted(baseline.keys() & candidate.keys()):
+        route, cache, metric = key
+        if metric not in metrics:
+            continue
+        base, cand = baseline[key], candidate[key]
+        base_p50, cand_p50 = stats.percentile(base, 50), stats.percentile(cand, 50)
+        _, p_value = stats.mann_whitney_greater(base, cand)
+        if base_p50:
+            change = (cand_p50 - base_p50) / base_p50
+        else:
+            change = float("inf") if cand_p50 > 0 else 0.0
+        comparisons.append(Comparison(route, cache, metric, base_p50, cand_p50, change, p_value))
+    adjusted = stats.holm_adjust([c.p_value for c in comparisons])
+    for comparison, p_adj in zip(comparisons, adjusted):
+        comparison.adjusted_p = p_adj
+        comparison.regression = p_adj < alpha and comparison.change > min_effect
+    return comparisons
@@ -0,0 +1,940 @@
+"""Command-line entry point: ``python -m eventflow_probe <command>``."""
+
+import argparse
+import asyncio
+import math
+import shutil
+import sys
+import time
+from dataclasses import asdict
+from urllib.parse import urlsplit
+
+from . import bench, cpuprofile, edgebench, fixtures, loadsim, network, queries, soak
+from . import metrics as page_metrics
+from .engine import ProbeEngine
+from .report import print_json, print_table
+from .routes import APP_TSX, RouteSpec, build_targets, load_routes
+from .standin import DEFAULT_SUPABASE_URL, SupabaseStandIn
+
+DEFAULT_BASE_URL = "http://127.0.0.1:5173"
+
+
+def _parse_param(value):
+    name, sep, param = value.partition("=")
+    if not sep or not name:
+        raise argparse.ArgumentTypeError(f"--param expects name=value, got {value!r}")
+    return name, param
+
+
+def _add_target_args(parser):
+    parser.add_argument(
+        "--base-url",
+        action="append",
+        dest="base_urls",
+        metavar="URL",
+        help=f"dev server to probe; repeatable (default {DEFAULT_BASE_URL})",
+    )
+    parser.add_argument(
+        "--route",
+        action="append",
+        dest="routes",
+        metavar="PATH",
+        help="route to probe; repeatable (default: every <Route> in App.tsx)",
+    )
+    parser.add_argument("--app-tsx", default=str(APP_TSX), help="App.tsx to read routes from")
+    parser.add_argument(
+        "--param",
+        action="append",
+        dest="params",
+        type=_parse_param,
+        metavar="NAME=VALUE",
+        help="value for a :param route segment, e.g. eventId=<uuid>; repeatable",
+    )
+    parser.add_argument(
+        "--include-redirects", action="store_true", help="also probe <Navigate> legacy routes"
+    )
+
+
+def _add_browser_args(parser):
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="pages loading at once (default 8)")
+    parser.add_argument(
+        "--wait-until",
+        default="load",
+        choices=("commit", "domcontentloaded", "load", "networkidle"),
+        help="navigation milestone goto() waits for (default load)",
+    )
+    parser.add_argument("--timeout", type=float, default=15.0, help="per-navigation timeout in seconds")
+    parser.add_argument("--headed", action="store_true", help="show the browser window")
+    parser.add_argument("--format", choices=("table", "json"), default="table", help="output format")
+
+
+def _add_backend_args(parser):
+    group = parser.add_argument_group(
+        "offline backend",
+        "Answer Supabase traffic in-process from fixture data. Start the dev server with "
+        "VITE_SUPABASE_URL set to --supabase-url and any VITE_SUPABASE_ANON_KEY.",
+    )
+    group.add_argument("--offline", action="store_true", help="use the local Supabase stand-in")
+    group.add_argument(
+        "--supabase-url",
+        default=DEFAULT_SUPABASE_URL,
+        help=f"VITE_SUPABASE_URL of the dev server (default {DEFAULT_SUPABASE_URL})",
+    )
+    group.add_argument("--participants", type=int, default=500, help="fixture participants in the main event")
+    group.add_argument("--events", type=int, default=3, help="fixture events")
+    group.add_argument(
+        "--messages-per-participant", type=int, default=0, help="fixture messages per participant (default 0)"
+    )
+    group.add_argument("--latency-ms", type=float, default=0.0, help="fixed latency added to each backend response")
+    group.add_argument("--jitter-ms", type=float, default=0.0, help="uniform +/- jitter on top of --latency-ms")
+    group.add_argument("--fixture-seed", type=int, default=0, help="RNG seed for fixture data and jitter")
+    group.add_argument(
+        "--seed-sql",
+        action="append",
+        metavar="PATH",
+        help="seed SQL to load rows from; repeatable, replaces the default (eventflow-scaffold/seed.sql)",
+    )
+    group.add_argument("--max-rows", type=int, default=1000, help="PostgREST max-rows cap (default 1000)")
+
+
+def _standin_from_args(args, participants=None, events=None):
+    if not args.offline:
+        return None
+    dataset = fixtures.generate(
+        participants=args.participants if participants is None else participants,
+        events=args.events if events is None else events,
+        seed=args.fixture_seed,
+        seed_sql=args.seed_sql or fixtures.DEFAULT_SEED_SQL,
+        messages_per_participant=args.messages_per_participant,
+    )
+    return SupabaseStandIn(
+        dataset,
+        supabase_url=args.supabase_url,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        seed=args.fixture_seed,
+        max_rows=args.max_rows,
+        allow_hosts={urlsplit(url).hostname for url in args.base_urls or [DEFAULT_BASE_URL]},
+    )
+
+
+def _report_standin(standin):
+    """Print the time spent inside the stand-in; it is part of every offline timing."""
+    if standin is None or not standin.service_ms:
+        return
+    summary = standin.service_summary()
+    print(
+        f"[STANDIN] {summary['requests']} requests, {summary['total_ms']:.0f} ms service time "
+        f"(p50 {summary['p50_ms']} ms, p95 {summary['p95_ms']} ms, max {summary['max_ms']} ms)",
+        file=sys.stderr,
+    )
+
+
+def _resolve_targets(args, standin=None):
+    if args.routes:
+        routes = [RouteSpec(path) for path in args.routes]
+    else:
+        routes = load_routes(args.app_tsx)
+    params = dict(args.params or ())
+    if standin:
+        params.setdefault("eventId", standin.dataset.primary_event_id)
+    targets, skipped = build_targets(
+        args.base_urls or [DEFAULT_BASE_URL],
+        routes,
+        params,
+        include_redirects=args.include_redirects,
+    )
+    for path in skipped:
+        print(f"[SKIP] {path}: missing --param for route parameter", file=sys.stderr)
+    return targets
+
+
+def _engine_from_args(args, standin=None, **kwargs):
+    if standin:
+        kwargs["context_hooks"] = [standin.install, *kwargs.get("context_hooks", ())]
+    return ProbeEngine(
+        concurrency=args.concurrency,
+        headless=not args.headed,
+        timeout_ms=args.timeout * 1000,
+        wait_until=args.wait_until,
+        **kwargs,
+    )
+
+
+async def _probe(args):
+    standin = _standin_from_args(args)
+    targets = _resolve_targets(args, standin)
+    if not targets:
+        print("No targets to probe.", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    on_result = (lambda r: print_json(r.to_dict())) if args.format == "json" else None
+    async with _engine_from_args(args, standin) as engine:
+        results = await engine.run(targets, on_result=on_result)
+    elapsed = time.perf_counter() - started
+    _report_standin(standin)
+
+    if args.format == "table":
+        rows = [
+            {
+                "target": r.target.url,
+                "status": r.status,
+                "goto_ms": r.timings.get("goto_ms"),
+                "total_ms": r.timings.get("total_ms"),
+                "root_len": r.root_html_length,
+                "errors": len(r.console_errors) + len(r.page_errors),
+                "failure": r.error,
+            }
+            for r in results
+        ]
+        print_table(rows, ["target", "status", "goto_ms", "total_ms", "root_len", "errors", "failure"])
+
+    failed = sum(not r.ok for r in results)
+    print(
+        f"{len(results)} targets in {elapsed:.1f}s (concurrency {args.concurrency}), {failed} failed",
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+
+def _add_measure_args(parser):
+    parser.add_argument("-n", "--runs", type=int, default=10, help="timed loads per target and cache mode")
+    parser.add_argument(
+        "--cache",
+        choices=("cold", "warm", "both"),
+        default="both",
+        help="cold = fresh context per load, warm = primed context (default both)",
+    )
+    parser.add_argument(
+        "--settle-ms", type=int, default=500, help="wait after #root renders for late LCP/CLS entries"
+    )
+    parser.add_argument(
+        "--pending-selector",
+        default=page_metrics.DEFAULT_PENDING_SELECTOR,
+        help="CSS selector that means #root is still showing a loading fallback",
+    )
+    parser.add_argument("--confidence", type=float, default=0.95, help="confidence level for intervals")
+
+
+async def _measure_all(engine, targets, args, on_result=None):
+    caches = ("cold", "warm") if args.cache == "both" else (args.cache,)
+
+    async def measure_one(target, cache):
+        runs = await engine.measure(target, args.runs, cache)
+        if on_result:
+            for result in runs:
+                on_result(result)
+        return runs
+
+    batches = await asyncio.gather(*(measure_one(t, c) for t in targets for c in caches))
+    return [result for batch in batches for result in batch]
+
+
+async def _measure(args):
+    standin = _standin_from_args(args)
+    targets = _resolve_targets(args, standin)
+    if not targets:
+        print("No targets to measure.", file=sys.stderr)
+        return 1
+
+    names = args.metrics or page_metrics.SUMMARY_METRICS
+    json_out = args.format == "json"
+    on_result = (lambda r: print_json({"kind": "run", **r.to_dict()})) if json_out else None
+    engine = _engine_from_args(
+        args,
+        standin,
+        collect_metrics=True,
+        settle_ms=args.settle_ms,
+        pending_selector=args.pending_selector,
+    )
+    async with engine:
+        results = await _measure_all(engine, targets, args, on_result)
+    _report_standin(standin)
+
+    summary = page_metrics.summarize_runs(results, names, args.confidence)
+    if json_out:
+        for row in summary:
+            print_json({"kind": "summary", **row})
+    else:
+        print_table(summary, ["target", "cache", "metric", "n", "p50", "p95", "p99", "ci_low", "ci_high"])
+
+    failed = [r for r in results if not r.ok]
+    for result in failed:
+        print(f"[FAIL] {result.target.url} ({result.cache} #{result.run}): {result.error}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+async def _bench(args):
+    standin = _standin_from_args(args)
+    targets = _resolve_targets(args, standin)
+    if not targets:
+        print("No targets to benchmark.", file=sys.stderr)
+        return 1
+
+    engine = _engine_from_args(
+        args,
+        standin,
+        collect_metrics=True,
+        settle_ms=args.settle_ms,
+        pending_selector=args.pending_selector,
+    )
+    async with engine:
+        results = await _measure_all(engine, targets, args)
+    _report_standin(standin)
+    failed = [r for r in results if not r.ok]
+    for result in failed:
+        print(f"[FAIL] {result.target.url} ({result.cache} #{result.run}): {result.error}", file=sys.stderr)
+
+    sha, dirty = bench.git_revision()
+    with bench.ResultStore(args.db) as store:
+        baseline_id = store.resolve(args.baseline)
+        run_id = store.save_run(
+            results,
+            page_metrics.SUMMARY_METRICS,
+            sha,
+            git_dirty=dirty,
+            label=args.label,
+            is_baseline=args.mark_baseline,
+        )
+        print(f"Saved run {run_id} ({sha[:10]}{'+dirty' if dirty else ''}) to {args.db}", file=sys.stderr)
+        if baseline_id is None:
+            print(f"No run matches baseline {args.baseline!r}; nothing to compare.", file=sys.stderr)
+            return 1 if failed else 0
+        comparisons = bench.compare(
+            store.samples(baseline_id),
+            store.samples(run_id),
+            metrics=args.gate_metrics or bench.GATE_METRICS,
+            alpha=args.alpha,
+            min_effect=args.min_effect,
+        )
+
+    if args.format == "json":
+        for comparison in comparisons:
+            print_json({"baseline_run": baseline_id, "run": run_id, **asdict(comparison)})
+    else:
+        print_table(
+            [asdict(c) for c in comparisons],
+            ["route", "cache", "metric", "baseline_p50", "candidate_p50", "change", "adjusted_p", "regression"],
+        )
+    regressions = [c for c in comparisons if c.regression]
+    for c in regressions:
+        print(
+            f"[REGRESSION] {c.route} {c.cache} {c.metric}: "
+            f"p50 {c.baseline_p50:.1f} -> {c.candidate_p50:.1f} (+{c.change:.0%}, p={c.adjusted_p:.4f})",
+            file=sys.stderr,
+        )
+    print(f"Compared run {run_id} against run {baseline_id}: {len(regressions)} regressions", file=sys.stderr)
+    return 1 if failed or regressions else 0
+
+
+async def _bench_runs(args):
+    with bench.ResultStore(args.db) as store:
+        if args.mark_baseline is not None and not store.mark_baseline(args.mark_baseline):
+            print(f"No run with id {args.mark_baseline}; the baseline is unchanged.", file=sys.stderr)
+            return 1
+        rows = [
+            {
+                "id": run_id,
+                "git_sha": sha[:10] + ("+dirty" if dirty else ""),
+                "created": time.strftime("%Y-%m-%d %H:%M", time.localtime(created)),
+                "label": label,
+                "baseline": "*" if is_baseline else "",
+                "samples": samples,
+            }
+            for run_id, sha, dirty, created, label, is_baseline, samples in store.runs(args.limit)
+        ]
+    print_table(rows, ["id", "git_sha", "created", "label", "baseline", "samples"])
+    return 0
+
+
+def _parse_scale(value):
+    participants, _, events = value.partition(":")
+    try:
+        return int(participants), int(events) if events else None
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"--scale expects PARTICIPANTS[:EVENTS], got {value!r}") from None
+
+
+async def _queries(args):
+    scales = args.scales if args.offline and args.scales else [(None, None)]
+    probe = queries.QueryProbe(quiet_ms=args.quiet_ms, repeat_threshold=args.repeat_threshold)
+    rows, counts, run_scales, load_errors = [], {}, [], 0
+    for participants, events in scales:
+        standin = _standin_from_args(args, participants, events)
+        targets = _resolve_targets(args, standin)
+        if not targets:
+            print("No targets to check.", file=sys.stderr)
+            return 1
+        sizes = standin.dataset.counts() if standin else {}
+        scale = (sizes.get("participants"), sizes.get("events"))
+        run_scales.append(scale)
+        async with _engine_from_args(args, standin, page_probes=[probe]) as engine:
+            results = await engine.run(targets)
+        _report_standin(standin)
+        for result in results:
+            summary = result.probes.get("queries")
+            if summary is None:
+                print(f"[FAIL] {result.target.url}: {result.error}", file=sys.stderr)
+                counts.setdefault(result.target.url, {})[scale] = None
+                load_errors += 1
+                continue
+            counts.setdefault(result.target.url, {})[scale] = summary["round_trips"]
+            rows.append({"target": result.target.url, "participants": scale[0], "events": scale[1], **summary})
+
+    if args.format == "json":
+        for row in rows:
+            print_json(row)
+    else:
+        for row in rows:
+            row["max_repeat"] = max((r["count"] for r in row["repeated_shapes"]), default=0)
+        print_table(
+            rows,
+            ["target", "participants", "events", "round_trips", "bytes", "busy_ms", "standin_ms", "waterfall_depth",
+             "max_repeat"],
+        )
+
+    repeated = [(row, shape) for row in rows for shape in row["repeated_shapes"]]
+    for row, shape in repeated:
+        print(
+            f"[N+1] {row['target']}: {shape['count']}x {shape['shape']} ({shape['distinct_values']} distinct values)",
+            file=sys.stderr,
+        )
+    grown = {url: queries.growth(by_scale, args.allow_growth, run_scales) for url, by_scale in counts.items()}
+    for url, increase in grown.items():
+        by_scale = counts[url]
+        if increase == math.inf:
+            missing = [scale for scale in run_scales if by_scale.get(scale) is None]
+            print(
+                f"[GROWTH] {url}: failed to load at (participants, events) {', '.join(map(str, missing))}",
+                file=sys.stderr,
+            )
+        elif increase:
+            print(
+                f"[GROWTH] {url}: round trips {by_scale[min(by_scale)]} -> {by_scale[max(by_scale)]} "
+                f"as (participants, events) go {min(by_scale)} -> {max(by_scale)}",
+                file=sys.stderr,
+            )
+    failed = load_errors or any(grown.values()) or (args.fail_on_repeats and repeated)
+    return 1 if failed else 0
+
+
+async def _network(args):
+    standin = _standin_from_args(args)
+    targets = _resolve_targets(args, standin)
+    if not targets:
+        print("No targets to record.", file=sys.stderr)
+        return 1
+    probe = network.NetworkProbe(
+        manual_chunks=network.load_manual_chunks(args.vite_config),
+        budgets={} if args.no_budgets else network.load_budgets(args.budget_script),
+        quiet_ms=args.quiet_ms,
+        keep_waterfall=bool(args.waterfall_dir),
+    )
+    engine = _engine_from_args(args, standin, collect_metrics=True, page_probes=[probe])
+    async with engine:
+        groups = await asyncio.gather(*(engine.measure(target, 1, args.cache) for target in targets))
+    results = [result for group in groups for result in group]
+
+    rows = []
+    for result in results:
+        summary = result.probes.get("network")
+        if summary is None:
+            print(f"[FAIL] {result.target.url}: {result.error}", file=sys.stderr)
+            continue
+        waterfall = summary.pop("waterfall", None)
+        if waterfall is not None:
+            path = network.write_waterfall(args.waterfall_dir, result.target, waterfall, summary["render_ms"])
+            print(f"Wrote {path}", file=sys.stderr)
+        rows.append({"target": result.target.url, **summary})
+
+    if args.format == "json":
+        for row in rows:
+            print_json(row)
+    else:
+        for row in rows:
+            row["duplicate_downloads"] = sum(d["count"] - 1 for d in row["duplicates"])
+        print_table(
+            rows,
+            ["target", "requests", "transfer_bytes", "decoded_bytes", "js_decoded_bytes", "render_ms",
+             "critical_path_depth", "preloadable_ms", "duplicate_downloads"],
+        )
+
+    for row in rows:
+        for item in row["preloadable"]:
+            print(
+                f"[PRELOAD] {row['target']}: {item['chunk']} started {item['late_by_ms']:.0f} ms after the HTML",
+                file=sys.stderr,
+            )
+        for dup in row["duplicates"]:
+            print(
+                f"[DUP] {row['target']}: {dup['count']}x {dup['url']} ({dup['wasted_bytes']} bytes wasted)",
+                file=sys.stderr,
+            )
+        for chunk, paths in row["duplicate_chunks"].items():
+            print(
+                f"[DUP] {row['target']}: chunk {chunk} loaded from {len(paths)} files: {', '.join(paths)}",
+                file=sys.stderr,
+            )
+        for over in row["over_budget"]:
+            print(
+                f"[BUDGET] {row['target']}: {over['chunk']} = {over['decoded_bytes'] / 1024:.2f} KB "
+                f"(max {over['max_bytes'] / 1024:.2f} KB)",
+                file=sys.stderr,
+            )
+    failed = len(rows) < len(results) or any(row["over_budget"] for row in rows)
+    return 1 if failed else 0
+
+
+async def _soak(args):
+    standin = _standin_from_args(args)
+    json_out = args.format == "json"
+
+    def on_sample(sample):
+        if json_out:
+            print_json({"kind": "sample", **sample})
+        if sample.get("snapshot"):
+            print(f"[SNAPSHOT] cycle {sample['cycle']} {sample['route']}: {sample['snapshot']}", file=sys.stderr)
+
+    async with _engine_from_args(args, standin) as engine:
+        context = await engine.pool.new_context()
+        try:
+            run = soak.SoakRun(
+                await context.new_page(),
+                (args.base_urls or [DEFAULT_BASE_URL])[0],
+                routes=args.routes or soak.DEFAULT_ROUTES,
+                dwell_ms=args.dwell_ms,
+                timeout_ms=engine.timeout_ms,
+                snapshot_dir=args.snapshot_dir,
+                snapshot_growth_mb=args.snapshot_growth_mb,
+                max_snapshots=args.max_snapshots,
+                warmup_cycles=args.warmup,
+            )
+            samples = await run.run(args.cycles, args.duration * 60 if args.duration else None, on_sample)
+        finally:
+            await context.close()
+
+    rows = soak.leak_report(samples, args.warmup, args.leak_kb, args.leak_nodes)
+    if json_out:
+        for row in rows:
+            print_json({"kind": "route", **row})
+    else:
+        print_table(
+            rows,
+            ["route", "samples", "errors", "heap_start_mb", "heap_end_mb", "heap_used_bytes_per_cycle",
+             "heap_mb_per_hour", "dom_nodes_per_cycle", "listeners_per_cycle", "detached_nodes_per_cycle", "leak"],
+        )
+    for row in rows:
+        if row["leak"]:
+            print(
+                f"[LEAK] {row['route']}: heap {row['heap_used_bytes_per_cycle'] / 1024:+.0f} KB/cycle, "
+                f"DOM nodes {row['dom_nodes_per_cycle']:+.0f}/cycle",
+                file=sys.stderr,
+            )
+    return 1 if any(row["leak"] for row in rows) else 0
+
+
+async def _profile(args):
+    standin = _standin_from_args(args)
+    interactions = [cpuprofile.INTERACTIONS[name] for name in args.interactions or cpuprofile.INTERACTIONS]
+    async with _engine_from_args(args, standin) as engine:
+        profiler = cpuprofile.Profiler(
+            engine,
+            (args.base_urls or [DEFAULT_BASE_URL])[0],
+            args.out_dir,
+            repeat=args.repeat,
+            top=args.top,
+            sampling_us=args.sampling_us,
+            trace=not args.no_trace,
+        )
+        # Tracing is browser-wide, so interactions run one after another.
+        results = [await profiler.run(interaction) for interaction in interactions]
+
+    if args.format == "json":
+        for result in results:
+            print_json(result)
+    else:
+        print_table(
+            results,
+            ["interaction", "duration_ms", "cpu_ms", "react_commits", "react_commit_ms", "scripting_ms",
+             "rendering_ms", "painting_ms", "long_tasks"],
+        )
+        for result in results:
+            if result.get("top"):
+                print(f"\n{result['interaction']}: top {len(result['top'])} by self time")
+                print_table(result["top"], ["function", "self_ms", "self_pct", "total_ms"])
+    for result in results:
+        if result["error"]:
+            print(f"[FAIL] {result['interaction']} ({result['route']}): {result['error']}", file=sys.stderr)
+        for path in result.get("files", ()):
+            print(f"Wrote {path}", file=sys.stderr)
+    return 1 if any(result["error"] for result in results) else 0
+
+
+async def _checkin(args):
+    args.offline = True
+    standin = _standin_from_args(args, participants=max(args.participants, args.guests))
+    # CheckinPage loads every participant of the event in one select.
+    standin.store.max_rows = max(standin.store.max_rows, len(standin.dataset.tables["participants"]))
+    json_out = args.format == "json"
+
+    def on_sample(row):
+        if json_out:
+            print_json({"kind": "sample", **row})
+
+    async with _engine_from_args(args, standin) as engine:
+        simulation = loadsim.CheckinSimulation(
+            engine,
+            standin,
+            (args.base_urls or [DEFAULT_BASE_URL])[0],
+            devices=args.devices,
+            guests=args.guests,
+            scan_interval_ms=args.scan_interval_ms,
+            outages=args.outages or (),
+            outage_jitter_s=args.outage_jitter,
+            sample_ms=args.sample_ms,
+            drain_timeout_s=args.drain_timeout,
+            seed=args.fixture_seed,
+        )
+        summary = await simulation.run(on_sample)
+    _report_standin(standin)
+
+    if json_out:
+        print_json({"kind": "summary", **summary})
+    else:
+        print_table(
+            simulation.timeline,
+            ["t_s", "online", "scanned", "queue_depth", "retries", "server_checked_in", "sync_requests"],
+        )
+        print()
+        print_table(
+            [{"metric": k, "value": v} for k, v in summary.items() if k != "device_errors"], ["metric", "value"]
+        )
+    for error in summary["device_errors"]:
+        print(f"[FAIL] device did not reach scan mode: {error}", file=sys.stderr)
+    if summary["consistent_at_s"] is None:
+        print(
+            f"[STALL] {summary['unsynced']} check-ins still queued and server has "
+            f"{summary['server_checked_in']}/{summary['scanned']} after {args.drain_timeout:g}s",
+            file=sys.stderr,
+        )
+        return 1
+    return 1 if summary["device_errors"] else 0
+
+
+async def _edge(args):
+    args.offline, args.base_urls = True, None
+    if not args.runtime_url and not shutil.which(args.deno):
+        print(f"[FAIL] {args.deno} not found; install Deno or pass --runtime-url", file=sys.stderr)
+        return 1
+    standin = _standin_from_args(args)
+    stub = await edgebench.UpstreamStub(standin, args.ai_latency_ms, args.whatsapp_latency_ms).start(args.stub_port)
+    json_out = args.format == "json"
+    rows = []
+    try:
+        for name in args.functions or edgebench.DEFAULT_FUNCTIONS:
+            print(f"[EDGE] {name}: {args.rps:g} rps x{args.batch} for {args.duration:g}s", file=sys.stderr)
+            row = await edgebench.bench_function(
+                name,
+                edgebench.SCENARIOS[name],
+                standin,
+                stub,
+                rps=args.rps,
+                duration_s=args.duration,
+                batch=args.batch,
+                arrival=args.arrival,
+                max_inflight=args.max_inflight,
+                drain_timeout_s=args.drain_timeout,
+                warmup=args.warmup,
+                cold_runs=args.cold_runs,
+                functions_dir=args.functions_dir,
+                deno=args.deno,
+                runtime_url=args.runtime_url,
+                seed=args.fixture_seed,
+            )
+            rows.append(row)
+            if json_out:
+                print_json({"kind": "function", **row})
+    finally:
+        await stub.close()
+    _report_standin(standin)
+
+    if not json_out:
+        print_table(rows, ["function", "requests", "ok", "dropped", "rps_target", "rps_achieved", "p50_ms",
+                           "p95_ms", "p99_ms", "max_ms", "cold_boot_ms", "cold_first_ms", "warm_p50_ms",
+                           "loaded_p50_ms", "peak_rss_mb"])
+        for row in rows:
+            if row.get("histogram"):
+                buckets = ", ".join(f"{k}={v}" for k, v in row["histogram"].items() if v)
+                print(f"  {row['function']}: {buckets}; upstream {row['upstream']}")
+    failed = 0
+    for row in rows:
+        if row["error"]:
+            print(f"[FAIL] {row['function']}: {row['error']}", file=sys.stderr)
+            failed += 1
+        elif row["ok"] < row["requests"]:
+            print(f"[ERRORS] {row['function']}: {row['statuses']}", file=sys.stderr)
+            failed += 1
+        if row.get("whatsapp_sends_per_s"):
+            minutes = args.fanout_guests / row["whatsapp_sends_per_s"] / 60
+            print(
+                f"[FANOUT] {row['function']}: {row['whatsapp_sends_per_s']:g} WhatsApp sends/s, "
+                f"{args.fanout_guests} guests take ~{minutes:.1f} min",
+                file=sys.stderr,
+            )
+    return 1 if failed else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="eventflow_probe", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    probe = commands.add_parser("probe", help="load every target once and print timings")
+    _add_target_args(probe)
+    _add_browser_args(probe)
+    _add_backend_args(probe)
+    probe.set_defaults(handler=_probe)
+
+    measure = commands.add_parser(
+        "measure", help="repeat loads and report Navigation/Paint Timing and Web Vitals percentiles"
+    )
+    _add_target_args(measure)
+    _add_browser_args(measure)
+    _add_measure_args(measure)
+    _add_backend_args(measure)
+    measure.add_argument(
+        "--metric",
+        action="append",
+        dest="metrics",
+        choices=page_metrics.SUMMARY_METRICS,
+        help="metric to summarize; repeatable (default: all)",
+    )
+    measure.set_defaults(handler=_measure)
+
+    bench_cmd = commands.add_parser(
+        "bench", help="measure, store results by git SHA, and fail on regressions against a baseline"
+    )
+    _add_target_args(bench_cmd)
+    _add_browser_args(bench_cmd)
+    _add_measure_args(bench_cmd)
+    _add_backend_args(bench_cmd)
+    bench_cmd.add_argument("--db", default=str(bench.DEFAULT_DB), help="SQLite results file")
+    bench_cmd.add_argument(
+        "--baseline",
+        default="baseline",
+        help="run to compare against: baseline, latest, a run id or a git SHA prefix (default baseline)",
+    )
+    bench_cmd.add_argument("--label", help="free-form note stored with the run")
+    bench_cmd.add_argument("--mark-baseline", action="store_true", help="make this run the new baseline")
+    bench_cmd.add_argument(
+        "--gate-metric",
+        action="append",
+        dest="gate_metrics",
+        choices=page_metrics.SUMMARY_METRICS,
+        help=f"metric to gate on; repeatable (default: {', '.join(bench.GATE_METRICS)})",
+    )
+    bench_cmd.add_argument("--alpha", type=float, default=0.05, help="significance level after Holm correction")
+    bench_cmd.add_argument(
+        "--min-effect", type=float, default=0.05, help="minimum relative p50 increase to count (default 0.05)"
+    )
+    bench_cmd.set_defaults(handler=_bench)
+
+    queries_cmd = commands.add_parser(
+        "queries", help="count Supabase round trips per route and flag N+1 patterns and data-size growth"
+    )
+    _add_target_args(queries_cmd)
+    _add_browser_args(queries_cmd)
+    _add_backend_args(queries_cmd)
+    queries_cmd.add_argument(
+        "--scale",
+        action="append",
+        dest="scales",
+        type=_parse_scale,
+        metavar="PARTICIPANTS[:EVENTS]",
+        help="with --offline, repeat at this fixture size; repeatable, e.g. --scale 100:2 --scale 5000:20",
+    )
+    queries_cmd.add_argument(
+        "--quiet-ms", type=int, default=750, help="page counts as settled after this long with no queries"
+    )
+    queries_cmd.add_argument(
+        "--repeat-threshold", type=int, default=3, help="same-shape repeats that count as N+1 (default 3)"
+    )
+    queries_cmd.add_argument(
+        "--allow-growth", type=int, default=0, help="round-trip increase across scales still accepted"
+    )
+    queries_cmd.add_argument("--fail-on-repeats", action="store_true", help="also fail when N+1 shapes are found")
+    queries_cmd.set_defaults(handler=_queries)
+
+    network_cmd = commands.add_parser(
+        "network", help="record each route's network waterfall and attribute assets to Vite chunks"
+    )
+    _add_target_args(network_cmd)
+    _add_browser_args(network_cmd)
+    _add_backend_args(network_cmd)
+    network_cmd.add_argument(
+        "--cache", choices=("cold", "warm"), default="cold", help="load from an empty or a primed HTTP cache"
+    )
+    network_cmd.add_argument(
+        "--quiet-ms", type=int, default=500, help="page counts as settled after this long with no requests"
+    )
+    network_cmd.add_argument("--waterfall-dir", metavar="DIR", help="write each route's full waterfall as JSON here")
+    network_cmd.add_argument("--vite-config", default=str(network.VITE_CONFIG), help="vite.config.ts with manualChunks")
+    network_cmd.add_argument(
+        "--budget-script",
+        default=str(network.BUNDLE_BUDGET_SCRIPT),
+        help="check-bundle-budget.mjs to read budgets from",
+    )
+    network_cmd.add_argument("--no-budgets", action="store_true", help="do not fail on chunk budgets")
+    network_cmd.set_defaults(handler=_network)
+
+    soak_cmd = commands.add_parser(
+        "soak", help="cycle one long-lived tab through routes and report per-route heap and DOM growth"
+    )
+    soak_cmd.add_argument(
+        "--base-url", action="append", dest="base_urls", metavar="URL", help=f"dev server (default {DEFAULT_BASE_URL})"
+    )
+    soak_cmd.add_argument(
+        "--route",
+        action="append",
+        dest="routes",
+        metavar="PATH",
+        help=f"route in the cycle; repeatable (default {' '.join(soak.DEFAULT_ROUTES)})",
+    )
+    _add_browser_args(soak_cmd)
+    _add_backend_args(soak_cmd)
+    soak_cmd.add_argument(
+        "--cycles",
+        type=int,
+        help=f"passes through the route list (default {soak.DEFAULT_CYCLES}, or no limit with --duration)",
+    )
+    soak_cmd.add_argument(
+        "--duration", type=float, metavar="MINUTES", help="stop after this long, or earlier if --cycles runs out"
+    )
+    soak_cmd.add_argument("--dwell-ms", type=int, default=2000, help="time on each route after it renders")
+    soak_cmd.add_argument("--warmup", type=int, default=2, help="cycles left out of the growth figures (default 2)")
+    soak_cmd.add_argument("--snapshot-dir", metavar="DIR", help="write .heapsnapshot files here")
+    soak_cmd.add_argument(
+        "--snapshot-growth-mb", type=float, default=20.0, help="heap growth between snapshots (default 20)"
+    )
+    soak_cmd.add_argument("--max-snapshots", type=int, default=3, help="snapshot limit per run (default 3)")
+    soak_cmd.add_argument(
+        "--leak-kb", type=float, default=100.0, help="heap growth per visit that counts as a leak (default 100)"
+    )
+    soak_cmd.add_argument(
+        "--leak-nodes", type=float, default=25.0, help="DOM node growth per visit that counts as a leak (default 25)"
+    )
+    soak_cmd.set_defaults(handler=_soak)
+
+    profile_cmd = commands.add_parser(
+        "profile", help="record CPU profiles and traces of heavy interactions and list the hottest functions"
+    )
+    profile_cmd.add_argument(
+        "--base-url", action="append", dest="base_urls", metavar="URL", help=f"dev server (default {DEFAULT_BASE_URL})"
+    )
+    _add_browser_args(profile_cmd)
+    _add_backend_args(profile_cmd)
+    profile_cmd.add_argument(
+        "--interaction",
+        action="append",
+        dest="interactions",
+        choices=cpuprofile.INTERACTIONS,
+        help="interaction to profile; repeatable (default: all)",
+    )
+    profile_cmd.add_argument("--repeat", type=int, default=5, help="times to repeat the interaction while recording")
+    profile_cmd.add_argument("--top", type=int, default=15, help="functions to list by self time (default 15)")
+    profile_cmd.add_argument(
+        "--sampling-us", type=int, default=200, help="V8 sampling interval in microseconds (default 200)"
+    )
+    profile_cmd.add_argument("--out-dir", default=".perf/profiles", help="where profiles and traces are written")
+    profile_cmd.add_argument("--no-trace", action="store_true", help="skip the Chromium trace")
+    profile_cmd.set_defaults(handler=_profile)
+
+    checkin = commands.add_parser(
+        "checkin", help="simulate door scanners checking guests in through outages and time the sync drain"
+    )
+    checkin.add_argument(
+        "--base-url", action="append", dest="base_urls", metavar="URL", help=f"dev server (default {DEFAULT_BASE_URL})"
+    )
+    _add_browser_args(checkin)
+    _add_backend_args(checkin)
+    checkin.add_argument("--devices", type=int, default=20, help="simulated scanning devices (default 20)")
+    checkin.add_argument("--guests", type=int, default=2000, help="guests scanned in total (default 2000)")
+    checkin.add_argument(
+        "--scan-interval-ms", type=float, default=1500, help="mean time between scans per device (default 1500)"
+    )
+    checkin.add_argument(
+        "--outage",
+        action="append",
+        dest="outages",
+        type=loadsim.parse_outage,
+        metavar="START:END",
+        help="take every device offline between these seconds from the start; repeatable",
+    )
+    checkin.add_argument(
+        "--outage-jitter", type=float, default=0.0, help="spread each device's outage by up to this many seconds"
+    )
+    checkin.add_argument("--sample-ms", type=int, default=1000, help="queue sampling interval (default 1000)")
+    checkin.add_argument(
+        "--drain-timeout", type=float, default=300, help="seconds after scanning ends to wait for a full sync"
+    )
+    checkin.set_defaults(handler=_checkin)
+
+    edge = commands.add_parser(
+        "edge-bench", help="open-loop throughput of the Supabase Edge Functions against local upstream stubs"
+    )
+    edge.add_argument(
+        "--function",
+        action="append",
+        dest="functions",
+        choices=sorted(edgebench.SCENARIOS),
+        help="function scenario to run; repeatable (default the six Edge Functions)",
+    )
+    edge.add_argument(
+        "--functions-dir", default=str(edgebench.FUNCTIONS_DIR), help="supabase/functions directory"
+    )
+    edge.add_argument("--deno", default="deno", help="Deno binary (default deno)")
+    edge.add_argument(
+        "--runtime-url",
+        metavar="URL",
+        help="use a running runtime, e.g. http://127.0.0.1:54321/functions/v1 (no cold-start or memory figures)",
+    )
+    edge.add_argument(
+        "--stub-port", type=int, default=0, help="port of the upstream stub; set it when using --runtime-url"
+    )
+    edge.add_argument("--rps", type=float, default=20.0, help="scheduled arrivals per second (default 20)")
+    edge.add_argument("--duration", type=float, default=30.0, help="seconds of load per function (default 30)")
+    edge.add_argument("--batch", type=int, default=1, help="requests sent together per arrival (default 1)")
+    edge.add_argument("--arrival", choices=("uniform", "poisson"), default="uniform", help="arrival process")
+    edge.add_argument(
+        "--max-inflight", type=int, default=500, help="drop arrivals beyond this many open requests (default 500)"
+    )
+    edge.add_argument(
+        "--warmup", type=int, default=5, help="sequential warm-up requests, timed as the warm baseline (default 5)"
+    )
+    edge.add_argument("--cold-runs", type=int, default=3, help="process restarts timed for cold start (default 3)")
+    edge.add_argument(
+        "--drain-timeout", type=float, default=30.0, help="seconds to wait for open requests after the load"
+    )
+    edge.add_argument("--ai-latency-ms", type=float, default=800.0, help="Gemini stub latency (default 800)")
+    edge.add_argument(
+        "--whatsapp-latency-ms", type=float, default=150.0, help="Green API / send-whatsapp stub latency (default 150)"
+    )
+    edge.add_argument(
+        "--fanout-guests", type=int, default=5000, help="guest count for the reminder fan-out projection"
+    )
+    edge.add_argument("--format", choices=("table", "json"), default="table", help="output format")
+    _add_backend_args(edge)
+    edge.set_defaults(handler=_edge)
+
+    bench_runs = commands.add_parser("bench-runs", help="list stored benchmark runs")
+    bench_runs.add_argument("--db", default=str(bench.DEFAULT_DB), help="SQLite results file")
+    bench_runs.add_argument("--limit", type=int, default=20, help="number of runs to show")
+    bench_runs.add_argument("--mark-baseline", type=int, metavar="RUN_ID", help="make RUN_ID the baseline first")
+    bench_runs.set_defaults(handler=_bench_runs)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return asyncio.run(args.handler(args))
@@ -0,0 +1,353 @@
+"""CPU profiles, trace events and React commit counts for scripted interactions.
+
+Each :class:`Interaction` opens its route, waits until the route is ready,
+and then repeats one heavy user action while three recorders run:
+
+- the V8 sampling profiler (CDP ``Profiler``)
+- a Chromium trace (``browser.start_tracing``)
+- a minimal ``__REACT_DEVTOOLS_GLOBAL_HOOK__`` installed before React
+  loads, which records every commit and, in dev builds, the root's
+  ``actualDuration``
+
+For each interaction three files are written:
+
+- ``<name>.cpuprofile``: DevTools Performance panel or speedscope
+- ``<name>.folded``: collapsed stacks for ``flamegraph.pl`` or speedscope
+- ``<name>.trace.json``: Perfetto or DevTools
+
+The summary gives the top functions by self time, and scripting, rendering
+and painting time from the renderer main thread. An interaction that cannot
+exercise what it is meant to profile (no simulation input, no seats to drop
+on, a drag that saved nothing) reports an ``error`` instead of a profile of
+an idle page.
+"""
+
+import asyncio
+import json
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from playwright.async_api import Error as PlaywrightError
+
+REACT_HOOK_SCRIPT = """
+(() => {
+  if (window.__REACT_DEVTOOLS_GLOBAL_HOOK__) return;
+  const commits = window.__eventflowCommits = [];
+  let nextId = 1;
+  window.__REACT_DEVTOOLS_GLOBAL_HOOK__ = {
+    supportsFiber: true,
+    renderers: new Map(),
+    inject(renderer) { const id = nextId++; this.renderers.set(id, renderer); return id; },
+    onCommitFiberRoot(id, root) {
+      const duration = root && root.current ? root.current.actualDuration : undefined;
+      commits.push([performance.now(), typeof duration === 'number' ? duration : null]);
+    },
+    onCommitFiberUnmount() {},
+    onPostCommitFiberRoot() {},
+    checkDCE() {},
+  };
+})();
+"""
+
+TRACE_CATEGORIES = ["devtools.timeline", "disabled-by-default-devtools.timeline", "blink.user_timing"]
+_TRACE_BUCKETS = {
+    "scripting_ms": {"FunctionCall", "EvaluateScript", "v8.compile"},
+    "rendering_ms": {"UpdateLayoutTree", "Layout", "HitTest", "PrePaint"},
+    "painting_ms": {"Paint", "PaintImage", "CompositeLayers", "Layerize"},
+}
+_IDLE = {"(idle)", "(program)"}
+_WRITE_METHODS = {"POST", "PATCH", "PUT", "DELETE"}
+
+
+class InteractionError(Exception):
+    """The page did not give the interaction anything real to do."""
+
+
+@dataclass
+class Interaction(ABC):
+    name: str
+    route: str
+    ready_selector: str
+    description: str
+
+    async def prepare(self, page, timeout_ms):
+        await page.wait_for_selector(self.ready_selector, timeout=timeout_ms)
+
+    @abstractmethod
+    async def act(self, page, timeout_ms):
+        """Perform the action once; called ``repeat`` times while recording."""
+
+    def verify(self, writes):
+        """Check the recorded run; ``writes`` are the PostgREST write requests it sent."""
+
+
+class SeatingDrag(Interaction):
+    """Drag guests from the seating plan's guest panel onto the floor plan (dnd-kit)."""
+
+    seats = "#floor-plan-canvas svg circle"
+
+    async def prepare(self, page, timeout_ms):
+        await super().prepare(page, timeout_ms)
+        seats = page.locator(self.seats).first
+        # NetworkingPage opens VenueLayoutSelector, a full-screen overlay, when the event has no venue_tables.
+        layouts = page.locator("h2", has_text="בחר פריסת אולם")
+        try:
+            await seats.or_(layouts).first.wait_for(timeout=timeout_ms)
+        except PlaywrightError:
+            raise InteractionError("no seats rendered on the floor plan") from None
+        if await layouts.is_visible():
+            raise InteractionError("the venue layout selector covers the floor plan: the event has no venue_tables")
+
+    async def act(self, page, timeout_ms):
+        guest = page.locator("#floor-plan-canvas ~ div .cursor-grab").first
+        await guest.wait_for(timeout=timeout_ms)
+        source = await guest.bounding_box()
+        target = await page.locator(self.seats).first.bounding_box()
+        x, y = source["x"] + source["width"] / 2, source["y"] + source["height"] / 2
+        await page.mouse.move(x, y)
+        await page.mouse.down()
+        # PointerSensor activates after 8px; move in steps so every pointermove is profiled.
+        await page.mouse.move(x + 12, y, steps=3)
+        await page.mouse.move(target["x"] + target["width"] / 2, target["y"] + target["height"] / 2, steps=25)
+        await page.mouse.up()
+
+    def verify(self, writes):
+        if not any("/rest/v1/table_assignments" in request.url for request in writes):
+            raise InteractionError("no drag saved a seat assignment (no table_assignments write)")
+
+
+class GuestFilter(Interaction):
+    """Type a search one key at a time, then step through every status filter."""
+
+    async def act(self, page, timeout_ms):
+        search = page.locator('input[aria-label="חיפוש אורחים"]')
+        await search.fill("")
+        await search.press_sequentially("כהן", delay=30)
+        await search.fill("")
+        statuses = page.locator("button", has_text="הכל").first.locator("xpath=..").locator("button")
+        for index in [*range(1, await statuses.count()), 0]:
+            await statuses.nth(index).click()
+
+
+class MessagesFilter(Interaction):
+    """Type into the @tanstack/react-table global filter on the messages table."""
+
+    async def act(self, page, timeout_ms):
+        search = page.locator('input[placeholder="חיפוש..."]').first
+        await search.fill("")
+        await search.press_sequentially("תזכורת 1", delay=30)
+        await search.fill("")
+
+
+class RunSimulation(Interaction):
+    """Run ``simulationEngine.ts`` from the simulation page and wait for the report."""
+
+    async def prepare(self, page, timeout_ms):
+        """Run once unrecorded and check that ``dataFetcher.ts`` loaded schedules to simulate."""
+        await super().prepare(page, timeout_ms)
+        async with page.expect_response(
+            lambda r: "/rest/v1/schedules?" in r.url and "is_deleted=" in r.url, timeout=timeout_ms
+        ) as info:
+            await self.act(page, timeout_ms)
+        response = await info.value
+        schedules = await response.json() if response.ok else None
+        if not schedules:
+            raise InteractionError(f"simulation input is empty: the schedules query returned {response.status} "
+                                   f"with {len(schedules or [])} rows")
+
+    async def act(self, page, timeout_ms):
+        button = await page.locator("header button").first.element_handle()
+        await button.click()
+        try:
+            await page.wait_for_function("el => el.disabled", arg=button, timeout=2000)
+        except PlaywrightError:
+            pass  # finished before the first poll
+        await page.wait_for_function("el => !el.disabled", arg=button, timeout=timeout_ms)
+
+
+INTERACTIONS = {
+    i.name: i
+    for i in (
+        SeatingDrag("seating-drag", "/event/networking", "#floor-plan-canvas", SeatingDrag.__doc__),
+        GuestFilter("guest-filter", "/event/guests", '[data-testid="guests-list"]', GuestFilter.__doc__),
+        MessagesFilter("messages-filter", "/event/messages", '[data-testid="messages-panel"]', MessagesFilter.__doc__),
+        RunSimulation("simulation", "/event/simulation", "header button", RunSimulation.__doc__),
+    )
+}
+
+
+def _frame_label(frame):
+    name = frame.get("functionName") or "(anonymous)"
+    url = frame.get("url")
+    if not url:
+        return name
+    return f"{name} {urlsplit(url).path}:{frame.get('lineNumber', -1) + 1}"
+
+
+def self_times(profile):
+    """``{node_id: self_us}`` from ``samples``/``timeDeltas``."""
+    times = {}
+    samples, deltas = profile.get("samples", []), profile.get("timeDeltas", [])
+    # timeDeltas[i] is the gap before sample i, so it belongs to sample i - 1.
+    for i, node_id in enumerate(samples[:-1]):
+        times[node_id] = times.get(node_id, 0) + deltas[i + 1]
+    return times
+
+
+def _stacks(profile):
+    """``{node_id: [frame label, ...]}`` from the root down."""
+    nodes = {node["id"]: node for node in profile.get("nodes", [])}
+    parents = {child: node["id"] for node in nodes.values() for child in node.get("children", ())}
+    stacks = {}
+    for node_id in nodes:
+        labels, current = [], node_id
+        while current is not None:
+            frame = nodes[current]["callFrame"]
+            if frame.get("functionName") != "(root)":
+                labels.append(_frame_label(frame))
+            current = parents.get(current)
+        stacks[node_id] = labels[::-1]
+    return stacks
+
+
+def top_functions(profile, limit=15):
+    """Functions ranked by self time, with inclusive time alongside."""
+    stacks = _stacks(profile)
+    self_us, total_us = {}, {}
+    for node_id, micros in self_times(profile).items():
+        stack = stacks.get(node_id) or ["(root)"]
+        self_us[stack[-1]] = self_us.get(stack[-1], 0) + micros
+        for label in set(stack):
+            total_us[label] = total_us.get(label, 0) + micros
+    busy = sum(us for label, us in self_us.items() if label not in _IDLE) or 1
+    ranked = sorted(((label, us) for label, us in self_us.items() if label not in _IDLE), key=lambda item: -item[1])
+    return [
+        {"function": label, "self_ms": round(us / 1000, 2), "self_pct": round(100 * us / busy, 1),
+         "total_ms": round(total_us.get(label, 0) / 1000, 2)}
+        for label, us in ranked[:limit]
+    ]
+
+
+def folded_stacks(profile):
+    """Collapsed-stack lines (``a;b;c <microseconds>``)."""
+    stacks = _stacks(profile)
+    weights = {}
+    for node_id, micros in self_times(profile).items():
+        key = ";".join(label.replace(";", ":") for label in stacks.get(node_id) or ["(root)"])
+        weights[key] = weights.get(key, 0) + micros
+    return [f"{stack} {micros}" for stack, micros in sorted(weights.items()) if micros > 0]
+
+
+def trace_summary(trace):
+    """Scripting/rendering/painting and long-task time on the renderer main thread.
+
+    Events nested inside one already counted in the same bucket (a
+    ``FunctionCall`` dispatching a synchronous event, say) are skipped.
+    """
+    events = trace.get("traceEvents", []) if isinstance(trace, dict) else trace
+    main = {
+        (e.get("pid"), e.get("tid")) for e in events
+        if e.get("ph") == "M" and e.get("name") == "thread_name" and e.get("args", {}).get("name") == "CrRendererMain"
+    }
+    totals = {bucket: 0.0 for bucket in _TRACE_BUCKETS}
+    totals.update(long_tasks=0, long_task_ms=0.0)
+    covered_until = {bucket: float("-inf") for bucket in _TRACE_BUCKETS}
+    complete = [e for e in events if e.get("ph") == "X" and (e.get("pid"), e.get("tid")) in main]
+    for event in sorted(complete, key=lambda e: e.get("ts", 0)):
+        name, start, duration = event.get("name"), event.get("ts", 0), event.get("dur", 0)
+        if name == "RunTask" and duration > 50_000:
+            totals["long_tasks"] += 1
+            totals["long_task_ms"] += duration / 1000
+        for bucket, names in _TRACE_BUCKETS.items():
+            if name in names and start >= covered_until[bucket]:
+                totals[bucket] += duration / 1000
+                covered_until[bucket] = start + duration
+    return {key: round(value, 1) if isinstance(value, float) else value for key, value in totals.items()}
+
+
+class Profiler:
+    """Runs interactions one at a time (tracing is browser-wide) and writes profiles."""
+
+    def __init__(self, engine, base_url, out_dir, repeat=5, top=15, sampling_us=200, trace=True):
+        self.engine = engine
+        self.base_url = base_url.rstrip("/")
+        self.out_dir = Path(out_dir)
+        self.repeat = repeat
+        self.top = top
+        self.sampling_us = sampling_us
+        self.trace = trace
+
+    async def run(self, interaction):
+        context = await self.engine.pool.new_context()
+        await context.add_init_script(REACT_HOOK_SCRIPT)
+        page = await context.new_page()
+        result = {"interaction": interaction.name, "route": interaction.route, "error": None}
+        try:
+            await page.goto(self.base_url + interaction.route, timeout=self.engine.timeout_ms)
+            await interaction.prepare(page, self.engine.timeout_ms)
+            result.update(await self._profile(page, interaction))
+        except (PlaywrightError, InteractionError) as e:
+            result["error"] = str(e).splitlines()[0]
+        finally:
+            await context.close()
+        return result
+
+    async def _profile(self, page, interaction):
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        stem = self.out_dir / interaction.name
+        session = await page.context.new_cdp_session(page)
+        await session.send("Profiler.enable")
+        await session.send("Profiler.setSamplingInterval", {"interval": self.sampling_us})
+        commits_before = await page.evaluate("() => (window.__eventflowCommits || []).length")
+        writes = []
+
+        def on_request(request):
+            if request.method in _WRITE_METHODS and "/rest/v1/" in request.url:
+                writes.append(request)
+
+        page.on("request", on_request)
+        if self.trace:
+            await self.engine.browser.start_tracing(
+                page=page, path=str(stem) + ".trace.json", categories=TRACE_CATEGORIES
+            )
+        await session.send("Profiler.start")
+        start = time.perf_counter()
+        try:
+            for _ in range(self.repeat):
+                await interaction.act(page, self.engine.timeout_ms)
+                await asyncio.sleep(0.05)
+            duration_ms = (time.perf_counter() - start) * 1000
+        finally:
+            profile = (await session.send("Profiler.stop"))["profile"]
+            if self.trace:
+                await self.engine.browser.stop_tracing()
+            await session.detach()
+            page.remove_listener("request", on_request)
+        interaction.verify(writes)
+        commits = await page.evaluate("n => (window.__eventflowCommits || []).slice(n)", commits_before)
+
+        Path(str(stem) + ".cpuprofile").write_text(json.dumps(profile), encoding="utf-8")
+        Path(str(stem) + ".folded").write_text("\n".join(folded_stacks(profile)) + "\n", encoding="utf-8")
+        self_us = self_times(profile)
+        nodes = {node["id"]: node["callFrame"].get("functionName") for node in profile.get("nodes", [])}
+        busy_us = sum(us for node_id, us in self_us.items() if nodes.get(node_id) not in _IDLE)
+        durations = [d for _, d in commits if d is not None]
+        summary = {
+            "repeat": self.repeat,
+            "duration_ms": round(duration_ms, 1),
+            "cpu_ms": round(busy_us / 1000, 1),
+            "samples": len(profile.get("samples", [])),
+            "react_commits": len(commits),
+            "react_commit_ms": round(sum(durations), 1) if durations else None,
+            "react_max_commit_ms": round(max(durations), 1) if durations else None,
+            "top": top_functions(profile, self.top),
+            "files": [str(stem) + suffix for suffix in (".cpuprofile", ".folded")],
+        }
+        if self.trace:
+            trace_path = Path(str(stem) + ".trace.json")
+            summary.update(trace_summary(json.loads(trace_path.read_text(encoding="utf-8"))))
+            summary["files"].append(str(trace_path))
+        return summary
@@ -0,0 +1,574 @@
+"""Open-loop throughput benchmark for the Supabase Edge Functions.
+
+Each function runs in its own local ``deno run`` process. The process gets
+an import map that replaces ``std/http/server.ts`` with a small shim. The
+shim does two things:
+
+- serves the handler on a chosen port with ``Deno.serve``
+- rewrites ``fetch`` calls to Gemini and Green API so they reach an
+  in-process :class:`UpstreamStub`
+
+``SUPABASE_URL`` also points at the stub. The stub answers PostgREST and
+auth through the offline :class:`~.standin.SupabaseStandIn`, and answers
+``/functions/v1/*`` (send-reminder → send-whatsapp) with a canned success.
+Every upstream call is counted. No request leaves the machine.
+
+Load is open-loop: requests are scheduled at ``rps`` (uniform or Poisson
+arrivals, ``batch`` per arrival) whether or not earlier ones have
+finished. Latency is measured from the *scheduled* send time, so a
+saturated function shows queueing instead of hiding it (no coordinated
+omission). Cold start is measured by restarting the process: boot (spawn
+to port open) and first response. The warm baseline comes from the
+warm-up requests, sent one at a time before the load starts. Peak memory is the process's ``VmHWM``
+from ``/proc``.
+"""
+
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from . import stats
+from .routes import APP_TSX
+
+FUNCTIONS_DIR = APP_TSX.parent.parent / "supabase" / "functions"
+DEFAULT_FUNCTIONS = (
+    "ai-chat", "execute-ai-action", "send-reminder", "send-whatsapp", "budget-alerts", "vendor-analysis",
+)
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float("inf"))
+SERVICE_ROLE_KEY = "edge-bench-service-role"
+CRON_SECRET = "edge-bench-cron-secret"
+STD_SERVE = "https://deno.land/std@0.168.0/http/server.ts"
+
+SERVE_SHIM = """
+const port = Number(Deno.env.get('EDGE_BENCH_PORT'))
+const upstream = Deno.env.get('EDGE_BENCH_UPSTREAM')
+const rewrites: [string, string][] = [
+  ['https://generativelanguage.googleapis.com', `${upstream}/gemini`],
+  ['https://api.green-api.com', `${upstream}/green-api`],
+]
+const realFetch = globalThis.fetch
+globalThis.fetch = (input: Request | URL | string, init?: RequestInit) => {
+  const url = input instanceof Request ? input.url : String(input)
+  for (const [from, to] of rewrites) {
+    if (url.startsWith(from)) {
+      const target = to + url.slice(from.length)
+      return realFetch(input instanceof Request ? new Request(target, input) : target, init)
+    }
+  }
+  return realFetch(input, init)
+}
+
+// deno-lint-ignore no-explicit-any
+export function serve(handler: (req: Request, info: any) => Response | Promise<Response>) {
+  return Deno.serve({ port, hostname: '127.0.0.1', onListen: () => {} }, handler)
+}
+"""
+
+
+def _gemini_reply(text):
+    return {
+        "candidates": [{"content": {"role": "model", "parts": [{"text": text}]}, "finishReason": "STOP", "index": 0}],
+        "usageMetadata": {"promptTokenCount": 850, "candidatesTokenCount": 60, "totalTokenCount": 910},
+    }
+
+
+# ── scenarios ──────────────────────────────────────────────────────────────
+
+
+@dataclass
+class Scenario:
+    """How to call one function: ``auth`` is ``user``, ``service`` or ``cron``."""
+
+    function: str
+    auth: str
+    payload: object  # (standin, index) -> dict; must only read the store
+    setup: object = None  # (store, dataset, requests) -> undo callable or None; runs on the stand-in's worker
+
+    def headers(self, standin):
+        token = {
+            "user": standin.session["access_token"],
+            "service": SERVICE_ROLE_KEY,
+            "cron": CRON_SECRET,
+        }[self.auth]
+        return {"authorization": f"Bearer {token}", "content-type": "application/json",
+                "x-cron-secret": CRON_SECRET, "origin": "http://localhost:5173"}
+
+
+def _main_event(standin):
+    return next(e for e in standin.dataset.tables["events"] if e["id"] == standin.dataset.primary_event_id)
+
+
+def _participant(standin, index):
+    participants = standin.dataset.tables["participants"]
+    return participants[index % len(participants)]
+
+
+def _action_id(index):
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"edge-bench/ai-action/{index}"))
+
+
+def _create_approved_actions(store, dataset, requests):
+    """One approved ``schedule_create`` action per request, so none is executed twice."""
+    event_id = dataset.primary_event_id
+    actions = []
+    for index in range(requests):
+        start = f"2026-03-0{1 + index % 3}T{8 + index % 10:02d}:00:00+00:00"
+        actions.append({
+            "id": _action_id(index), "organization_id": dataset.organization_id, "user_id": dataset.user_id,
+            "event_id": event_id, "action_type": "schedule_create", "execution_status": "approved",
+            "action_data": {"event_id": event_id, "title": f"Bench session {index}", "start_time": start,
+                            "end_time": start.replace(":00:00+", ":45:00+")},
+        })
+    store.insert("ai_insights_log", "", {}, actions)
+
+    def undo():
+        store.delete("ai_insights_log", f"id=in.({','.join(action['id'] for action in actions)})", {})
+
+    return undo
+
+
+def _enable_activation_reminders(store, dataset, requests):
+    """Turn on ``reminder_activation`` for active events; the undo puts their settings back."""
+    _, events, _ = store.select("events", "status=eq.active&select=id,settings", {})
+    for event in events:
+        settings = {**(event["settings"] or {}), "reminder_activation": True}
+        store.update("events", f"id=eq.{event['id']}", {}, {"settings": settings})
+
+    def undo():
+        for event in events:
+            store.update("events", f"id=eq.{event['id']}", {}, {"settings": event["settings"]})
+
+    return undo
+
+
+SCENARIOS = {
+    s.function: s
+    for s in (
+        Scenario("ai-chat", "user", lambda standin, i: {
+            "message": "כמה אורחים אישרו הגעה לאירוע?", "page": "dashboard", "history": [],
+            "eventId": standin.dataset.primary_event_id, "eventName": _main_event(standin)["name"],
+        }),
+        Scenario("execute-ai-action", "user", lambda standin, i: {"action_id": _action_id(i)},
+                 setup=_create_approved_actions),
+        Scenario("send-reminder", "cron", lambda standin, i: {
+            "mode": "test", "event_id": standin.dataset.primary_event_id, "test_phone": "0501234567",
+            "type": "activation",
+        }),
+        Scenario("send-whatsapp", "service", lambda standin, i: {
+            "phone": _participant(standin, i)["phone"], "message": "תזכורת: האירוע מתחיל מחר ב-9:00",
+        }),
+        Scenario("budget-alerts", "user", lambda standin, i: {
+            "eventId": standin.dataset.primary_event_id, "checkNow": True,
+        }),
+        Scenario("vendor-analysis", "user", lambda standin, i: {
+            "checklistItemId": (standin.dataset.tables["checklist_items"] or [{"id": str(uuid.uuid4())}])[0]["id"],
+            "eventId": standin.dataset.primary_event_id,
+        }),
+    )
+}
+# One activation job fans out to every confirmed participant of every active event.
+SCENARIOS["send-reminder-fanout"] = Scenario(
+    "send-reminder", "cron", lambda standin, i: {"type": "activation"}, setup=_enable_activation_reminders
+)
+
+
+# ── minimal HTTP/1.1 over asyncio streams ──────────────────────────────────
+
+
+async def _read_message(reader):
+    """Read one HTTP message; returns ``(start_line, headers, body)`` or ``None`` at EOF."""
+    start = await reader.readline()
+    if not start:
+        return None
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        body = bytearray()
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                await reader.readline()
+                break
+            body += await reader.readexactly(size)
+            await reader.readline()
+        body = bytes(body)
+    elif "content-length" in headers:
+        body = await reader.readexactly(int(headers["content-length"]))
+    elif start.startswith(b"HTTP/"):
+        body = await reader.read()
+    else:
+        body = b""
+    return start.decode("latin-1").strip(), headers, body
+
+
+class HttpPool:
+    """Keep-alive connections to one ``host:port``; opens more as needed."""
+
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self._idle = []
+
+    async def request(self, method, path, headers, body=b""):
+        for attempt in (0, 1):
+            reused = bool(self._idle)
+            reader, writer = self._idle.pop() if reused else await asyncio.open_connection(self.host, self.port)
+            head = f"{method} {path} HTTP/1.1\r\nhost: {self.host}:{self.port}\r\ncontent-length: {len(body)}\r\n"
+            head += "".join(f"{k}: {v}\r\n" for k, v in headers.items()) + "\r\n"
+            try:
+                writer.write(head.encode("latin-1") + body)
+                await writer.drain()
+                message = await _read_message(reader)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                message = None
+            if message is None:
+                writer.close()
+                if reused and attempt == 0:
+                    continue  # the server closed an idle connection; retry on a fresh one
+                raise ConnectionError(f"connection to {self.host}:{self.port} closed")
+            start, response_headers, response_body = message
+            if response_headers.get("connection", "").lower() == "close":
+                writer.close()
+            else:
+                self._idle.append((reader, writer))
+            return int(start.split()[1]), response_body
+        raise ConnectionError("unreachable")
+
+    def close(self):
+        for _, writer in self._idle:
+            writer.close()
+        self._idle.clear()
+
+
+# ── upstream stub ──────────────────────────────────────────────────────────
+
+
+class UpstreamStub:
+    """Local stand-in for Supabase, Gemini, Green API and function-to-function calls."""
+
+    def __init__(self, standin, ai_latency_ms=800.0, whatsapp_latency_ms=150.0):
+        self.standin = standin
+        self.ai_latency_ms = ai_latency_ms
+        self.whatsapp_latency_ms = whatsapp_latency_ms
+        self.counts = {}
+        self._server = None
+        self._writers = set()
+        self.origin = None
+
+    async def start(self, port=0):
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", port)
+        self.origin = f"http://127.0.0.1:{self._server.sockets[0].getsockname()[1]}"
+        return self
+
+    async def close(self):
+        self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+        await self._server.wait_closed()
+        await asyncio.sleep(0)
+
+    async def _serve(self, reader, writer):
+        self._writers.add(writer)
+        try:
+            while True:
+                message = await _read_message(reader)
+                if message is None:
+                    break
+                start, headers, body = message
+                method, target = start.split()[:2]
+                status, text, extra = await self.respond(method, target, headers, body)
+                data = text.encode()
+                head = "".join(f"{k}: {v}\r\n" for k, v in extra.items())
+                writer.write(
+                    f"HTTP/1.1 {status} X\r\ncontent-type: application/json\r\ncontent-length: {len(data)}\r\n"
+                    f"{head}\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    def _count(self, kind):
+        self.counts[kind] = self.counts.get(kind, 0) + 1
+
+    async def respond(self, method, target, headers, body):
+        """Returns ``(status, body_text, headers)``."""
+        path = urlsplit(target).path
+        if path.startswith("/gemini/"):
+            self._count("gemini")
+            await asyncio.sleep(self.ai_latency_ms / 1000)
+            return 200, _json(_gemini_reply("יש כרגע 312 אורחים שאישרו הגעה.")), {}
+        if path.startswith("/green-api/"):
+            self._count("green-api")
+            await asyncio.sleep(self.whatsapp_latency_ms / 1000)
+            return 200, _json({"idMessage": uuid.uuid4().hex.upper()}), {}
+        if path.startswith("/functions/v1/"):
+            self._count("function:" + path.rsplit("/", 1)[-1])
+            await asyncio.sleep(self.whatsapp_latency_ms / 1000)
+            return 200, _json({"success": True, "messageId": uuid.uuid4().hex.upper()}), {}
+        self._count("supabase:" + (path.split("/")[1] if path.count("/") > 1 else path))
+        await self.standin.delay()
+        return await self.standin.respond(
+            method, self.standin.origin + target, headers, body.decode("utf-8") if body else None
+        )
+
+
+def _json(payload):
+    return json.dumps(payload, ensure_ascii=False)
+
+
+# ── function runtime ───────────────────────────────────────────────────────
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _peak_rss_bytes(pid):
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+class DenoFunction:
+    """One ``deno run`` process serving ``functions/<name>/index.ts``."""
+
+    def __init__(self, name, upstream_origin, functions_dir=FUNCTIONS_DIR, deno="deno", boot_timeout_s=60):
+        self.name = name
+        self.entry = Path(functions_dir) / name / "index.ts"
+        self.upstream_origin = upstream_origin
+        self.deno = deno
+        self.boot_timeout_s = boot_timeout_s
+        self.port = None
+        self.process = None
+        self._workdir = Path(tempfile.mkdtemp(prefix="edge-bench-"))
+        (self._workdir / "serve_shim.ts").write_text(SERVE_SHIM, encoding="utf-8")
+        self.import_map = self._workdir / "import_map.json"
+        self.import_map.write_text(json.dumps({"imports": {STD_SERVE: "./serve_shim.ts"}}), encoding="utf-8")
+
+    def _env(self):
+        return {
+            **os.environ,
+            "EDGE_BENCH_PORT": str(self.port), "EDGE_BENCH_UPSTREAM": self.upstream_origin,
+            "SUPABASE_URL": self.upstream_origin, "SUPABASE_ANON_KEY": "edge-bench-anon",
+            "SUPABASE_SERVICE_ROLE_KEY": SERVICE_ROLE_KEY, "CRON_SECRET": CRON_SECRET,
+            "GEMINI_API_KEY": "edge-bench-gemini", "GREEN_API_INSTANCE": "1101000001",
+            "GREEN_API_TOKEN": "edge-bench-green", "ENCRYPTION_KEY": "edge-bench-encryption-key-0123456789",
+            "ALLOWED_ORIGIN": "http://localhost:5173",
+        }
+
+    async def cache(self):
+        """Download remote modules once so cold starts measure boot, not the network."""
+        process = await asyncio.create_subprocess_exec(
+            self.deno, "cache", "--import-map", str(self.import_map), str(self.entry),
+            stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE,
+        )
+        _, stderr = await process.communicate()
+        if process.returncode:
+            raise RuntimeError(f"deno cache {self.name} failed: {stderr.decode(errors='replace').strip()[-500:]}")
+
+    async def start(self):
+        """Spawn the process and return milliseconds until its port accepts connections."""
+        self.port = _free_port()
+        started = time.perf_counter()
+        self.process = await asyncio.create_subprocess_exec(
+            self.deno, "run", "--allow-all", "--import-map", str(self.import_map), str(self.entry),
+            env=self._env(), stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL,
+        )
+        while time.perf_counter() - started < self.boot_timeout_s:
+            if self.process.returncode is not None:
+                raise RuntimeError(f"{self.name} exited with {self.process.returncode} during boot")
+            try:
+                _, writer = await asyncio.open_connection("127.0.0.1", self.port)
+                writer.close()
+                return (time.perf_counter() - started) * 1000
+            except OSError:
+                await asyncio.sleep(0.01)
+        await self.stop()
+        raise RuntimeError(f"{self.name} did not listen within {self.boot_timeout_s}s")
+
+    def peak_rss_bytes(self):
+        return _peak_rss_bytes(self.process.pid) if self.process else None
+
+    async def stop(self):
+        if self.process and self.process.returncode is None:
+            self.process.terminate()
+            try:
+                await asyncio.wait_for(self.process.wait(), 5)
+            except asyncio.TimeoutError:
+                self.process.kill()
+                await self.process.wait()
+        self.process = None
+
+    def cleanup(self):
+        shutil.rmtree(self._workdir, ignore_errors=True)
+
+
+# ── load generation ────────────────────────────────────────────────────────
+
+
+async def _call(pool, path, scenario, standin, index):
+    body = json.dumps(scenario.payload(standin, index), ensure_ascii=False).encode()
+    return await pool.request("POST", path, scenario.headers(standin), body)
+
+
+def arrival_times(rps, duration_s, arrival="uniform", seed=0):
+    """Send offsets in seconds within ``duration_s``: every ``1/rps``, or Poisson arrivals at rate ``rps``."""
+    rng = random.Random(seed)
+    times, offset = [], 0.0
+    while offset < duration_s:
+        times.append(offset)
+        offset = len(times) / rps if arrival == "uniform" else offset + rng.expovariate(rps)
+    return times
+
+
+async def open_loop(pool, path, scenario, standin, rps, duration_s, batch=1, arrival="uniform",
+                    max_inflight=500, drain_timeout_s=30.0, seed=0, first_index=0):
+    """Fire ``batch`` requests at each of :func:`arrival_times`, payload indexes counting from ``first_index``.
+
+    Returns ``(results, dropped, elapsed_s)``: ``results`` holds ``(latency_ms, status)`` pairs, with status
+    ``None`` on a connection error and ``(None, "timeout")`` for requests still open after the drain.
+    ``elapsed_s`` runs until the last request finished.
+    """
+    loop = asyncio.get_running_loop()
+    results, tasks, dropped = [], set(), 0
+    start = loop.time()
+    index = first_index
+
+    async def one(due, i):
+        try:
+            status, _ = await _call(pool, path, scenario, standin, i)
+        except (ConnectionError, OSError, asyncio.IncompleteReadError):
+            status = None
+        results.append(((loop.time() - due) * 1000, status))
+
+    for offset in arrival_times(rps, duration_s, arrival, seed):
+        scheduled = start + offset
+        await asyncio.sleep(max(0.0, scheduled - loop.time()))
+        for _ in range(batch):
+            if len(tasks) >= max_inflight:
+                dropped += 1
+                continue
+            task = asyncio.ensure_future(one(scheduled, index))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            index += 1
+    if tasks:
+        _, pending = await asyncio.wait(tasks, timeout=drain_timeout_s)
+        for task in pending:
+            task.cancel()
+        results.extend((None, "timeout") for _ in pending)
+    return results, dropped, loop.time() - start
+
+
+def histogram(latencies_ms):
+    counts = [0] * len(LATENCY_BUCKETS_MS)
+    for latency in latencies_ms:
+        counts[next(i for i, edge in enumerate(LATENCY_BUCKETS_MS) if latency <= edge)] += 1
+    return {("inf" if edge == float("inf") else f"le_{edge:g}ms"): n for edge, n in zip(LATENCY_BUCKETS_MS, counts)}
+
+
+async def bench_function(name, scenario, standin, stub, rps=20.0, duration_s=30.0, batch=1, arrival="uniform",
+                         max_inflight=500, drain_timeout_s=30.0, warmup=5, cold_runs=3, functions_dir=FUNCTIONS_DIR,
+                         deno="deno", runtime_url=None, seed=0):
+    """Cold starts, sequential warm-up, then open-loop load; returns one summary dict.
+
+    ``warm_p50_ms`` is the unloaded baseline from the ``warmup`` requests sent one
+    at a time; ``loaded_p50_ms`` is the p50 of successful requests under load.
+    Every request gets its own payload index, and the scenario's setup runs on
+    the stand-in's worker before the first request and is undone after the last.
+    """
+    summary = {"function": name, "rps_target": rps * batch, "error": None}
+    runtime, undo = None, None
+    cold_boot, cold_first, warm = [], [], []
+    requests = cold_runs + warmup + len(arrival_times(rps, duration_s, arrival, seed)) * batch
+    try:
+        if scenario.setup:
+            undo = await standin.run_on_worker(scenario.setup, standin.store, standin.dataset, requests)
+        if runtime_url:
+            parts = urlsplit(runtime_url)
+            pool = HttpPool(parts.hostname, parts.port or 80)
+            path = f"{parts.path.rstrip('/')}/{scenario.function}"
+        else:
+            runtime = DenoFunction(scenario.function, stub.origin, functions_dir, deno)
+            await runtime.cache()
+            path = "/"
+            for run in range(cold_runs):
+                cold_boot.append(await runtime.start())
+                pool = HttpPool("127.0.0.1", runtime.port)
+                began = time.perf_counter()
+                await _call(pool, path, scenario, standin, run)
+                cold_first.append((time.perf_counter() - began) * 1000)
+                pool.close()
+                await runtime.stop()
+            await runtime.start()
+            pool = HttpPool("127.0.0.1", runtime.port)
+        for i in range(cold_runs, cold_runs + warmup):
+            began = time.perf_counter()
+            status, _ = await _call(pool, path, scenario, standin, i)
+            if 200 <= status < 300:
+                warm.append((time.perf_counter() - began) * 1000)
+        before = dict(stub.counts)
+        results, dropped, elapsed = await open_loop(
+            pool, path, scenario, standin, rps, duration_s, batch, arrival, max_inflight, drain_timeout_s, seed,
+            first_index=cold_runs + warmup,
+        )
+        pool.close()
+    except (RuntimeError, OSError, ConnectionError) as e:
+        summary["error"] = str(e)
+        return summary
+    finally:
+        if runtime:
+            summary["peak_rss_mb"] = round((runtime.peak_rss_bytes() or 0) / 2**20, 1) or None
+            await runtime.stop()
+            runtime.cleanup()
+        if undo:
+            await standin.run_on_worker(undo)
+
+    latencies = [latency for latency, status in results if latency is not None]
+    ok = [latency for latency, status in results if isinstance(status, int) and 200 <= status < 300]
+    statuses = {}
+    for _, status in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    upstream = {kind: count - before.get(kind, 0) for kind, count in stub.counts.items() if count > before.get(kind, 0)}
+    sends = upstream.get("function:send-whatsapp", 0) + upstream.get("green-api", 0)
+    summary.update({
+        "requests": len(results), "ok": len(ok), "dropped": dropped, "statuses": statuses,
+        "rps_achieved": round(len(ok) / elapsed, 2) if elapsed else None,
+        "p50_ms": _round(stats.percentile(latencies, 50)), "p95_ms": _round(stats.percentile(latencies, 95)),
+        "p99_ms": _round(stats.percentile(latencies, 99)), "max_ms": _round(max(latencies, default=None)),
+        "cold_boot_ms": _round(stats.percentile(cold_boot, 50)) if cold_boot else None,
+        "cold_first_ms": _round(stats.percentile(cold_first, 50)) if cold_first else None,
+        "warm_p50_ms": _round(stats.percentile(warm, 50)) if warm else None,
+        "loaded_p50_ms": _round(stats.percentile(ok, 50)) if ok else None,
+        "histogram": histogram(latencies),
+        "upstream": upstream,
+        "upstream_per_s": round(sum(upstream.values()) / elapsed, 2) if elapsed else None,
+        "whatsapp_sends_per_s": round(sends / elapsed, 2) if sends and elapsed else None,
+    })
+    return summary
+
+
+def _round(value):
+    return round(value, 1) if value is not None else None
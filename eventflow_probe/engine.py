@@ -0,0 +1,228 @@
+"""Async probe engine: one Chromium, a bounded pool of contexts, many targets."""
+
+import asyncio
+import inspect
+import time
+from dataclasses import asdict, dataclass, field
+
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import async_playwright
+
+from . import metrics as page_metrics
+
+
+@dataclass(frozen=True)
+class Target:
+    base_url: str
+    route: str
+
+    @property
+    def url(self):
+        return self.base_url + self.route
+
+
+@dataclass
+class ProbeResult:
+    target: Target
+    ok: bool = False
+    status: int = None
+    final_url: str = None
+    error: str = None
+    timings: dict = field(default_factory=dict)
+    metrics: dict = field(default_factory=dict)
+    probes: dict = field(default_factory=dict)
+    cache: str = None
+    run: int = None
+    root_html_length: int = None
+    console_errors: list = field(default_factory=list)
+    page_errors: list = field(default_factory=list)
+
+    def to_dict(self):
+        data = asdict(self)
+        data["target"] = self.target.url
+        return data
+
+
+class ContextPool:
+    """Lazily creates up to ``size`` browser contexts and leases them out.
+
+    ``context_hooks`` are awaited with each new context, which is where route
+    interception and init scripts get installed.
+    """
+
+    def __init__(self, browser, size, context_options=None, context_hooks=()):
+        self._browser = browser
+        self._size = size
+        self._options = context_options or {}
+        self._hooks = list(context_hooks)
+        self._idle = asyncio.Queue()
+        self._created = []
+        self._lock = asyncio.Lock()
+
+    async def new_context(self):
+        """Create a context outside the pool (caller closes it)."""
+        context = await self._browser.new_context(**self._options)
+        for hook in self._hooks:
+            await hook(context)
+        return context
+
+    async def acquire(self):
+        if self._idle.empty():
+            async with self._lock:
+                if len(self._created) < self._size:
+                    context = await self.new_context()
+                    self._created.append(context)
+                    return context
+        return await self._idle.get()
+
+    def release(self, context):
+        self._idle.put_nowait(context)
+
+    async def close(self):
+        for context in self._created:
+            await context.close()
+        self._created.clear()
+
+
+class ProbeEngine:
+    """Probe targets concurrently through one shared browser.
+
+    ``page_probes`` are objects with a ``name``, ``attach(page)`` (plain or
+    async) called before navigation, and ``async finish(state, timeout_ms)`` called after
+    the page loads; whatever ``finish`` returns lands in
+    ``result.probes[name]``.
+
+    Use as an async context manager::
+
+        async with ProbeEngine(concurrency=8) as engine:
+            results = await engine.run(targets)
+    """
+
+    def __init__(
+        self,
+        concurrency=8,
+        headless=True,
+        timeout_ms=15000,
+        wait_until="load",
+        context_options=None,
+        context_hooks=(),
+        collect_metrics=False,
+        settle_ms=500,
+        pending_selector=page_metrics.DEFAULT_PENDING_SELECTOR,
+        page_probes=(),
+    ):
+        self.concurrency = concurrency
+        self.headless = headless
+        self.timeout_ms = timeout_ms
+        self.wait_until = wait_until
+        self.context_options = context_options
+        self.context_hooks = list(context_hooks)
+        self.collect_metrics = collect_metrics
+        self.settle_ms = settle_ms
+        self.page_probes = list(page_probes)
+        if collect_metrics:
+            self.context_hooks.append(page_metrics.context_hook(pending_selector))
+        self._playwright = None
+        self.browser = None
+        self.pool = None
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def __aenter__(self):
+        self._playwright = await async_playwright().start()
+        self.browser = await self._playwright.chromium.launch(headless=self.headless)
+        self.pool = ContextPool(self.browser, self.concurrency, self.context_options, self.context_hooks)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.pool.close()
+        await self.browser.close()
+        await self._playwright.stop()
+
+    def slot(self):
+        """``async with engine.slot():`` holds one of the ``concurrency`` slots that :meth:`probe` loads use."""
+        return self._semaphore
+
+    async def probe(self, target):
+        async with self._semaphore:
+            context = await self.pool.acquire()
+            try:
+                return await self._load(context, target)
+            finally:
+                self.pool.release(context)
+
+    async def measure(self, target, runs, cache="cold"):
+        """Load ``target`` ``runs`` times and return one result per load.
+
+        ``cold`` gives every load a fresh context (empty HTTP cache and
+        storage). ``warm`` primes one context with an untimed load and then
+        repeats in it, so chunks come from the HTTP cache.
+        """
+        results = []
+        if cache == "cold":
+            for _ in range(runs):
+                async with self._semaphore:
+                    context = await self.pool.new_context()
+                    try:
+                        results.append(await self._load(context, target))
+                    finally:
+                        await context.close()
+        else:
+            context = await self.pool.new_context()
+            try:
+                async with self._semaphore:
+                    await self._load(context, target)
+                for _ in range(runs):
+                    async with self._semaphore:
+                        results.append(await self._load(context, target))
+            finally:
+                await context.close()
+        for run, result in enumerate(results):
+            result.cache, result.run = cache, run
+        return results
+
+    async def run(self, targets, on_result=None):
+        """Probe all targets; ``on_result`` is called as each one finishes."""
+
+        async def probe_and_report(target):
+            result = await self.probe(target)
+            if on_result:
+                on_result(result)
+            return result
+
+        return await asyncio.gather(*(probe_and_report(t) for t in targets))
+
+    async def _load(self, context, target):
+        result = ProbeResult(target)
+        page = await context.new_page()
+        page.on("console", lambda msg: msg.type == "error" and result.console_errors.append(msg.text))
+        page.on("pageerror", lambda err: result.page_errors.append(str(err)))
+        attached = []
+        for probe in self.page_probes:
+            state = probe.attach(page)
+            attached.append((probe, await state if inspect.isawaitable(state) else state))
+        start = time.perf_counter()
+        try:
+            response = await page.goto(target.url, wait_until=self.wait_until, timeout=self.timeout_ms)
+            result.timings["goto_ms"] = _elapsed_ms(start)
+            result.status = response.status if response else None
+            result.final_url = page.url
+            result.ok = result.status is None or result.status < 400
+            if self.collect_metrics:
+                result.metrics, error = await page_metrics.collect(page, self.timeout_ms, self.settle_ms)
+                if error:
+                    result.ok, result.error = False, error
+            for probe, state in attached:
+                result.probes[probe.name] = await probe.finish(state, self.timeout_ms)
+            result.root_html_length = await page.evaluate(
+                "() => document.querySelector('#root')?.innerHTML.length ?? 0"
+            )
+        except PlaywrightError as e:
+            result.error = str(e).splitlines()[0]
+        finally:
+            result.timings["total_ms"] = _elapsed_ms(start)
+            await page.close()
+        return result
+
+
+def _elapsed_ms(start):
+    return round((time.perf_counter() - start) * 1000, 1)
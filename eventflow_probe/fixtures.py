@@ -0,0 +1,375 @@
+"""Fixture datasets for the offline Supabase stand-in.
+
+Reference tables (vendor categories, event types, message templates) come
+from the scaffold seed SQL. Organization, events, participants and their
+schedules are synthesized on top of them, scaled to any participant count,
+from a seeded RNG so two runs with the same arguments see identical data.
+When a seed file also has events (``seed-3day-event.sql``), those events and
+their schedules are kept, the first one becomes the main event, and its
+seeded participants are topped up with synthetic ones.
+
+Finally every row gets the literal column defaults declared in the schema and
+migrations (``is_published``, ``session_type``, ...), as Postgres would fill
+them on insert, so filters such as ``.eq('is_deleted', false)`` match.
+"""
+
+import copy
+import json
+import random
+import re
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SCAFFOLD_DIR = REPO_ROOT / "eventflow-app" / "eventflow-scaffold"
+DEFAULT_SEED_SQL = (SCAFFOLD_DIR / "seed.sql",)
+THREE_DAY_EVENT_SQL = REPO_ROOT / "eventflow-scaffold" / "seed-3day-event.sql"
+MIGRATIONS_DIR = REPO_ROOT / "eventflow-app" / "supabase" / "migrations"
+SCHEMA_SQL = (SCAFFOLD_DIR / "schema.sql", *sorted(MIGRATIONS_DIR.glob("*.sql")))
+# Columns the app filters on that no schema file in this tree declares.
+EXTRA_COLUMN_DEFAULTS = {"schedules": {"is_deleted": False}}
+
+FIRST_NAMES = ("נועה", "יוסי", "מיכל", "דניאל", "שירה", "אורי", "תמר", "איתי", "רוני", "עדי", "יעל", "עומר")
+LAST_NAMES = ("כהן", "לוי", "מזרחי", "פרץ", "ביטון", "אברהם", "פרידמן", "שפירא", "דהן", "אזולאי")
+PARTICIPANT_STATUSES = ("invited", "confirmed", "confirmed", "confirmed", "declined", "maybe")
+DIETARY = ((), (), (), ("vegetarian",), ("vegan",), ("gluten_free",), ("kosher",))
+MESSAGE_STATUSES = ("sent", "delivered", "delivered", "read", "read", "failed", "pending")
+MESSAGE_CHANNELS = ("whatsapp", "whatsapp", "whatsapp", "sms", "email")
+SESSION_TITLES = ("פתיחה", "הרצאה מרכזית", "פאנל", "סדנה", "הפסקת קפה", "ארוחת צהריים", "נטוורקינג", "סיכום")
+
+_SEEDED_ENTITIES = ("events", "schedules", "participants")
+_INSERT_RE = re.compile(r"INSERT\s+INTO\s+(\w+)\s*\(([^)]*)\)\s*VALUES\s*", re.IGNORECASE)
+_TOKEN_RE = re.compile(r"'(?:[^']|'')*'|[(),;]|[^\s(),;']+")
+_CREATE_TABLE_RE = re.compile(
+    r"^CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(?:public\.)?(\w+)\s*\((.*)\)\s*$", re.IGNORECASE | re.DOTALL
+)
+_ALTER_TABLE_RE = re.compile(
+    r"^ALTER\s+TABLE\s+(?:IF\s+EXISTS\s+)?(?:ONLY\s+)?(?:public\.)?(\w+)\s+(.*)$", re.IGNORECASE | re.DOTALL
+)
+_ADD_COLUMN_RE = re.compile(r"^ADD\s+(?:COLUMN\s+)?(?:IF\s+NOT\s+EXISTS\s+)?(\w+)\s+(.*)$", re.IGNORECASE | re.DOTALL)
+_DEFAULT_RE = re.compile(
+    r"\bDEFAULT\s+('(?:[^']|'')*'|ARRAY\s*\[[^\]]*\]|TRUE\b|FALSE\b|-?\d+(?:\.\d+)?\b)", re.IGNORECASE
+)
+_SQL_PART_RE = re.compile(r"'(?:[^']|'')*'|--[^\n]*|[()\[\],;]|[^'()\[\],;-]+|-")
+_TIMESTAMP_RE = re.compile(r"^\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:[+-]\d{2}(?::?\d{2})?|Z)?$")
+
+
+def parse_seed_inserts(path):
+    """Parse ``INSERT INTO t (cols) VALUES (...), (...);`` statements.
+
+    Handles quoted strings with ``''`` escapes, numbers, booleans and NULL;
+    string values that look like JSON arrays/objects are decoded, and
+    timestamps are returned in ISO form as PostgREST would send them
+    (``'2026-01-30 08:00:00+02'`` → ``2026-01-30T08:00:00+02:00``). Returns
+    ``{table: [row, ...]}``.
+    """
+    sql = "\n".join(
+        line for line in Path(path).read_text(encoding="utf-8").splitlines() if not line.lstrip().startswith("--")
+    )
+    tables = {}
+    for match in _INSERT_RE.finditer(sql):
+        table = match.group(1)
+        columns = [c.strip() for c in match.group(2).split(",")]
+        rows = tables.setdefault(table, [])
+        depth, values = 0, []
+        for token in _TOKEN_RE.finditer(sql, match.end()):
+            text = token.group(0)
+            if text == "(":
+                depth += 1
+                values = []
+            elif text == ")":
+                depth -= 1
+                if depth == 0:
+                    rows.append(dict(zip(columns, values)))
+            elif text == ";" and depth == 0:
+                break
+            elif text != "," and depth == 1:
+                values.append(_sql_literal(text))
+    return tables
+
+
+def _sql_literal(text):
+    if text.startswith("'"):
+        value = text[1:-1].replace("''", "'")
+        if value[:1] in "[{":
+            try:
+                return json.loads(value)
+            except ValueError:
+                pass
+        if _TIMESTAMP_RE.match(value):
+            try:
+                return datetime.fromisoformat(value).isoformat()
+            except ValueError:
+                pass
+        return value
+    upper = text.upper()
+    if upper in ("TRUE", "FALSE"):
+        return upper == "TRUE"
+    if upper == "NULL":
+        return None
+    try:
+        return int(text)
+    except ValueError:
+        try:
+            return float(text)
+        except ValueError:
+            return text
+
+
+def _split_sql(text, sep):
+    """Split on ``sep`` outside quotes and brackets, dropping ``--`` comments."""
+    parts, current, depth = [], [], 0
+    for token in _SQL_PART_RE.findall(text):
+        if token.startswith("--"):
+            continue
+        if token in "([":
+            depth += 1
+        elif token in ")]":
+            depth -= 1
+        if token == sep and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+        else:
+            current.append(token)
+    parts.append("".join(current).strip())
+    return [p for p in parts if p]
+
+
+def _column_default(definition):
+    match = _DEFAULT_RE.search(definition)
+    if match is None:
+        return None
+    literal = match.group(1)
+    if literal.upper().startswith("ARRAY"):
+        inner = literal[literal.index("[") + 1 : -1]
+        return [_sql_literal(item) for item in _split_sql(inner, ",")]
+    value = _sql_literal(literal)
+    if value == {} and "[]" in definition.split()[0]:
+        return []  # '{}' is an empty Postgres array literal on ``text[]`` columns
+    return value
+
+
+def parse_column_defaults(paths=SCHEMA_SQL):
+    """Literal ``DEFAULT`` values per table from ``CREATE TABLE`` and ``ADD COLUMN``.
+
+    Function defaults (``now()``, ``gen_random_uuid()``) are left out; later
+    files override earlier ones. Returns ``{table: {column: value}}``.
+    """
+    defaults = {}
+    for path in paths:
+        for statement in _split_sql(Path(path).read_text(encoding="utf-8"), ";"):
+            created, altered = _CREATE_TABLE_RE.match(statement), _ALTER_TABLE_RE.match(statement)
+            if created:
+                table = created.group(1)
+                columns = (part.split(None, 1) for part in _split_sql(created.group(2), ","))
+                columns = [(c[0].strip('"'), c[1]) for c in columns if len(c) == 2]
+            elif altered:
+                table = altered.group(1)
+                columns = [m.groups() for m in map(_ADD_COLUMN_RE.match, _split_sql(altered.group(2), ",")) if m]
+            else:
+                continue
+            for column, definition in columns:
+                value = _column_default(definition)
+                if value is not None:
+                    defaults.setdefault(table.lower(), {})[column] = value
+    return defaults
+
+
+def fill_defaults(tables, defaults):
+    """``setdefault`` each table's column defaults on its rows (mutable values are copied)."""
+    for table, rows in tables.items():
+        columns = defaults.get(table)
+        if not columns:
+            continue
+        scalars = {c: v for c, v in columns.items() if not isinstance(v, (dict, list))}
+        mutables = {c: v for c, v in columns.items() if isinstance(v, (dict, list))}
+        for row in rows:
+            for column, value in scalars.items():
+                row.setdefault(column, value)
+            for column, value in mutables.items():
+                if column not in row:
+                    row[column] = copy.deepcopy(value)
+
+
+class Dataset:
+    """In-memory tables keyed by name, plus the ids the stand-in needs."""
+
+    def __init__(self, tables, user_id, organization_id, event_ids, column_defaults=None):
+        self.tables = tables
+        self.column_defaults = column_defaults or {}
+        self.user_id = user_id
+        self.organization_id = organization_id
+        self.event_ids = event_ids
+
+    @property
+    def primary_event_id(self):
+        return self.event_ids[0]
+
+    def counts(self):
+        return {name: len(rows) for name, rows in sorted(self.tables.items())}
+
+
+def generate(participants=500, events=3, sessions_per_event=12, sessions_per_participant=1, seed=0,
+             seed_sql=DEFAULT_SEED_SQL, messages_per_participant=0, schema_sql=SCHEMA_SQL, venue_tables=8):
+    """Build a :class:`Dataset`; ``participants`` go to the first event.
+
+    Events, schedules and participants found in ``seed_sql`` come first: the
+    first seeded event is the main one, and its seeded participants count
+    towards ``participants``. The main event gets ``venue_tables`` round
+    tables laid out like the app's "banquet" preset, so the seating plan
+    opens on a floor plan instead of the layout picker.
+    """
+    rng = random.Random(seed)
+
+    def new_id():
+        return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    stamp = now.isoformat()
+    tables = {}
+    for path in seed_sql:
+        for table, rows in parse_seed_inserts(path).items():
+            for row in rows:
+                row.setdefault("id", new_id())
+                row.setdefault("created_at", stamp)
+                if table not in _SEEDED_ENTITIES:
+                    row.setdefault("is_active", True)
+            tables.setdefault(table, []).extend(rows)
+    seeded_events, seeded_schedules, seeded_participants = (tables.pop(name, []) for name in _SEEDED_ENTITIES)
+
+    organization_id, user_id = new_id(), new_id()
+    tables["organizations"] = [
+        {"id": organization_id, "name": "EventFlow Perf Org", "settings": {}, "tier": "premium",
+         "created_at": stamp, "updated_at": stamp}
+    ]
+    tables["user_profiles"] = [
+        {"id": user_id, "organization_id": organization_id, "full_name": "Perf Organizer",
+         "email": "perf@eventflow.test", "role": "admin", "phone": "0500000000", "avatar_url": None,
+         "created_at": stamp, "updated_at": stamp}
+    ]
+
+    event_types = tables.get("event_types") or [{"id": new_id(), "name": "כנס", "icon": "🎤"}]
+    tables.setdefault("event_types", event_types)
+    event_rows = [
+        {"organization_id": organization_id, "created_by": user_id, "event_type_id": event_types[0]["id"],
+         "public_rsvp_enabled": True, "settings": {}, "updated_at": stamp, **row}
+        for row in seeded_events
+    ]
+    schedule_rows = [
+        {"current_count": 0, "updated_at": stamp, **row}
+        for row in seeded_schedules
+    ]
+    for index in range(len(event_rows), events):
+        start = now + timedelta(days=30 + 7 * index)
+        event_id = new_id()
+        event_rows.append({
+            "id": event_id, "organization_id": organization_id, "created_by": user_id,
+            "event_type_id": event_types[index % len(event_types)]["id"],
+            "name": f"אירוע בדיקה {index + 1}", "description": None, "status": "active",
+            "start_date": start.isoformat(), "end_date": (start + timedelta(days=3)).isoformat(),
+            "venue_name": "מרכז הכנסים", "venue_address": "רחוב הבדיקה 1", "venue_city": "תל אביב",
+            "max_participants": participants if index == 0 else 200, "budget": 250000,
+            "public_rsvp_enabled": True, "settings": {}, "created_at": stamp, "updated_at": stamp,
+        })
+        for slot in range(sessions_per_event):
+            session_start = start + timedelta(days=slot // 6, hours=9 + slot % 6)
+            schedule_rows.append({
+                "id": new_id(), "event_id": event_id,
+                "title": SESSION_TITLES[slot % len(SESSION_TITLES)],
+                "start_time": session_start.isoformat(),
+                "end_time": (session_start + timedelta(minutes=50)).isoformat(),
+                "location": f"אולם {slot % 4 + 1}", "room": f"{slot % 4 + 1}",
+                "is_break": SESSION_TITLES[slot % len(SESSION_TITLES)] == "הפסקת קפה",
+                "is_mandatory": slot == 0, "sort_order": slot, "current_count": 0,
+                "created_at": stamp, "updated_at": stamp,
+            })
+    tables["events"] = event_rows
+    tables["schedules"] = schedule_rows
+
+    main_event = event_rows[0]["id"]
+    event_rows[0]["max_participants"] = max(event_rows[0].get("max_participants") or 0, participants)
+    main_sessions = [s for s in schedule_rows if s["event_id"] == main_event]
+    seeded_main = [p for p in seeded_participants if p.get("event_id") == main_event][:participants]
+    participant_rows = [
+        _seeded_participant(row, stamp) for row in seeded_participants if row.get("event_id") != main_event
+    ]
+    assignment_rows = []
+
+    def assign(participant_id):
+        for session in rng.sample(main_sessions, min(sessions_per_participant, len(main_sessions))):
+            assignment_rows.append({
+                "id": new_id(), "participant_id": participant_id, "schedule_id": session["id"],
+                "is_companion": False, "reminder_sent": False, "attended": None, "created_at": stamp,
+            })
+
+    for row in seeded_main:
+        participant_rows.append(_seeded_participant(row, stamp))
+        assign(row["id"])
+    for index in range(len(seeded_main), participants):
+        status = rng.choice(PARTICIPANT_STATUSES)
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        phone = f"05{rng.randrange(10**8):08d}"
+        participant_id = new_id()
+        participant_rows.append({
+            "id": participant_id, "event_id": main_event, "first_name": first, "last_name": last,
+            "full_name": f"{first} {last}", "email": f"guest{index}@eventflow.test",
+            "phone": phone, "phone_normalized": "972" + phone[1:], "status": status,
+            "has_companion": rng.random() < 0.1, "dietary_restrictions": list(rng.choice(DIETARY)),
+            "is_vip": rng.random() < 0.02, "needs_transportation": rng.random() < 0.15,
+            "checked_in_at": None, "custom_fields": {}, "created_at": stamp, "updated_at": stamp,
+        })
+        assign(participant_id)
+    tables["participants"] = participant_rows
+    tables["participant_schedules"] = assignment_rows
+
+    message_rows = []
+    for participant in participant_rows:
+        for order in range(messages_per_participant):
+            sent = (now - timedelta(minutes=len(message_rows))).isoformat()
+            message_rows.append({
+                "id": new_id(), "event_id": main_event, "participant_id": participant["id"], "template_id": None,
+                "channel": rng.choice(MESSAGE_CHANNELS), "to_phone": participant["phone"],
+                "to_phone_normalized": participant["phone_normalized"], "to_email": participant["email"],
+                "subject": f"תזכורת {order + 1}", "content": f"שלום {participant['first_name']}, נתראה באירוע!",
+                "variables_used": {}, "status": rng.choice(MESSAGE_STATUSES), "direction": "outgoing",
+                "sent_at": sent, "delivered_at": None, "read_at": None, "failed_at": None, "error_message": None,
+                "external_message_id": None, "response_content": None, "response_at": None, "from_phone": None,
+                "auto_reply": False, "message_type": "reminder", "schedule_id": None, "scheduled_for": None,
+                "created_at": sent, "updated_at": sent,
+            })
+    tables["messages"] = message_rows
+
+    tables["checklist_items"] = [
+        {"id": new_id(), "event_id": event["id"], "title": item["title"], "category": item.get("category"),
+         "priority": item.get("priority", "medium"), "status": "pending", "sort_order": order,
+         "is_from_template": True, "created_at": stamp, "updated_at": stamp}
+        for event, event_type in ((e, _by_id(event_types, e["event_type_id"])) for e in event_rows)
+        for order, item in enumerate((event_type or {}).get("default_checklist") or [])
+    ]
+    tables["venue_tables"] = [
+        {"id": new_id(), "event_id": main_event, "table_number": number + 1, "name": f"שולחן {number + 1}",
+         "shape": "round", "capacity": 8, "x": 80 + number % 4 * 300, "y": 100 + number // 4 * 300, "rotation": 0,
+         "created_at": stamp, "updated_at": stamp}
+        for number in range(venue_tables)
+    ]
+    column_defaults = parse_column_defaults(schema_sql)
+    for table, columns in EXTRA_COLUMN_DEFAULTS.items():
+        column_defaults.setdefault(table, {}).update(columns)
+    fill_defaults(tables, column_defaults)
+    return Dataset(tables, user_id, organization_id, [e["id"] for e in event_rows], column_defaults)
+
+
+def _seeded_participant(row, stamp):
+    """Fill the columns a seed file leaves out with the defaults synthetic participants get."""
+    phone = row.get("phone")
+    return {
+        "full_name": f"{row.get('first_name', '')} {row.get('last_name', '')}".strip(), "email": None,
+        "phone_normalized": "972" + phone[1:] if phone and phone.startswith("0") else phone,
+        "has_companion": False, "dietary_restrictions": [], "is_vip": False, "needs_transportation": False,
+        "checked_in_at": None, "custom_fields": {}, "updated_at": stamp, **row,
+    }
+
+
+def _by_id(rows, row_id):
+    return next((row for row in rows if row.get("id") == row_id), None)
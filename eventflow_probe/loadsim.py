@@ -0,0 +1,216 @@
+"""Door-scanner load simulation for the offline check-in path.
+
+Each simulated device is its own browser context (own IndexedDB and
+localStorage, so its own ``eventflow_sync_rate_limit`` window). The device
+opens ``/event/checkin``, switches to scan mode, and types its share of
+guest QR codes (``EF-`` plus the first 8 id characters, as CheckinPage
+builds them) at a jittered pace. An outage schedule moves devices between
+offline and online with ``context.set_offline``, which also fires the
+browser ``online``/``offline`` events that ``setupAutoSync`` listens to.
+
+A sampler records the local queue depth per device from a raw IndexedDB
+scan and the server-side check-in count from the stand-in, until the
+server agrees with every scan or the drain timeout passes. The raw scan
+does not use the Dexie ``synced`` index, because boolean values are not
+valid IndexedDB keys.
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+
+from playwright.async_api import Error as PlaywrightError
+
+_QUEUE_SCRIPT = """
+async () => {
+  const names = (await indexedDB.databases()).map(d => d.name);
+  if (!names.includes('EventFlowCheckIn')) return { total: 0, pending: 0, retries: 0, maxRetries: 0 };
+  return await new Promise(resolve => {
+    const open = indexedDB.open('EventFlowCheckIn');
+    open.onerror = () => resolve(null);
+    open.onsuccess = () => {
+      const db = open.result;
+      if (!db.objectStoreNames.contains('checkIns')) { db.close(); resolve(null); return; }
+      const all = db.transaction('checkIns', 'readonly').objectStore('checkIns').getAll();
+      all.onsuccess = () => {
+        const rows = all.result;
+        const retries = rows.map(r => r.syncRetries || 0);
+        resolve({
+          total: rows.length,
+          pending: rows.filter(r => r.synced !== true && r.synced !== 1).length,
+          retries: retries.reduce((a, b) => a + b, 0),
+          maxRetries: Math.max(0, ...retries),
+        });
+        db.close();
+      };
+      all.onerror = () => { db.close(); resolve(null); };
+    };
+  });
+}
+"""
+
+
+def qr_code(participant_id):
+    return "EF-" + participant_id[:8].upper()
+
+
+def parse_outage(value):
+    """``START:END`` seconds from simulation start."""
+    start, _, end = value.partition(":")
+    return float(start), float(end)
+
+
+@dataclass
+class Device:
+    index: int
+    codes: list
+    context: object = None
+    page: object = None
+    online: bool = True
+    scanned: int = 0
+    scan_errors: int = 0
+    ready: bool = False
+    error: str = None
+    queue: dict = field(default_factory=dict)
+
+
+class CheckinSimulation:
+    def __init__(self, engine, standin, base_url, devices=20, guests=5000, scan_interval_ms=1500,
+                 outages=(), outage_jitter_s=0.0, sample_ms=1000, drain_timeout_s=300, seed=0):
+        self.engine = engine
+        self.standin = standin
+        self.base_url = base_url.rstrip("/")
+        self.scan_interval_ms = scan_interval_ms
+        self.outages = list(outages)
+        self.outage_jitter_s = outage_jitter_s
+        self.sample_ms = sample_ms
+        self.drain_timeout_s = drain_timeout_s
+        self._rng = random.Random(seed)
+        event_id = standin.dataset.primary_event_id
+        self.guests = [p for p in standin.dataset.tables["participants"] if p["event_id"] == event_id][:guests]
+        self.devices = [Device(i, [qr_code(p["id"]) for p in self.guests[i::devices]]) for i in range(devices)]
+        self.timeline = []
+        self._start = None
+
+    def _elapsed(self):
+        return time.perf_counter() - self._start
+
+    def server_checked_in(self):
+        return sum(1 for p in self.guests if p.get("status") == "checked_in")
+
+    async def _open_device(self, device):
+        async with self.engine.slot():
+            try:
+                device.context = await self.engine.pool.new_context()
+                device.page = await device.context.new_page()
+                await device.page.goto(f"{self.base_url}/event/checkin", timeout=self.engine.timeout_ms)
+                await device.page.click('[data-testid="toggle-scan-mode"]', timeout=self.engine.timeout_ms)
+                await device.page.wait_for_selector('[data-testid="manual-code-input"]', timeout=self.engine.timeout_ms)
+                device.ready = True
+            except PlaywrightError as e:
+                device.error = str(e).splitlines()[0]
+
+    async def _scan(self, device):
+        codes = list(device.codes)
+        self._rng.shuffle(codes)
+        for code in codes:
+            await asyncio.sleep(self.scan_interval_ms * self._rng.uniform(0.5, 1.5) / 1000)
+            try:
+                await device.page.fill('[data-testid="manual-code-input"]', code)
+                await device.page.press('[data-testid="manual-code-input"]', "Enter")
+                device.scanned += 1
+            except PlaywrightError:
+                device.scan_errors += 1
+
+    async def _device_schedule(self, device):
+        offset = self._rng.uniform(0, self.outage_jitter_s)
+        for start, end in sorted(self.outages):
+            for at, online in ((start + offset, False), (end + offset, True)):
+                await asyncio.sleep(max(0.0, at - self._elapsed()))
+                await device.context.set_offline(not online)
+                device.online = online
+
+    async def _sample(self, devices):
+        queues = await asyncio.gather(*(_queue(d.page) for d in devices))
+        for device, queue in zip(devices, queues):
+            if queue is not None:
+                device.queue = queue
+        row = {
+            "t_s": round(self._elapsed(), 2),
+            "online": sum(d.online for d in devices),
+            "scanned": sum(d.scanned for d in devices),
+            "local_total": sum(d.queue.get("total", 0) for d in devices),
+            "queue_depth": sum(d.queue.get("pending", 0) for d in devices),
+            "retries": sum(d.queue.get("retries", 0) for d in devices),
+            "server_checked_in": self.server_checked_in(),
+            "sync_requests": self.standin.request_counts.get(("PATCH", "participants"), 0),
+        }
+        self.timeline.append(row)
+        return row
+
+    async def run(self, on_sample=None):
+        await asyncio.gather(*(self._open_device(d) for d in self.devices))
+        devices = [d for d in self.devices if d.ready]
+        self._start = time.perf_counter()
+        scanners = asyncio.gather(*(self._scan(d) for d in devices))
+        schedule = asyncio.gather(*(self._device_schedule(d) for d in devices))
+        scanning_done_at = consistent_at = None
+        while True:
+            row = await self._sample(devices)
+            if on_sample:
+                on_sample(row)
+            if scanning_done_at is None and scanners.done() and schedule.done():
+                scanning_done_at = row["t_s"]
+            if scanning_done_at is not None:
+                if row["server_checked_in"] >= row["scanned"] and row["queue_depth"] == 0:
+                    consistent_at = row["t_s"]
+                    break
+                if row["t_s"] - scanning_done_at > self.drain_timeout_s:
+                    break
+            await asyncio.sleep(self.sample_ms / 1000)
+        await asyncio.gather(scanners, schedule, return_exceptions=True)
+        for device in self.devices:
+            if device.context:
+                await device.context.close()
+        return self.summary(devices, scanning_done_at, consistent_at)
+
+    def summary(self, devices, scanning_done_at, consistent_at):
+        last_online = max((end for _, end in self.outages), default=0.0) + self.outage_jitter_s
+        after = [r for r in self.timeline if r["t_s"] >= last_online]
+        drain = None
+        if len(after) > 1 and after[-1]["t_s"] > after[0]["t_s"]:
+            drain = (after[-1]["server_checked_in"] - after[0]["server_checked_in"]) / (
+                after[-1]["t_s"] - after[0]["t_s"]
+            )
+        peak = max(self.timeline, key=lambda r: r["queue_depth"], default={})
+        final = self.timeline[-1] if self.timeline else {}
+        return {
+            "devices": len(self.devices),
+            "devices_ready": len(devices),
+            "device_errors": [d.error for d in self.devices if d.error],
+            "guests": len(self.guests),
+            "scanned": final.get("scanned", 0),
+            "scan_errors": sum(d.scan_errors for d in devices),
+            "server_checked_in": final.get("server_checked_in", 0),
+            "unsynced": final.get("queue_depth", 0),
+            "peak_queue_depth": peak.get("queue_depth", 0),
+            "peak_queue_at_s": peak.get("t_s"),
+            "retries": final.get("retries", 0),
+            "max_device_retries": max((d.queue.get("maxRetries", 0) for d in devices), default=0),
+            "sync_requests": final.get("sync_requests", 0),
+            "drain_per_s": round(drain, 2) if drain is not None else None,
+            "scanning_done_s": scanning_done_at,
+            "consistent_at_s": consistent_at,
+            "time_to_consistency_s": (
+                round(consistent_at - scanning_done_at, 2) if consistent_at is not None else None
+            ),
+        }
+
+
+async def _queue(page):
+    try:
+        return await page.evaluate(_QUEUE_SCRIPT)
+    except PlaywrightError:
+        return None
+
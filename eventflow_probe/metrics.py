@@ -0,0 +1,159 @@
+"""In-page performance capture: Navigation/Paint Timing, LCP, CLS, long tasks.
+
+``INIT_SCRIPT`` is installed on every context before any app code runs. It
+buffers performance entries and records when ``#root`` first holds real
+content, meaning rendered text with no ``LazyFallback`` / ``ProtectedRoute``
+spinner still on screen. :func:`collect` reads the buffers back after load.
+"""
+
+import json
+
+from playwright.async_api import Error as PlaywrightError
+
+from . import stats
+
+# Spinners App.tsx shows while a lazy chunk or the auth session is loading.
+DEFAULT_PENDING_SELECTOR = "#root .h-64 > .animate-spin, #root .min-h-screen .animate-spin"
+
+INIT_SCRIPT = """
+(() => {
+  const state = window.__eventflowProbe = {
+    lcp: null, clsEntries: [], longTasks: [],
+    rootReadyAt: null, fallbackSeenAt: null,
+  };
+  const observe = (type, onEntry) => {
+    try {
+      new PerformanceObserver(list => list.getEntries().forEach(onEntry))
+        .observe({ type, buffered: true });
+    } catch (e) { /* entry type unsupported */ }
+  };
+  observe('largest-contentful-paint', e => { state.lcp = e.startTime; });
+  observe('layout-shift', e => {
+    if (!e.hadRecentInput) state.clsEntries.push([e.startTime, e.value]);
+  });
+  observe('longtask', e => state.longTasks.push([e.startTime, e.duration]));
+
+  const pendingSelector = %(pending)s;
+  const check = () => {
+    if (state.rootReadyAt !== null) return;
+    const root = document.getElementById('root');
+    if (!root) return;
+    if (document.querySelector(pendingSelector)) {
+      if (state.fallbackSeenAt === null) state.fallbackSeenAt = performance.now();
+      return;
+    }
+    if (root.innerText.trim().length > 0) {
+      state.rootReadyAt = performance.now();
+      observer.disconnect();
+    }
+  };
+  const observer = new MutationObserver(check);
+  observer.observe(document, { childList: true, subtree: true, characterData: true });
+})();
+"""
+
+_COLLECT_SCRIPT = """
+() => {
+  const state = window.__eventflowProbe || {};
+  const nav = performance.getEntriesByType('navigation')[0];
+  const paint = Object.fromEntries(
+    performance.getEntriesByType('paint').map(e => [e.name, e.startTime]));
+  const fcp = paint['first-contentful-paint'] ?? null;
+
+  // CLS: largest session window (gap < 1s, window < 5s), as in web-vitals.
+  let cls = 0, session = 0, first = 0, last = 0;
+  for (const [t, v] of state.clsEntries || []) {
+    if (session && t - last < 1000 && t - first < 5000) {
+      session += v;
+    } else {
+      session = v; first = t;
+    }
+    last = t;
+    cls = Math.max(cls, session);
+  }
+
+  const tasks = state.longTasks || [];
+  const blocking = tasks
+    .filter(([start]) => fcp === null || start >= fcp)
+    .reduce((sum, [, duration]) => sum + Math.max(0, duration - 50), 0);
+
+  return {
+    ttfb_ms: nav ? nav.responseStart : null,
+    dom_interactive_ms: nav ? nav.domInteractive : null,
+    dom_content_loaded_ms: nav ? nav.domContentLoadedEventEnd : null,
+    load_event_ms: nav ? nav.loadEventEnd : null,
+    document_transfer_bytes: nav ? nav.transferSize : null,
+    first_paint_ms: paint['first-paint'] ?? null,
+    fcp_ms: fcp,
+    lcp_ms: state.lcp,
+    cls: Math.round(cls * 10000) / 10000,
+    long_task_count: tasks.length,
+    long_task_ms: tasks.reduce((sum, [, duration]) => sum + duration, 0),
+    total_blocking_time_ms: blocking,
+    root_content_ms: state.rootReadyAt,
+    fallback_seen_ms: state.fallbackSeenAt,
+  };
+}
+"""
+
+# Metrics that get percentile summaries across repeat runs.
+SUMMARY_METRICS = (
+    "ttfb_ms",
+    "dom_content_loaded_ms",
+    "load_event_ms",
+    "fcp_ms",
+    "lcp_ms",
+    "cls",
+    "total_blocking_time_ms",
+    "root_content_ms",
+)
+
+
+def init_script(pending_selector=DEFAULT_PENDING_SELECTOR):
+    return INIT_SCRIPT % {"pending": json.dumps(pending_selector)}
+
+
+def context_hook(pending_selector=DEFAULT_PENDING_SELECTOR):
+    """Context hook that installs the capture script."""
+    script = init_script(pending_selector)
+
+    async def install(context):
+        await context.add_init_script(script)
+
+    return install
+
+
+async def collect(page, timeout_ms, settle_ms=500):
+    """Wait for ``#root`` content, let late entries land, and read metrics.
+
+    Returns ``(metrics, error)``; ``error`` is set when the root never
+    rendered content within ``timeout_ms``.
+    """
+    error = None
+    try:
+        await page.wait_for_function(
+            "() => window.__eventflowProbe && window.__eventflowProbe.rootReadyAt !== null",
+            timeout=timeout_ms,
+        )
+    except PlaywrightError:
+        error = "#root never rendered content"
+    await page.wait_for_timeout(settle_ms)
+    metrics = await page.evaluate(_COLLECT_SCRIPT)
+    for key, value in metrics.items():
+        if key.endswith("_ms") and isinstance(value, float):
+            metrics[key] = round(value, 1)
+    return metrics, error
+
+
+def summarize_runs(results, names=SUMMARY_METRICS, confidence=0.95):
+    """Group repeat-run results by (target, cache) and summarize each metric."""
+    groups = {}
+    for result in results:
+        if result.ok:
+            groups.setdefault((result.target.url, result.cache), []).append(result)
+    rows = []
+    for (url, cache), runs in groups.items():
+        for name in names:
+            summary = stats.summarize([r.metrics.get(name) for r in runs], confidence)
+            rows.append({"target": url, "cache": cache, "metric": name, **summary})
+    return rows
@@ -0,0 +1,353 @@
+"""Per-route network waterfall with attribution to the Vite chunks.
+
+A :class:`NetworkProbe` opens a CDP session for each page and records every
+request the page makes. For each request it keeps the initiator, the start,
+time-to-first-byte and end times relative to the document request, the
+transfer size (on the wire) and the decoded size. JS and CSS assets are
+mapped back to the ``manualChunks`` groups in ``vite.config.ts``
+(``vendor-react``, ``vendor-supabase``, ...), to the ``index`` entry, or to
+a lazy route chunk. In dev mode, ``.vite/deps`` files are mapped by
+package name instead.
+
+Following initiators gives each request a depth (the document is 1, and
+``index-*.js`` loaded by the HTML is 2). The *critical path* is the deepest
+chain that finished before ``#root`` showed content. JS/CSS on that path
+that only a script could discover (``import()``) are *preloadable*: a
+``<link rel="modulepreload">`` would let them start when the HTML arrives.
+
+Sizes only match ``check-bundle-budget.mjs`` against a production build
+(``npm run build && npm run preview``); the same budgets are read from that
+script and checked against decoded bytes.
+"""
+
+import asyncio
+import json
+import re
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from . import queries
+from .routes import APP_TSX
+
+VITE_CONFIG = APP_TSX.parent.parent / "vite.config.ts"
+BUNDLE_BUDGET_SCRIPT = APP_TSX.parent.parent / "scripts" / "check-bundle-budget.mjs"
+
+_MANUAL_CHUNKS_RE = re.compile(r"manualChunks\s*:\s*\{([^}]*)\}", re.S)
+_CHUNK_ENTRY_RE = re.compile(r"['\"]([\w-]+)['\"]\s*:\s*\[([^\]]*)\]")
+_BUDGET_RE = re.compile(r"findLargest\('([\w-]+?)-?'\),\s*maxBytes:\s*(\d+)\s*\*\s*1024")
+_HASHED_ASSET_RE = re.compile(r"^(?P<stem>.+)-[\w-]{8}\.(?:js|mjs|css)$")
+_ASSET_TYPES = {"Script", "Stylesheet"}
+
+# performance.now() when #root first held content (metrics init script), else FCP, and the
+# document's requestStart on the same clock so the render time can be moved onto the CDP one.
+_RENDER_SCRIPT = """
+() => ({
+  render: window.__eventflowProbe?.rootReadyAt
+    ?? performance.getEntriesByName('first-contentful-paint')[0]?.startTime
+    ?? null,
+  requestStart: performance.getEntriesByType('navigation')[0]?.requestStart ?? null,
+})
+"""
+
+
+def load_manual_chunks(vite_config=VITE_CONFIG):
+    """``{chunk: [package, ...]}`` from the ``manualChunks`` object literal."""
+    match = _MANUAL_CHUNKS_RE.search(Path(vite_config).read_text(encoding="utf-8"))
+    if not match:
+        return {}
+    return {
+        name: re.findall(r"['\"]([^'\"]+)['\"]", packages)
+        for name, packages in _CHUNK_ENTRY_RE.findall(match.group(1))
+    }
+
+
+def load_budgets(script=BUNDLE_BUDGET_SCRIPT):
+    """``{chunk: max_bytes}`` from the ``findLargest(prefix)`` budgets."""
+    return {prefix: int(kb) * 1024 for prefix, kb in _BUDGET_RE.findall(Path(script).read_text(encoding="utf-8"))}
+
+
+def chunk_for(url, manual_chunks):
+    """Attribute ``url`` to a chunk label, e.g. ``vendor-react`` or ``lazy:EventsPage``."""
+    kind = queries.classify(url)
+    if kind:
+        return f"supabase:{kind[0]}"
+    path = urlsplit(url).path
+    name = path.rsplit("/", 1)[-1]
+    if "/assets/" in path:
+        match = _HASHED_ASSET_RE.match(name)
+        stem = match.group("stem") if match else name
+        return stem if stem in manual_chunks or stem == "index" else f"lazy:{stem}"
+    if "/node_modules/.vite/deps/" in path:
+        dep = name.rsplit(".", 1)[0]
+        for chunk, packages in manual_chunks.items():
+            for package in packages:
+                flat = package.replace("/", "_")
+                if dep == flat or dep.startswith(flat + "_"):
+                    return chunk
+        return f"deps:{dep}"
+    if path.startswith("/src/"):
+        return "src:" + "/".join(path.split("/")[2:4])
+    return None
+
+
+class NetworkRecorder:
+    """Collects Network domain events from one page's CDP session."""
+
+    def __init__(self, session, page):
+        self.session = session
+        self.page = page
+        self.entries = {}
+        self._by_url = {}
+        self._order = []
+        for event in ("requestWillBeSent", "responseReceived", "dataReceived", "loadingFinished",
+                      "loadingFailed", "requestServedFromCache"):
+            session.on(f"Network.{event}", getattr(self, "_on_" + re.sub(r"(?<!^)([A-Z])", r"_\1", event).lower()))
+
+    @classmethod
+    async def attach(cls, page):
+        session = await page.context.new_cdp_session(page)
+        recorder = cls(session, page)
+        await session.send("Network.enable")
+        return recorder
+
+    def _on_request_will_be_sent(self, event):
+        request_id = event["requestId"]
+        if event.get("redirectResponse") and request_id in self.entries:
+            # Same id continues after a redirect; close the hop as its own entry.
+            hop = self.entries.pop(request_id)
+            hop["end"], hop["status"] = event["timestamp"], event["redirectResponse"].get("status")
+        url = event["request"]["url"]
+        entry = {
+            "url": url, "method": event["request"]["method"], "type": event.get("type", "Other"),
+            "initiator": event.get("initiator", {}).get("type"), "parent": self._parent(event.get("initiator", {})),
+            "start": event["timestamp"], "sent": None, "response": None, "end": None, "status": None,
+            "transfer_bytes": 0, "decoded_bytes": 0, "from_cache": False, "failed": None,
+        }
+        self.entries[request_id] = entry
+        self._order.append(entry)
+        self._by_url.setdefault(url, entry)
+
+    def _parent(self, initiator):
+        url = initiator.get("url")
+        stack = initiator.get("stack")
+        while not url and stack:
+            frames = stack.get("callFrames") or []
+            url = next((f["url"] for f in frames if f.get("url")), None)
+            stack = stack.get("parent")
+        return self._by_url.get(url) if url else None
+
+    def _on_response_received(self, event):
+        entry = self.entries.get(event["requestId"])
+        if entry is None:
+            return
+        response = event["response"]
+        entry["status"] = response.get("status")
+        entry["from_cache"] = entry["from_cache"] or bool(
+            response.get("fromDiskCache") or response.get("fromServiceWorker") or response.get("fromPrefetchCache")
+        )
+        timing = response.get("timing")
+        if timing:
+            entry["sent"] = timing["requestTime"] + max(timing.get("sendStart", 0), 0) / 1000
+            entry["response"] = timing["requestTime"] + timing["receiveHeadersEnd"] / 1000
+
+    def _on_data_received(self, event):
+        entry = self.entries.get(event["requestId"])
+        if entry is not None:
+            entry["decoded_bytes"] += event.get("dataLength", 0)
+
+    def _on_loading_finished(self, event):
+        entry = self.entries.get(event["requestId"])
+        if entry is not None:
+            entry["end"] = event["timestamp"]
+            entry["transfer_bytes"] = event.get("encodedDataLength", 0)
+
+    def _on_loading_failed(self, event):
+        entry = self.entries.get(event["requestId"])
+        if entry is not None:
+            entry["end"] = event["timestamp"]
+            entry["failed"] = event.get("errorText") or "failed"
+
+    def _on_request_served_from_cache(self, event):
+        entry = self.entries.get(event["requestId"])
+        if entry is not None:
+            entry["from_cache"] = True
+
+    async def settle(self, quiet_ms, timeout_ms):
+        """Wait until no request has been in flight for ``quiet_ms``."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout_ms / 1000
+        quiet_since = loop.time()
+        while loop.time() < deadline:
+            if any(entry["end"] is None for entry in self._order):
+                quiet_since = loop.time()
+            elif loop.time() - quiet_since >= quiet_ms / 1000:
+                break
+            await asyncio.sleep(0.05)
+
+    def waterfall(self, manual_chunks):
+        """Requests in start order with times in ms from the document request."""
+        if not self._order:
+            return []
+        origin = self._order[0]["start"]
+        index = {id(entry): i for i, entry in enumerate(self._order)}
+        rows = []
+        for i, entry in enumerate(self._order):
+            parent = entry["parent"]
+            parent_index = index.get(id(parent)) if parent is not None else None
+            depth = rows[parent_index]["depth"] + 1 if parent_index is not None and parent_index < i else 1
+            rows.append({
+                "id": i, "url": entry["url"], "method": entry["method"], "type": entry["type"],
+                "chunk": chunk_for(entry["url"], manual_chunks), "initiator": entry["initiator"],
+                "parent": parent_index, "depth": depth, "status": entry["status"],
+                "start_ms": _ms(entry["start"], origin),
+                "ttfb_ms": _ms(entry["response"], origin),
+                "end_ms": _ms(entry["end"], origin),
+                "transfer_bytes": entry["transfer_bytes"], "decoded_bytes": entry["decoded_bytes"],
+                "from_cache": entry["from_cache"], "failed": entry["failed"],
+            })
+        return rows
+
+    async def render_ms(self):
+        """Render time in ms on the :meth:`waterfall` clock.
+
+        The page measures from its time origin, not from the first request, so the document's
+        ``requestStart`` (page clock) is lined up with its ``requestTime + sendStart`` (CDP clock).
+        """
+        try:
+            marks = await self.page.evaluate(_RENDER_SCRIPT)
+        except Exception:  # noqa: BLE001 - a page that never rendered has no render time
+            return None
+        render = marks.get("render") if marks else None
+        if render is None:
+            return None
+        document = next((e for e in self._order if e["type"] == "Document" and e["sent"] is not None), None)
+        if document is None or marks.get("requestStart") is None:
+            return render
+        return round(render - marks["requestStart"] + (document["sent"] - self._order[0]["start"]) * 1000, 1)
+
+    async def detach(self):
+        try:
+            await self.session.detach()
+        except Exception:  # noqa: BLE001 - the page may already be closing
+            pass
+
+
+def _ms(timestamp, origin):
+    return round((timestamp - origin) * 1000, 1) if timestamp is not None else None
+
+
+def critical_path(rows, render_ms):
+    """The deepest initiator chain of assets that finished before render."""
+    before = [
+        r for r in rows
+        if r["end_ms"] is not None and (render_ms is None or r["end_ms"] <= render_ms)
+        and (r["type"] in _ASSET_TYPES or r["type"] == "Document")
+    ]
+    if not before:
+        return []
+    last = max(before, key=lambda r: (r["depth"], r["end_ms"]))
+    chain = [last]
+    while chain[-1]["parent"] is not None:
+        chain.append(rows[chain[-1]["parent"]])
+    return chain[::-1]
+
+
+def summarize(rows, render_ms, budgets=None):
+    """Reduce a waterfall to the per-route report."""
+    network = [r for r in rows if not r["from_cache"] and not r["failed"]]
+    document = next((r for r in rows if r["type"] == "Document"), None)
+    html_end = document["end_ms"] if document and document["end_ms"] is not None else 0.0
+
+    by_chunk = {}
+    for row in rows:
+        if row["type"] not in _ASSET_TYPES:
+            continue
+        chunk = by_chunk.setdefault(row["chunk"] or "other", {"requests": 0, "transfer_bytes": 0, "decoded_bytes": 0})
+        chunk["requests"] += 1
+        chunk["transfer_bytes"] += row["transfer_bytes"]
+        chunk["decoded_bytes"] += row["decoded_bytes"]
+
+    fetched = {}
+    for row in network:
+        fetched.setdefault((row["method"], row["url"]), []).append(row)
+    duplicates = [
+        {"url": url, "count": len(group), "wasted_bytes": sum(r["transfer_bytes"] for r in group[1:])}
+        for (method, url), group in fetched.items()
+        if len(group) > 1 and method == "GET"
+    ]
+    chunk_urls = {}
+    for row in network:
+        if row["type"] in _ASSET_TYPES and row["chunk"] and not row["chunk"].startswith(("src:", "lazy:")):
+            chunk_urls.setdefault(row["chunk"], set()).add(urlsplit(row["url"]).path)
+    duplicate_chunks = {chunk: sorted(paths) for chunk, paths in chunk_urls.items() if len(paths) > 1}
+
+    chain = critical_path(rows, render_ms)
+    preloadable = [
+        {"chunk": r["chunk"], "url": r["url"], "late_by_ms": round(r["start_ms"] - html_end, 1)}
+        for r in chain
+        if r["type"] in _ASSET_TYPES and r["initiator"] == "script" and r["start_ms"] > html_end
+    ]
+
+    over_budget = []
+    for chunk, max_bytes in (budgets or {}).items():
+        sizes = [r["decoded_bytes"] for r in rows if r["chunk"] == chunk and r["type"] == "Script"]
+        if sizes and max(sizes) > max_bytes:
+            over_budget.append({"chunk": chunk, "decoded_bytes": max(sizes), "max_bytes": max_bytes})
+
+    return {
+        "requests": len(rows),
+        "network_requests": len(network),
+        "failed": sum(bool(r["failed"]) for r in rows),
+        "transfer_bytes": sum(r["transfer_bytes"] for r in rows),
+        "decoded_bytes": sum(r["decoded_bytes"] for r in rows),
+        "js_decoded_bytes": sum(r["decoded_bytes"] for r in rows if r["type"] == "Script"),
+        "css_decoded_bytes": sum(r["decoded_bytes"] for r in rows if r["type"] == "Stylesheet"),
+        "render_ms": round(render_ms, 1) if render_ms is not None else None,
+        "critical_path_depth": len(chain),
+        "critical_path": [r["chunk"] or urlsplit(r["url"]).path for r in chain],
+        "critical_path_ms": chain[-1]["end_ms"] if chain else None,
+        "preloadable": preloadable,
+        "preloadable_ms": max((p["late_by_ms"] for p in preloadable), default=0.0),
+        "duplicates": duplicates,
+        "duplicate_chunks": duplicate_chunks,
+        "by_chunk": dict(sorted(by_chunk.items(), key=lambda item: -item[1]["decoded_bytes"])),
+        "over_budget": over_budget,
+    }
+
+
+def write_waterfall(directory, target, rows, render_ms):
+    """Write ``rows`` to ``<directory>/<route-slug>.json`` and return the path."""
+    slug = re.sub(r"[^\w-]+", "_", urlsplit(target.url).path).strip("_") or "root"
+    host = urlsplit(target.url).port or urlsplit(target.url).hostname
+    path = Path(directory) / f"{host}_{slug}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps({"url": target.url, "render_ms": render_ms, "requests": rows}, indent=1, ensure_ascii=False),
+        encoding="utf-8",
+    )
+    return path
+
+
+class NetworkProbe:
+    """Page probe for :class:`~.engine.ProbeEngine` (``page_probes=[NetworkProbe()]``)."""
+
+    name = "network"
+
+    def __init__(self, manual_chunks=None, budgets=None, quiet_ms=500, keep_waterfall=False):
+        self.manual_chunks = load_manual_chunks() if manual_chunks is None else manual_chunks
+        self.budgets = budgets or {}
+        self.quiet_ms = quiet_ms
+        self.keep_waterfall = keep_waterfall
+
+    async def attach(self, page):
+        return await NetworkRecorder.attach(page)
+
+    async def finish(self, recorder, timeout_ms):
+        await recorder.settle(self.quiet_ms, timeout_ms)
+        render_ms = await recorder.render_ms()
+        await recorder.detach()
+        rows = recorder.waterfall(self.manual_chunks)
+        summary = summarize(rows, render_ms, self.budgets)
+        if self.keep_waterfall:
+            summary["waterfall"] = rows
+        return summary
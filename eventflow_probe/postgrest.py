@@ -0,0 +1,408 @@
+"""A small in-memory PostgREST interpreter for the offline stand-in.
+
+Covers what supabase-js sends for this app: column and embedded-resource
+``select`` lists, horizontal filters (``eq``, ``in``, ``is``, ``ilike``,
+``not.*``, ``or=(...)`` ...), ``order``/``limit``/``offset``/``Range``,
+``Prefer: count=...`` and ``return=representation``, single-object
+responses, and insert/upsert/update/delete. Relationships are inferred
+from ``<singular>_id`` column names instead of a schema cache, both for
+``table(...)`` and ``alias:fk_column(...)`` embeds. Filters on embedded
+columns (``schedules.event_id=eq.X``) narrow the embedded rows, and drop the
+parent under ``!inner``. Query syntax it does not understand, such as
+``order=embed.column`` or ``embed.order=...``, is answered with a 400 like
+PostgREST's parse errors instead of being ignored.
+"""
+
+import copy
+import json
+import operator
+import re
+import uuid
+from datetime import datetime, timezone
+from urllib.parse import parse_qsl
+
+OBJECT_MEDIA_TYPE = "application/vnd.pgrst.object+json"
+_RESERVED_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+_EMBED_RE = re.compile(
+    r"^(?:(?P<alias>\w+):)?(?P<name>\w+)(?:!(?P<hint>(?!(?:inner|left)$)\w+))?(?:!(?P<join>inner|left))?$"
+)
+_ORDER_MODIFIERS = {"asc", "desc", "nullsfirst", "nullslast"}
+_OPERATORS = {
+    "eq": operator.eq, "neq": operator.ne, "gt": operator.gt, "gte": operator.ge, "lt": operator.lt, "lte": operator.le,
+}
+
+
+class PostgrestError(Exception):
+    def __init__(self, status, code, message, details=None):
+        super().__init__(message)
+        self.status, self.code, self.message, self.details = status, code, message, details
+
+    def body(self):
+        return {"code": self.code, "message": self.message, "details": self.details, "hint": None}
+
+
+def _singular(name):
+    return name[:-1] if name.endswith("s") else name
+
+
+def _split_top_level(text, sep=","):
+    parts, depth, current = [], 0, []
+    for char in text:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        if char == sep and depth == 0:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    if current:
+        parts.append("".join(current))
+    return [p for p in parts if p]
+
+
+def parse_select(select):
+    """Parse a select list into ``[("column", alias, name) | ("embed", ...)]``."""
+    select = re.sub(r"\s+", "", select or "*")
+    items = []
+    for part in _split_top_level(select):
+        if "(" in part and part.endswith(")"):
+            head, inner = part[: part.index("(")], part[part.index("(") + 1 : -1]
+            match = _EMBED_RE.match(head)
+            if head == "count" and not inner:
+                items.append(("column", "count", "count"))
+            elif match:
+                items.append(
+                    ("embed", match.group("alias") or match.group("name"), match.group("name"),
+                     match.group("hint"), match.group("join") == "inner", parse_select(inner))
+                )
+        else:
+            alias, sep, column = part.split("::")[0].partition(":")
+            items.append(("column", alias, column if sep else alias))
+    return items
+
+
+def _is_count(items):
+    return items == [("column", "count", "count")]
+
+
+def _coerce(raw, sample):
+    if isinstance(sample, bool):
+        return raw == "true"
+    if isinstance(sample, (int, float)):
+        try:
+            return float(raw)
+        except ValueError:
+            return raw
+    return raw
+
+
+def _like(pattern, value, flags=0):
+    regex = "^" + re.escape(pattern).replace("\\*", ".*").replace("%", ".*").replace("_", ".") + "$"
+    return value is not None and re.match(regex, str(value), flags | re.DOTALL) is not None
+
+
+def _compare(op, value, raw):
+    if op == "is":
+        return {"null": value is None, "true": value is True, "false": value is False}.get(raw, False)
+    if op == "in":
+        options = [o.strip('"') for o in _split_top_level(raw.strip("()"))]
+        return value is not None and any(value == _coerce(o, value) or str(value) == o for o in options)
+    if op in ("like", "ilike"):
+        return _like(raw, value, re.IGNORECASE if op == "ilike" else 0)
+    if op in ("cs", "cd", "ov"):
+        wanted = set(json.loads(raw)) if raw.startswith("[") else set(_split_top_level(raw.strip("{}")))
+        have = set(value or [])
+        return {"cs": wanted <= have, "cd": have <= wanted, "ov": bool(wanted & have)}[op]
+    if op in ("fts", "plfts", "phfts", "wfts"):
+        return value is not None and raw.lower() in str(value).lower()
+    if value is None:
+        return False
+    compare = _OPERATORS.get(op)
+    if compare is None:
+        return True
+    try:
+        return compare(value, _coerce(raw, value))
+    except TypeError:
+        return True
+
+
+def _condition(column, expression):
+    """Return a predicate for ``column=op.value`` (``op`` may be ``not.op``)."""
+    if column in ("or", "and"):
+        children = [_logic_child(part) for part in _split_top_level(expression[1:-1])]
+        combine = any if column == "or" else all
+        return lambda row: combine(child(row) for child in children)
+    negate = expression.startswith("not.")
+    if negate:
+        expression = expression[4:]
+    op, _, raw = expression.partition(".")
+    compare = _OPERATORS.get(op)
+    if compare is not None:
+        # Same result as ``_compare`` without its per-row dispatch; filters run over every candidate row.
+        def predicate(row):
+            value = row.get(column)
+            if value is None:
+                return False
+            try:
+                return compare(value, raw if type(value) is str else _coerce(raw, value))
+            except TypeError:
+                return True
+    else:
+        def predicate(row):
+            return _compare(op, row.get(column), raw)
+    if negate:
+        return lambda row: not predicate(row)
+    return predicate
+
+
+def _logic_child(text):
+    if text.startswith(("or(", "and(")):
+        name, _, rest = text.partition("(")
+        return _condition(name, "(" + rest)
+    column, _, expression = text.partition(".")
+    return _condition(column, expression)
+
+
+def _order_key(spec):
+    column, *modifiers = spec.split(".")
+    if not set(modifiers) <= _ORDER_MODIFIERS:
+        raise PostgrestError(
+            400, "PGRST100", f'"failed to parse order ({spec})"',
+            'expecting "asc", "desc", "nullsfirst" or "nullslast"',
+        )
+    descending = "desc" in modifiers
+    nulls_first = "nullsfirst" in modifiers or ("nullslast" not in modifiers and descending)
+    return column, descending, nulls_first
+
+
+def _embed_filters(params, items):
+    """Group ``embed.column=op.value`` filters into ``{embed path: [predicate, ...]}``.
+
+    Only filters are supported on embeds; an unknown embed or an embedded
+    ``order``/``limit``/``offset`` raises a 400 rather than being skipped.
+    """
+    filters = {}
+    for key, expression in params:
+        if "." not in key:
+            continue
+        *path, column = key.split(".")
+        scope = items
+        for alias in path:
+            embed = next((item for item in scope if item[0] == "embed" and item[1] == alias), None)
+            if embed is None:
+                raise PostgrestError(
+                    400, "PGRST108", f"'{alias}' is not an embedded resource in this request",
+                    f"Verify that '{alias}' is included in the 'select' query parameter.",
+                )
+            scope = embed[5]
+        if column in _RESERVED_PARAMS:
+            raise PostgrestError(
+                400, "PGRST100", f"offline stand-in: '{key}' is not supported", "Only filters apply to embeds here."
+            )
+        filters.setdefault(tuple(path), []).append(_condition(column, expression))
+    return filters
+
+
+class PostgrestStore:
+    """Answers PostgREST requests against ``tables`` (``{name: [row dicts]}``).
+
+    ``column_defaults`` (``{table: {column: value}}``) fills columns an insert leaves out.
+    """
+
+    def __init__(self, tables, max_rows=1000, column_defaults=None):
+        self.tables = tables
+        self.max_rows = max_rows
+        self.column_defaults = column_defaults or {}
+        self._indexes = {}
+
+    # ── reads ──────────────────────────────────────────────────────────────
+
+    def _rows_by(self, table, column, value):
+        index = self._indexes.get((table, column))
+        if index is None:
+            index = {}
+            for row in self.tables.get(table, ()):
+                index.setdefault(row.get(column), {})[id(row)] = row
+            self._indexes[(table, column)] = index
+        return list(index.get(value, {}).values())
+
+    def _table_indexes(self, table, columns=None):
+        return [
+            (column, index) for (name, column), index in self._indexes.items()
+            if name == table and (columns is None or column in columns)
+        ]
+
+    def _index_add(self, table, rows, columns=None):
+        """Add ``rows`` to the built indexes of ``table`` (only those on ``columns``, if given)."""
+        for column, index in self._table_indexes(table, columns):
+            for row in rows:
+                index.setdefault(row.get(column), {})[id(row)] = row
+
+    def _index_remove(self, table, rows, columns=None):
+        for column, index in self._table_indexes(table, columns):
+            for row in rows:
+                bucket = index.get(row.get(column))
+                if bucket is not None:
+                    bucket.pop(id(row), None)
+                    if not bucket:
+                        del index[row.get(column)]
+
+    def _embed(self, table, row, name, hint):
+        fk = hint if hint and hint in row else _singular(name) + "_id"
+        if fk in row:
+            matches = self._rows_by(name, "id", row[fk])
+            return matches[0] if matches else None, False
+        return self._rows_by(name, _singular(table) + "_id", row.get("id")), True
+
+    def _shape(self, table, row, items, embed_filters=None, path=()):
+        """Project ``row`` onto ``items``; ``None`` drops it (an ``!inner`` embed came back empty).
+
+        ``embed_filters`` maps an embed path such as ``("schedules",)`` to predicates on its rows.
+        """
+        embed_filters = embed_filters or {}
+        shaped = {}
+        for item in items:
+            kind = item[0]
+            if kind == "column":
+                _, alias, column = item
+                if column == "*":
+                    shaped.update(row)
+                else:
+                    shaped[alias] = row.get(column)
+            elif kind == "embed":
+                _, alias, name, hint, inner, sub_items = item
+                if name.endswith("_id") and name in row:
+                    # ``alias:fk_column(...)`` embeds through the column: ``events:event_id(name)``.
+                    name, hint = name[:-3] + "s", name
+                related, many = self._embed(table, row, name, hint)
+                sub_path = (*path, alias)
+                predicates = embed_filters.get(sub_path, ())
+                if many:
+                    related = [r for r in related if all(p(r) for p in predicates)]
+                    if _is_count(sub_items):
+                        shaped[alias] = [{"count": len(related)}]
+                    else:
+                        shaped[alias] = [
+                            nested for nested in (self._shape(name, r, sub_items, embed_filters, sub_path)
+                                                  for r in related)
+                            if nested is not None
+                        ]
+                    if inner and not related:
+                        return None
+                else:
+                    if related is not None and not all(p(related) for p in predicates):
+                        related = None
+                    shaped[alias] = self._shape(name, related, sub_items, embed_filters, sub_path) if related else None
+                    if inner and related is None:
+                        return None
+        return shaped
+
+    def _filtered(self, table, params):
+        filters = [(c, e) for c, e in params if c not in _RESERVED_PARAMS and "." not in c]
+        # Use the id index for the common ``.eq('event_id', ...)`` shape; its rows need no further check.
+        keyed = next(((c, e) for c, e in filters if e.startswith("eq.") and (c == "id" or c.endswith("_id"))), None)
+        predicates = [
+            _condition(column, expression) for column, expression in filters if (column, expression) != keyed
+        ]
+        candidates = self._rows_by(table, keyed[0], keyed[1][3:]) if keyed else self.tables.get(table, [])
+        return [row for row in candidates if all(p(row) for p in predicates)]
+
+    def select(self, table, query, headers, head=False):
+        params = parse_qsl(query, keep_blank_values=True)
+        named = dict(params)
+        rows = self._filtered(table, params)
+        for spec in reversed(_split_top_level(named.get("order", ""))):
+            column, descending, nulls_first = _order_key(spec)
+            present = [r for r in rows if r.get(column) is not None]
+            missing = [r for r in rows if r.get(column) is None]
+            present.sort(key=lambda r: r[column], reverse=descending)
+            rows = missing + present if nulls_first else present + missing
+        total = len(rows)
+        offset, limit = int(named.get("offset", 0)), named.get("limit")
+        range_header = headers.get("range")
+        if range_header and "-" in range_header:
+            start, _, end = range_header.partition("-")
+            offset, limit = int(start), (int(end) - int(start) + 1 if end else None)
+        limit = min(int(limit), self.max_rows) if limit is not None else self.max_rows
+        page = rows[offset : offset + limit]
+        items = parse_select(named.get("select"))
+        embed_filters = _embed_filters(params, items)
+        body = [shaped for shaped in (self._shape(table, r, items, embed_filters) for r in page) if shaped is not None]
+        if _is_count(items):
+            body = [{"count": total}]
+        content_range = f"{offset}-{offset + len(body) - 1}" if body else "*"
+        prefer = headers.get("prefer", "")
+        content_range += f"/{total}" if "count=" in prefer else "/*"
+        return self._respond(200, None if head else body, headers, {"content-range": content_range})
+
+    # ── writes ─────────────────────────────────────────────────────────────
+
+    def insert(self, table, query, headers, payload):
+        params = dict(parse_qsl(query, keep_blank_values=True))
+        records = payload if isinstance(payload, list) else [payload]
+        prefer = headers.get("prefer", "")
+        conflict = params.get("on_conflict", "id").split(",")
+        upsert = "resolution=merge-duplicates" in prefer or "resolution=ignore-duplicates" in prefer
+        stored, now = [], datetime.now(timezone.utc).isoformat()
+        rows = self.tables.setdefault(table, [])
+        for record in records:
+            existing = None
+            if upsert and all(record.get(c) is not None for c in conflict):
+                existing = next(
+                    (r for r in self._rows_by(table, conflict[0], record[conflict[0]])
+                     if all(r.get(c) == record[c] for c in conflict)),
+                    None,
+                )
+            if existing is not None:
+                if "resolution=merge-duplicates" in prefer:
+                    changed = set(record) | {"updated_at"}
+                    self._index_remove(table, [existing], changed)
+                    existing.update(record, updated_at=now)
+                    self._index_add(table, [existing], changed)
+                stored.append(existing)
+                continue
+            row = {"id": str(uuid.uuid4()), "created_at": now, "updated_at": now, **record}
+            for column, value in self.column_defaults.get(table, {}).items():
+                if column not in row:
+                    row[column] = copy.deepcopy(value)
+            rows.append(row)
+            self._index_add(table, [row])
+            stored.append(row)
+        return self._write_response(201, table, stored, params, headers)
+
+    def update(self, table, query, headers, payload):
+        params = parse_qsl(query, keep_blank_values=True)
+        rows = self._filtered(table, params)
+        now = datetime.now(timezone.utc).isoformat()
+        changed = set(payload) | {"updated_at"}
+        self._index_remove(table, rows, changed)
+        for row in rows:
+            row.update(payload, updated_at=payload.get("updated_at", now))
+        self._index_add(table, rows, changed)
+        return self._write_response(200, table, rows, dict(params), headers)
+
+    def delete(self, table, query, headers):
+        params = parse_qsl(query, keep_blank_values=True)
+        doomed = {id(row) for row in self._filtered(table, params)}
+        removed = [row for row in self.tables.get(table, []) if id(row) in doomed]
+        self.tables[table] = [row for row in self.tables.get(table, []) if id(row) not in doomed]
+        self._index_remove(table, removed)
+        return self._write_response(200, table, removed, dict(params), headers)
+
+    def _write_response(self, status, table, rows, params, headers):
+        if "return=representation" not in headers.get("prefer", ""):
+            return 201 if status == 201 else 204, None, {}
+        items = parse_select(params.get("select"))
+        return self._respond(status, [self._shape(table, r, items) for r in rows], headers, {})
+
+    def _respond(self, status, body, headers, extra):
+        if body is not None and OBJECT_MEDIA_TYPE in headers.get("accept", ""):
+            if len(body) != 1:
+                raise PostgrestError(
+                    406, "PGRST116", "JSON object requested, multiple (or no) rows returned",
+                    f"The result contains {len(body)} rows",
+                )
+            body = body[0]
+        return status, body, extra
@@ -0,0 +1,219 @@
+"""Per-page Supabase query accounting and N+1 detection.
+
+A :class:`QueryProbe` records every PostgREST, RPC, Edge Function and auth
+request a page makes. It works against the offline stand-in or a live
+backend. Each request is reduced to a *shape*: the method, the table, the
+select list and the filter operators, with the literal filter values
+removed. When the same shape repeats with different literals, that is the
+classic N+1 signature: one ``.eq('event_id', id)`` query per row.
+"""
+
+import asyncio
+import math
+import re
+import time
+from urllib.parse import parse_qsl, urlsplit
+
+from . import stats
+from .standin import SERVICE_TIME_HEADER
+
+_RESERVED = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+_LOGIC_LITERAL_RE = re.compile(r"(\.(?:eq|neq|gt|gte|lt|lte|like|ilike|is|in|cs|cd))\.(?:\([^)]*\)|[^,()]+)")
+_KINDS = (("/rest/v1/rpc/", "rpc"), ("/rest/v1/", "table"), ("/functions/v1/", "function"), ("/auth/v1/", "auth"))
+
+
+def classify(url):
+    """Return ``(kind, name)`` for a Supabase URL, or ``None`` for other traffic."""
+    path = urlsplit(url).path
+    for marker, kind in _KINDS:
+        if marker in path:
+            return kind, path.split(marker, 1)[1].strip("/").split("/")[0] or "-"
+    return None
+
+
+def query_shape(method, url):
+    """Return ``(shape, literals)``; ``shape`` has filter values replaced by ``?``."""
+    parts = urlsplit(url)
+    kind, name = classify(url) or ("other", parts.path)
+    clauses, literals = [], []
+    for key, value in sorted(parse_qsl(parts.query, keep_blank_values=True)):
+        if key == "select":
+            clauses.append("select=" + re.sub(r"\s+", "", value))
+        elif key in _RESERVED:
+            clauses.append(f"{key}={value}" if key == "order" else key)
+        elif key in ("or", "and"):
+            clauses.append(f"{key}=" + _LOGIC_LITERAL_RE.sub(r"\1.?", value))
+            literals.append(value)
+        else:
+            negate = value.startswith("not.")
+            op, _, literal = (value[4:] if negate else value).partition(".")
+            op = "not." + op if negate else op
+            if literal.startswith("("):
+                count = len(literal.strip("()").split(",")) if literal.strip("()") else 0
+                clauses.append(f"{key}={op}.(?)")
+                literals.append(f"{count}:{literal}")
+            else:
+                clauses.append(f"{key}={op}.?")
+                literals.append(literal)
+    shape = f"{method} {kind}:{name}" + ("?" + "&".join(clauses) if clauses else "")
+    return shape, tuple(literals)
+
+
+class QueryRecorder:
+    """Collects Supabase requests for one page."""
+
+    def __init__(self, page):
+        self._origin = time.perf_counter()
+        self._pending = {}
+        self._pending_sizes = set()
+        self.records = []
+        page.on("request", self._on_request)
+        page.on("requestfinished", self._on_finished)
+        page.on("requestfailed", self._on_failed)
+
+    def _now(self):
+        return (time.perf_counter() - self._origin) * 1000
+
+    def _on_request(self, request):
+        kind = classify(request.url)
+        if kind is None or request.method == "OPTIONS":
+            return
+        shape, literals = query_shape(request.method, request.url)
+        self._pending[request] = {
+            "kind": kind[0], "name": kind[1], "method": request.method, "shape": shape,
+            "literals": literals, "start_ms": self._now(), "end_ms": None, "bytes": 0, "standin_ms": None,
+            "failed": False,
+        }
+
+    def _on_finished(self, request):
+        record = self._pending.pop(request, None)
+        if record is None:
+            return
+        record["end_ms"] = self._now()
+        self.records.append(record)
+        task = asyncio.ensure_future(self._measure(request, record))
+        self._pending_sizes.add(task)
+        task.add_done_callback(self._pending_sizes.discard)
+
+    def _on_failed(self, request):
+        record = self._pending.pop(request, None)
+        if record is not None:
+            record["end_ms"], record["failed"] = self._now(), True
+            self.records.append(record)
+
+    async def _measure(self, request, record):
+        try:
+            sizes = await request.sizes()
+            response = await request.response()
+        except Exception:  # noqa: BLE001 - sizes are best-effort once the page moves on
+            return
+        record["bytes"] = sizes.get("responseBodySize", 0) + sizes.get("responseHeadersSize", 0)
+        service_ms = response.headers.get(SERVICE_TIME_HEADER) if response else None
+        record["standin_ms"] = float(service_ms) if service_ms else None
+
+    async def settle(self, quiet_ms, timeout_ms):
+        """Wait until no Supabase request has been in flight for ``quiet_ms``."""
+        deadline = self._now() + timeout_ms
+        while self._now() < deadline:
+            last = max([r["end_ms"] for r in self.records] or [0])
+            if not self._pending and self._now() - last >= quiet_ms:
+                break
+            await asyncio.sleep(0.05)
+        if self._pending_sizes:
+            await asyncio.gather(*self._pending_sizes, return_exceptions=True)
+
+    def summary(self, repeat_threshold=3):
+        return summarize(self.records, repeat_threshold)
+
+
+def _busy_ms(records):
+    """Wall time with at least one request in flight."""
+    total, current_start, current_end = 0.0, None, None
+    for record in sorted(records, key=lambda r: r["start_ms"]):
+        if current_end is None or record["start_ms"] > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = record["start_ms"], record["end_ms"]
+        else:
+            current_end = max(current_end, record["end_ms"])
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+def _waterfall_depth(records):
+    """Longest chain of requests where each starts after the previous ended."""
+    ordered = sorted(records, key=lambda r: r["end_ms"])
+    depth = []
+    for i, record in enumerate(ordered):
+        before = [depth[j] for j in range(i) if ordered[j]["end_ms"] <= record["start_ms"]]
+        depth.append(1 + max(before, default=0))
+    return max(depth, default=0)
+
+
+def summarize(records, repeat_threshold=3):
+    """Reduce raw records to the per-page report."""
+    by_table, shapes = {}, {}
+    for record in records:
+        key = f"{record['kind']}:{record['name']}"
+        by_table[key] = by_table.get(key, 0) + 1
+        shapes.setdefault(record["shape"], []).append(record)
+    repeated = [
+        {"shape": shape, "count": len(group), "distinct_values": len({r["literals"] for r in group})}
+        for shape, group in shapes.items()
+        if len(group) >= repeat_threshold and len({r["literals"] for r in group}) > 1
+    ]
+    repeated.sort(key=lambda r: -r["count"])
+    queries = [r for r in records if r["kind"] != "auth"]
+    durations = [r["end_ms"] - r["start_ms"] for r in queries]
+    return {
+        "round_trips": len(queries),
+        "auth_requests": len(records) - len(queries),
+        "failed": sum(r["failed"] for r in records),
+        "bytes": sum(r["bytes"] for r in queries),
+        "busy_ms": round(_busy_ms(queries), 1),
+        # Offline only: time the stand-in spent answering, included in busy_ms and the query timings.
+        "standin_ms": (
+            round(sum(r["standin_ms"] for r in queries if r.get("standin_ms") is not None), 1)
+            if any(r.get("standin_ms") is not None for r in queries) else None
+        ),
+        "waterfall_depth": _waterfall_depth(queries),
+        "p50_query_ms": round(stats.percentile(durations, 50), 1) if durations else None,
+        "by_table": dict(sorted(by_table.items(), key=lambda item: -item[1])),
+        "distinct_shapes": len(shapes),
+        "repeated_shapes": repeated,
+    }
+
+
+class QueryProbe:
+    """Page probe for :class:`~.engine.ProbeEngine` (``page_probes=[QueryProbe()]``)."""
+
+    name = "queries"
+
+    def __init__(self, quiet_ms=750, repeat_threshold=3):
+        self.quiet_ms = quiet_ms
+        self.repeat_threshold = repeat_threshold
+
+    def attach(self, page):
+        return QueryRecorder(page)
+
+    async def finish(self, recorder, timeout_ms):
+        await recorder.settle(self.quiet_ms, timeout_ms)
+        return recorder.summary(self.repeat_threshold)
+
+
+def growth(counts_by_scale, tolerance=0, scales=None):
+    """Compare round trips at the smallest and largest fixture scale.
+
+    ``counts_by_scale`` maps ``scale -> round_trips``. Returns the increase,
+    or 0 when it is within ``tolerance``. A page that failed to load at some
+    scale (a ``None`` count, or a scale from ``scales`` with no entry) is
+    the worst kind of growth and returns ``math.inf``.
+    """
+    if any(counts_by_scale.get(scale) is None for scale in (scales or counts_by_scale)):
+        return math.inf
+    scales = sorted(counts_by_scale)
+    if len(scales) < 2:
+        return 0
+    increase = counts_by_scale[scales[-1]] - counts_by_scale[scales[0]]
+    return increase if increase > tolerance else 0
@@ -0,0 +1,33 @@
+"""Output formatting for probe results."""
+
+import json
+import sys
+
+
+def print_json(record, stream=sys.stdout):
+    """Write one record as a JSON line."""
+    stream.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+    stream.flush()
+
+
+def print_table(rows, columns, stream=sys.stdout):
+    """Write ``rows`` (dicts) as a fixed-width text table."""
+    widths = {col: len(col) for col in columns}
+    cells = []
+    for row in rows:
+        line = {col: _format(row.get(col)) for col in columns}
+        for col, text in line.items():
+            widths[col] = max(widths[col], len(text))
+        cells.append(line)
+    stream.write("  ".join(col.ljust(widths[col]) for col in columns).rstrip() + "\n")
+    for line in cells:
+        stream.write("  ".join(line[col].ljust(widths[col]) for col in columns).rstrip() + "\n")
+    stream.flush()
+
+
+def _format(value):
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.1f}"
+    return str(value)
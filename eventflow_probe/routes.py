@@ -0,0 +1,59 @@
+"""Route discovery from ``eventflow-app/src/App.tsx``."""
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+from .engine import Target
+
+APP_TSX = Path(__file__).resolve().parent.parent / "eventflow-app" / "src" / "App.tsx"
+
+_ROUTE_RE = re.compile(r'<Route\s+path="(?P<path>[^"]+)"\s+element=\{\s*(?P<navigate><Navigate)?')
+_PARAM_RE = re.compile(r":(\w+)")
+
+
+@dataclass(frozen=True)
+class RouteSpec:
+    path: str
+    redirect: bool = False
+
+    @property
+    def params(self):
+        return tuple(_PARAM_RE.findall(self.path))
+
+    def resolve(self, params):
+        """Substitute ``:name`` segments; returns None if any are missing."""
+        if any(name not in params for name in self.params):
+            return None
+        return _PARAM_RE.sub(lambda m: params[m.group(1)], self.path)
+
+
+def load_routes(app_tsx=APP_TSX):
+    """Return every ``<Route path=...>`` declared in App.tsx, in source order."""
+    source = Path(app_tsx).read_text(encoding="utf-8")
+    seen = {}
+    for match in _ROUTE_RE.finditer(source):
+        path = match.group("path")
+        if path not in seen:
+            seen[path] = RouteSpec(path, redirect=bool(match.group("navigate")))
+    return list(seen.values())
+
+
+def build_targets(base_urls, routes, params=None, include_redirects=False):
+    """Cross base URLs with resolvable routes.
+
+    Returns ``(targets, skipped)`` where ``skipped`` lists route paths that
+    were dropped because a ``:param`` had no value.
+    """
+    params = params or {}
+    paths, skipped = [], []
+    for route in routes:
+        if route.redirect and not include_redirects:
+            continue
+        resolved = route.resolve(params)
+        if resolved is None:
+            skipped.append(route.path)
+        else:
+            paths.append(resolved)
+    targets = [Target(base.rstrip("/"), path) for base in base_urls for path in paths]
+    return targets, skipped
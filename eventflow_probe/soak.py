@@ -0,0 +1,235 @@
+"""Soak mode: one long-lived tab cycling through routes, watching for leaks.
+
+Organizers keep one tab open all day, so the soak never reloads. After the
+first ``goto`` it moves between routes the way the app does, with
+``history.pushState`` and a ``popstate`` event that ``BrowserRouter``
+picks up. After each visit it forces a GC over CDP and samples
+``Performance.getMetrics``: ``JSHeapUsedSize`` (the same counter as
+``performance.memory``, without its 100 KB quantization), ``Nodes``,
+``JSEventListeners`` and ``Documents``. It counts detached DOM nodes with
+``DOM.getDetachedDomNodes`` when the browser supports it.
+
+The counters cover the whole tab, so a route's growth is measured per visit:
+its sample minus the sample taken just before it (the previous route, or
+the last route of the previous cycle). Per route, the leak rate is the
+median of those deltas after the warm-up cycles, so a leak on one page is
+charged to that page only. A heap snapshot is written after
+warm-up and again whenever the heap has grown by ``snapshot_growth_mb``
+since the last one, so consecutive files can be diffed in DevTools'
+Comparison view.
+
+A visit that fails (navigation, render wait or metrics) becomes a sample
+with ``error`` set, and the run continues with the next route.
+"""
+
+import asyncio
+import itertools
+import statistics
+import time
+from pathlib import Path
+
+from playwright.async_api import Error as PlaywrightError
+
+from .metrics import DEFAULT_PENDING_SELECTOR
+
+DEFAULT_ROUTES = ("/event/dashboard", "/event/guests", "/event/checkin", "/ai")
+DEFAULT_CYCLES = 30
+
+_NAVIGATE_SCRIPT = """
+path => {
+  history.pushState({}, '', path);
+  dispatchEvent(new PopStateEvent('popstate', { state: {} }));
+}
+"""
+
+_RENDERED_SCRIPT = """
+([path, pending]) => {
+  const root = document.getElementById('root');
+  return location.pathname === path && root && !document.querySelector(pending)
+    && root.innerText.trim().length > 0;
+}
+"""
+
+COUNTERS = ("heap_used_bytes", "dom_nodes", "listeners", "detached_nodes", "documents")
+
+
+class SoakRun:
+    def __init__(self, page, base_url, routes=DEFAULT_ROUTES, dwell_ms=2000, timeout_ms=15000,
+                 pending_selector=DEFAULT_PENDING_SELECTOR, snapshot_dir=None, snapshot_growth_mb=20.0,
+                 max_snapshots=3, warmup_cycles=2):
+        self.page = page
+        self.base_url = base_url.rstrip("/")
+        self.routes = list(routes)
+        self.dwell_ms = dwell_ms
+        self.timeout_ms = timeout_ms
+        self.pending_selector = pending_selector
+        self.snapshot_dir = Path(snapshot_dir) if snapshot_dir else None
+        self.snapshot_growth_bytes = snapshot_growth_mb * 1024 * 1024
+        self.max_snapshots = max_snapshots
+        self.warmup_cycles = warmup_cycles
+        self.samples = []
+        self.snapshots = []
+        self._session = None
+        self._detached_supported = True
+        self._snapshot_floor = None
+        self._start = None
+
+    async def _open(self):
+        self._session = await self.page.context.new_cdp_session(self.page)
+        await self._session.send("Performance.enable")
+        await self._session.send("HeapProfiler.enable")
+        await self.page.goto(self.base_url + self.routes[0], timeout=self.timeout_ms)
+
+    async def _visit(self, path, first):
+        error = None
+        try:
+            if not first:
+                await self.page.evaluate(_NAVIGATE_SCRIPT, path)
+            await self.page.wait_for_function(
+                _RENDERED_SCRIPT, arg=[path, self.pending_selector], timeout=self.timeout_ms
+            )
+        except PlaywrightError as e:
+            error = str(e).splitlines()[0]
+        await asyncio.sleep(self.dwell_ms / 1000)
+        return error
+
+    async def _counters(self):
+        await self._session.send("HeapProfiler.collectGarbage")
+        raw = {m["name"]: m["value"] for m in (await self._session.send("Performance.getMetrics"))["metrics"]}
+        detached = None
+        if self._detached_supported:
+            try:
+                detached = len((await self._session.send("DOM.getDetachedDomNodes"))["detachedNodes"])
+            except PlaywrightError:
+                self._detached_supported = False
+        return {
+            "heap_used_bytes": int(raw.get("JSHeapUsedSize", 0)),
+            "heap_total_bytes": int(raw.get("JSHeapTotalSize", 0)),
+            "dom_nodes": int(raw.get("Nodes", 0)),
+            "listeners": int(raw.get("JSEventListeners", 0)),
+            "documents": int(raw.get("Documents", 0)),
+            "detached_nodes": detached,
+        }
+
+    async def _snapshot(self, cycle, route):
+        chunks = []
+
+        def on_chunk(event):
+            chunks.append(event["chunk"])
+
+        self._session.on("HeapProfiler.addHeapSnapshotChunk", on_chunk)
+        try:
+            await self._session.send("HeapProfiler.takeHeapSnapshot", {"reportProgress": False})
+        finally:
+            self._session.remove_listener("HeapProfiler.addHeapSnapshotChunk", on_chunk)
+        slug = route.strip("/").replace("/", "_") or "root"
+        path = self.snapshot_dir / f"cycle{cycle:04d}-{slug}.heapsnapshot"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("".join(chunks), encoding="utf-8")
+        self.snapshots.append(path)
+        return path
+
+    async def _sample(self, cycle, index, route):
+        """One visit and its counters; a Playwright error is kept in ``error`` with the counters left None."""
+        error = await self._visit(route, first=cycle == 0 and index == 0)
+        try:
+            counters = await self._counters()
+        except PlaywrightError as e:
+            counters = dict.fromkeys((*COUNTERS, "heap_total_bytes"))
+            error = error or "metrics: " + str(e).splitlines()[0]
+        sample = {
+            "cycle": cycle, "route": route, "t_s": round(time.perf_counter() - self._start, 1),
+            "error": error, **counters,
+        }
+        try:
+            await self._maybe_snapshot(sample)
+        except PlaywrightError as e:
+            sample["error"] = error or "snapshot: " + str(e).splitlines()[0]
+        return sample
+
+    async def run(self, cycles=None, duration_s=None, on_sample=None):
+        """Visit the routes ``cycles`` times, or until ``duration_s`` when ``cycles`` is None.
+
+        A failed visit is recorded as a sample with ``error`` set and the run goes on. It stops early
+        only when the tab is gone: the page closed, or a whole cycle's worth of visits failed in a row.
+        """
+        if cycles is None and duration_s is None:
+            cycles = DEFAULT_CYCLES
+        await self._open()
+        self._start = time.perf_counter()
+        failures = 0
+        try:
+            for cycle in range(cycles) if cycles is not None else itertools.count():
+                for index, route in enumerate(self.routes):
+                    sample = await self._sample(cycle, index, route)
+                    self.samples.append(sample)
+                    if on_sample:
+                        on_sample(sample)
+                    failures = failures + 1 if sample["error"] else 0
+                    if self.page.is_closed() or failures >= len(self.routes):
+                        return self.samples
+                if duration_s is not None and time.perf_counter() - self._start >= duration_s:
+                    break
+        finally:
+            try:
+                await self._session.detach()
+            except PlaywrightError:
+                pass  # the page may already be gone
+        return self.samples
+
+    async def _maybe_snapshot(self, sample):
+        """Snapshot once after warm-up, then at every ``snapshot_growth_mb`` of growth."""
+        if self.snapshot_dir is None or sample["cycle"] < self.warmup_cycles:
+            return
+        heap = sample["heap_used_bytes"]
+        if heap is None or len(self.snapshots) >= self.max_snapshots:
+            return
+        if self._snapshot_floor is not None and heap - self._snapshot_floor < self.snapshot_growth_bytes:
+            return
+        self._snapshot_floor = heap
+        sample["snapshot"] = str(await self._snapshot(sample["cycle"], sample["route"]))
+
+
+def visit_deltas(samples):
+    """Pair each sample with its counters minus those of the sample taken just before it."""
+    deltas = []
+    for previous, sample in zip(samples, samples[1:]):
+        deltas.append((sample, {
+            counter: sample[counter] - previous[counter]
+            if sample[counter] is not None and previous[counter] is not None else None
+            for counter in COUNTERS
+        }))
+    return deltas
+
+
+def leak_report(samples, warmup_cycles=2, leak_kb=100.0, leak_nodes=25.0):
+    """Per-route growth per visit (median after warm-up) of every counter, and per hour for the heap."""
+    cycle_s = None
+    by_cycle = {}
+    for sample in samples:
+        by_cycle.setdefault(sample["cycle"], []).append(sample["t_s"])
+    if len(by_cycle) > 1:
+        cycle_s = (max(by_cycle[max(by_cycle)]) - max(by_cycle[min(by_cycle)])) / (len(by_cycle) - 1)
+
+    deltas = [(s, d) for s, d in visit_deltas(samples) if s["cycle"] >= warmup_cycles]
+    rows = []
+    for route in dict.fromkeys(s["route"] for s in samples):
+        steady = [s for s in samples if s["route"] == route and s["cycle"] >= warmup_cycles]
+        growth = [d for s, d in deltas if s["route"] == route]
+        row = {"route": route, "samples": len(steady), "errors": sum(bool(s["error"]) for s in steady)}
+        heaps = [s["heap_used_bytes"] for s in steady if s["heap_used_bytes"] is not None]
+        for counter in COUNTERS:
+            values = [d[counter] for d in growth if d[counter] is not None]
+            row[f"{counter}_per_cycle"] = round(statistics.median(values), 1) if values else None
+        heap_slope = row["heap_used_bytes_per_cycle"]
+        row["heap_start_mb"] = round(heaps[0] / 2**20, 1) if heaps else None
+        row["heap_end_mb"] = round(heaps[-1] / 2**20, 1) if heaps else None
+        row["heap_mb_per_hour"] = (
+            round(heap_slope * 3600 / cycle_s / 2**20, 1) if heap_slope is not None and cycle_s else None
+        )
+        row["leak"] = bool(
+            (heap_slope is not None and heap_slope > leak_kb * 1024)
+            or (row["dom_nodes_per_cycle"] is not None and row["dom_nodes_per_cycle"] > leak_nodes)
+        )
+        rows.append(row)
+    return rows
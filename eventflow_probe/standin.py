@@ -0,0 +1,227 @@
+"""Offline Supabase stand-in installed through Playwright request routing.
+
+Every request the browser sends to ``supabase_url`` is answered in-process:
+PostgREST (``/rest/v1``) and RPC calls from a :class:`~.postgrest.PostgrestStore`
+over a fixture :class:`~.fixtures.Dataset`, GoTrue (``/auth/v1``) with one
+pre-signed-in organizer, and Realtime with a silent Phoenix socket. Requests
+to any other non-local host are aborted, so runs are network-free and
+deterministic. The dev server just needs *some* ``VITE_SUPABASE_URL``;
+nothing has to listen there.
+
+Requests are interpreted on one worker thread, so a slow filter over a
+100k-row table does not block the event loop that drives the browsers and
+takes the timings. Each request's service time is kept in ``service_ms``
+and returned in an ``x-standin-service-ms`` response header, so it can be
+reported or subtracted from client-side timings.
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import random
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from . import stats
+from .postgrest import PostgrestError, PostgrestStore
+
+DEFAULT_SUPABASE_URL = "http://127.0.0.1:54321"
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1", "[::1]", "0.0.0.0"}
+SERVICE_TIME_HEADER = "x-standin-service-ms"
+
+log = logging.getLogger(__name__)
+
+
+def _b64url(data):
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+
+
+class SupabaseStandIn:
+    def __init__(self, dataset, supabase_url=DEFAULT_SUPABASE_URL, latency_ms=0.0, jitter_ms=0.0, seed=0,
+                 max_rows=1000, block_external=True, allow_hosts=()):
+        self.dataset = dataset
+        self.store = PostgrestStore(dataset.tables, max_rows=max_rows, column_defaults=dataset.column_defaults)
+        self.origin = "{0.scheme}://{0.netloc}".format(urlsplit(supabase_url))
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.block_external = block_external
+        self.allow_hosts = LOCAL_HOSTS | set(allow_hosts)
+        self.rpc_handlers = {}
+        self.request_counts = Counter()
+        self.service_ms = []
+        # One worker: the store is not thread-safe, and requests stay in arrival order.
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="standin")
+        self._rng = random.Random(seed)
+        self.session = self._make_session()
+
+    @property
+    def storage_key(self):
+        # supabase-js: sb-<first label of the project hostname>-auth-token
+        return f"sb-{urlsplit(self.origin).hostname.split('.')[0]}-auth-token"
+
+    def _make_session(self):
+        profile = self.dataset.tables["user_profiles"][0]
+        expires_at = int(time.time()) + 365 * 24 * 3600
+        user = {
+            "id": self.dataset.user_id, "aud": "authenticated", "role": "authenticated",
+            "email": profile.get("email"), "app_metadata": {"provider": "email"},
+            "user_metadata": {"full_name": profile.get("full_name")},
+            "created_at": profile.get("created_at"),
+        }
+        claims = {"sub": user["id"], "aud": "authenticated", "role": "authenticated", "email": user["email"],
+                  "exp": expires_at}
+        return {
+            "access_token": f"{_b64url({'alg': 'HS256', 'typ': 'JWT'})}.{_b64url(claims)}.offline",
+            "token_type": "bearer", "expires_in": expires_at - int(time.time()), "expires_at": expires_at,
+            "refresh_token": "offline-refresh-token", "user": user,
+        }
+
+    def init_script(self, selected_event_id=None):
+        """Seed the signed-in session (and selected event) before app code runs."""
+        entries = {self.storage_key: json.dumps(self.session)}
+        if selected_event_id:
+            entries["selectedEventId"] = selected_event_id
+        return (
+            "(() => { const entries = %s;"
+            " for (const [k, v] of Object.entries(entries)) {"
+            " if (localStorage.getItem(k) === null) localStorage.setItem(k, v); } })();" % json.dumps(entries)
+        )
+
+    async def install(self, context):
+        """Context hook: route Supabase traffic here and block other hosts."""
+        await context.add_init_script(self.init_script(self.dataset.primary_event_id))
+        await context.route(f"{self.origin}/**", self.handle)
+        if hasattr(context, "route_web_socket"):
+            ws_origin = self.origin.replace("http", "ws", 1)
+            await context.route_web_socket(f"{ws_origin}/realtime/**", self._realtime)
+        if self.block_external:
+            await context.route(self._is_external, lambda route: route.abort("internetdisconnected"))
+
+    def _is_external(self, url):
+        parts = urlsplit(url)
+        return (
+            parts.scheme in ("http", "https")
+            and parts.hostname not in self.allow_hosts
+            and not url.startswith(self.origin)
+        )
+
+    async def delay(self):
+        latency = self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)
+        if latency > 0:
+            await asyncio.sleep(latency / 1000)
+
+    async def handle(self, route):
+        request = route.request
+        headers = {k.lower(): v for k, v in request.headers.items()}
+        cors = {
+            "access-control-allow-origin": headers.get("origin", "*"),
+            "access-control-allow-credentials": "true",
+            "access-control-allow-headers": headers.get("access-control-request-headers", "*"),
+            "access-control-allow-methods": "GET, POST, PATCH, PUT, DELETE, HEAD, OPTIONS",
+            "access-control-expose-headers": "content-range, x-total-count",
+        }
+        if request.method == "OPTIONS":
+            await route.fulfill(status=204, headers=cors)
+            return
+        await self.delay()
+        status, text, extra = await self.respond(request.method, request.url, headers, request.post_data)
+        await route.fulfill(
+            status=status,
+            headers={**cors, **extra, "content-type": "application/json; charset=utf-8"},
+            body=text,
+        )
+
+    async def respond(self, method, url, headers, post_data):
+        """:meth:`dispatch` and JSON encoding on the worker thread.
+
+        Returns ``(status, body_text, headers)``; the headers include the service time.
+        """
+        status, text, extra, elapsed_ms = await self.run_on_worker(self._serve, method, url, headers, post_data)
+        self.service_ms.append(elapsed_ms)
+        return status, text, {**extra, SERVICE_TIME_HEADER: f"{elapsed_ms:.2f}"}
+
+    async def run_on_worker(self, fn, *args):
+        """Run ``fn(*args)`` on the thread that serves requests; use it for any direct ``store`` write."""
+        return await asyncio.get_running_loop().run_in_executor(self._worker, fn, *args)
+
+    def _serve(self, method, url, headers, post_data):
+        started = time.perf_counter()
+        try:
+            status, body, extra = self.dispatch(method, url, headers, post_data)
+        except Exception as e:  # noqa: BLE001 - an unanswered route would hang the page until the probe times out
+            log.exception("offline stand-in failed on %s %s", method, url)
+            status, extra = 500, {}
+            body = {"code": "XX000", "message": f"offline stand-in: {type(e).__name__}: {e}", "details": None,
+                    "hint": None}
+        text = "" if body is None else json.dumps(body, ensure_ascii=False, default=str)
+        return status, text, extra, (time.perf_counter() - started) * 1000
+
+    def service_summary(self):
+        """Request count and service time (total, p50, p95, max) spent inside the stand-in."""
+        times = self.service_ms
+        return {
+            "requests": len(times),
+            "total_ms": round(sum(times), 1),
+            "p50_ms": round(stats.percentile(times, 50), 2) if times else None,
+            "p95_ms": round(stats.percentile(times, 95), 2) if times else None,
+            "max_ms": round(max(times), 2) if times else None,
+        }
+
+    def dispatch(self, method, url, headers, post_data):
+        """Answer one request; returns ``(status, json_body_or_None, headers)``."""
+        parts = urlsplit(url)
+        path, query = parts.path, parts.query
+        try:
+            payload = json.loads(post_data) if post_data else {}
+        except ValueError:
+            payload = {}
+        try:
+            if path.startswith("/rest/v1/rpc/"):
+                name = path.rsplit("/", 1)[-1]
+                handler = self.rpc_handlers.get(name)
+                return 200, handler(self.store, payload) if handler else None, {}
+            if path.startswith("/rest/v1/"):
+                table = path[len("/rest/v1/"):].strip("/")
+                self.request_counts[(method, table)] += 1
+                if method in ("GET", "HEAD"):
+                    return self.store.select(table, query, headers, head=method == "HEAD")
+                if method == "POST":
+                    return self.store.insert(table, query, headers, payload)
+                if method == "PATCH":
+                    return self.store.update(table, query, headers, payload)
+                if method == "DELETE":
+                    return self.store.delete(table, query, headers)
+            if path.startswith("/auth/v1/"):
+                return self._auth(path[len("/auth/v1/"):])
+            if path.startswith("/functions/v1/"):
+                return 200, {}, {}
+        except PostgrestError as e:
+            return e.status, e.body(), {}
+        return 404, {"message": f"offline stand-in: no handler for {method} {path}"}, {}
+
+    def _auth(self, endpoint):
+        if endpoint.startswith("token"):
+            return 200, self.session, {}
+        if endpoint.startswith("user"):
+            return 200, self.session["user"], {}
+        if endpoint.startswith("logout"):
+            return 204, None, {}
+        return 200, {}, {}
+
+    def _realtime(self, ws):
+        def on_message(message):
+            try:
+                frame = json.loads(message)
+            except (TypeError, ValueError):
+                return
+            if isinstance(frame, list):  # serializer 2.0.0: [join_ref, ref, topic, event, payload]
+                join_ref, ref, topic = frame[:3]
+                ws.send(json.dumps([join_ref, ref, topic, "phx_reply", {"status": "ok", "response": {}}]))
+            elif isinstance(frame, dict) and frame.get("ref"):
+                ws.send(json.dumps({"topic": frame.get("topic"), "event": "phx_reply", "ref": frame["ref"],
+                                    "payload": {"status": "ok", "response": {}}}))
+
+        ws.on_message(on_message)
@@ -0,0 +1,89 @@
+"""Summary statistics for repeat-run samples (stdlib only)."""
+
+import math
+import random
+import statistics
+
+
+def percentile(values, q):
+    """Linear-interpolated percentile, ``q`` in [0, 100]."""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    pos = (len(ordered) - 1) * q / 100
+    lo, hi = math.floor(pos), math.ceil(pos)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+def bootstrap_ci(values, stat=statistics.median, confidence=0.95, resamples=2000, seed=0):
+    """Percentile-bootstrap confidence interval for ``stat``.
+
+    Seeded so repeated reports over the same samples are identical.
+    """
+    if len(values) < 2:
+        return None, None
+    rng = random.Random(seed)
+    n = len(values)
+    estimates = sorted(stat(rng.choices(values, k=n)) for _ in range(resamples))
+    alpha = (1 - confidence) / 2
+    return percentile(estimates, alpha * 100), percentile(estimates, (1 - alpha) * 100)
+
+
+def summarize(values, confidence=0.95):
+    """p50/p95/p99, mean and a bootstrap CI of the median; ``None`` entries are dropped."""
+    values = [v for v in values if v is not None]
+    if not values:
+        return {"n": 0}
+    ci_low, ci_high = bootstrap_ci(values, confidence=confidence)
+    return {
+        "n": len(values),
+        "mean": statistics.fmean(values),
+        "stdev": statistics.stdev(values) if len(values) > 1 else 0.0,
+        "min": min(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values),
+        "ci_low": ci_low,
+        "ci_high": ci_high,
+    }
+
+
+def mann_whitney_greater(baseline, candidate):
+    """One-sided Mann-Whitney U test that ``candidate`` tends to be larger.
+
+    Uses the normal approximation with tie and continuity corrections, which
+    is reasonable from about 8 samples per side. Returns ``(u, p_value)``.
+    """
+    n1, n2 = len(baseline), len(candidate)
+    if not n1 or not n2:
+        return None, None
+    pooled = sorted([(v, 0) for v in baseline] + [(v, 1) for v in candidate])
+    ranks, ties, i = [0.0] * len(pooled), 0, 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        size = j - i + 1
+        ties += size**3 - size
+        i = j + 1
+    rank_sum = sum(rank for rank, (_, side) in zip(ranks, pooled) if side == 1)
+    u = rank_sum - n2 * (n2 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return u, 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return u, 1 - statistics.NormalDist().cdf(z)
+
+
+def holm_adjust(p_values):
+    """Holm-Bonferroni adjusted p-values, in input order."""
+    order = sorted(range(len(p_values)), key=lambda i: p_values[i])
+    adjusted, running = [0.0] * len(p_values), 0.0
+    for rank, i in enumerate(order):
+        running = max(running, min(1.0, (len(p_values) - rank) * p_values[i]))
+        adjusted[i] = running
+    return adjusted
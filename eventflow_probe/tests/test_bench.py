@@ -0,0 +1,116 @@
+from types import SimpleNamespace
+
+import pytest
+
+from eventflow_probe import bench
+
+
+def _result(url, cache="cold", ok=True, **metrics):
+    return SimpleNamespace(target=SimpleNamespace(url=url), cache=cache, ok=ok, metrics=metrics)
+
+
+def _key(metric="root_content_ms"):
+    return ("/event/guests", "cold", metric)
+
+
+@pytest.fixture
+def store(tmp_path):
+    with bench.ResultStore(tmp_path / "bench.sqlite") as result_store:
+        yield result_store
+
+
+def test_regression_needs_significance_and_effect():
+    baseline = {_key(): [100 + i for i in range(10)]}
+    candidate = {_key(): [130 + i for i in range(10)]}
+
+    (comparison,) = bench.compare(baseline, candidate)
+
+    assert comparison.regression
+    assert comparison.change == pytest.approx(30 / 104.5)
+    assert comparison.adjusted_p < 0.001
+
+
+def test_small_shift_is_not_a_regression_below_min_effect():
+    baseline = {_key(): [100 + i * 0.1 for i in range(10)]}
+    candidate = {_key(): [103 + i * 0.1 for i in range(10)]}
+
+    (comparison,) = bench.compare(baseline, candidate, min_effect=0.05)
+    assert comparison.adjusted_p < 0.05
+    assert not comparison.regression
+
+    (comparison,) = bench.compare(baseline, candidate, min_effect=0.01)
+    assert comparison.regression
+
+
+def test_zero_baseline():
+    metric = "total_blocking_time_ms"
+    (grew,) = bench.compare({_key(metric): [0.0] * 10}, {_key(metric): [50.0] * 10})
+    assert grew.change == float("inf")
+    assert grew.regression
+
+    (flat,) = bench.compare({_key(metric): [0.0] * 10}, {_key(metric): [0.0] * 10})
+    assert flat.change == 0.0
+    assert flat.p_value == 1.0
+    assert not flat.regression
+
+
+def test_holm_correction_across_keys():
+    baseline = {_key(m): [100 + i for i in range(8)] for m in bench.GATE_METRICS}
+    candidate = {_key(m): [100 + i for i in range(8)] for m in bench.GATE_METRICS}
+    candidate[_key("lcp_ms")] = [103 + i for i in range(8)]
+
+    comparisons = {c.metric: c for c in bench.compare(baseline, candidate)}
+
+    lcp = comparisons["lcp_ms"]
+    assert lcp.adjusted_p == pytest.approx(min(1.0, 3 * lcp.p_value))
+    assert lcp.p_value < 0.05 < lcp.adjusted_p
+    assert not any(c.regression for c in comparisons.values())
+
+
+def test_compare_skips_unshared_keys_and_other_metrics():
+    baseline = {_key(): [1.0] * 8, _key("fcp_ms"): [1.0] * 8, ("/ai", "cold", "lcp_ms"): [1.0] * 8}
+    candidate = {_key(): [1.0] * 8, _key("fcp_ms"): [2.0] * 8}
+
+    assert [c.metric for c in bench.compare(baseline, candidate)] == ["root_content_ms"]
+
+
+def test_save_run_samples_round_trip(store):
+    results = [
+        _result("http://127.0.0.1:5173/event/guests?tab=all", "warm", lcp_ms=100.0, root_content_ms=None, fcp_ms=1.0),
+        _result("http://localhost:5175/event/guests", "warm", lcp_ms=120.0, root_content_ms=80.0),
+        _result("http://127.0.0.1:5173/", None, lcp_ms=50.0),
+        _result("http://127.0.0.1:5173/ai", ok=False, lcp_ms=999.0),
+    ]
+
+    run_id = store.save_run(results, ("lcp_ms", "root_content_ms"), "abc123")
+
+    assert store.samples(run_id) == {
+        ("/event/guests", "warm", "lcp_ms"): [100.0, 120.0],
+        ("/event/guests", "warm", "root_content_ms"): [80.0],
+        ("/", "cold", "lcp_ms"): [50.0],
+    }
+
+
+def test_resolve(store):
+    first = store.save_run([], (), "abc1230000")
+    baseline = store.save_run([], (), "def4560000", is_baseline=True)
+    latest = store.save_run([], (), "abc9990000")
+
+    assert store.resolve("baseline") == baseline
+    assert store.resolve("latest") == latest
+    assert store.resolve(str(first)) == first
+    assert store.resolve("abc") == latest
+    assert store.resolve("abc123") == first
+    assert store.resolve("999") is None
+    assert store.resolve("fff") is None
+
+    assert store.mark_baseline(first) is True
+    assert store.resolve("baseline") == first
+    assert [row[0] for row in store.runs() if row[5]] == [first]
+
+
+def test_mark_baseline_keeps_the_baseline_for_an_unknown_run(store):
+    baseline = store.save_run([], (), "def4560000", is_baseline=True)
+
+    assert store.mark_baseline(baseline + 1) is False
+    assert store.resolve("baseline") == baseline
@@ -0,0 +1,38 @@
+import asyncio
+
+import pytest
+
+from eventflow_probe import cli
+
+
+def test_param_pairs():
+    args = cli.build_parser().parse_args(["probe", "--param", "eventId=a=b", "--param", "tab="])
+    assert dict(args.params) == {"eventId": "a=b", "tab": ""}
+
+
+@pytest.mark.parametrize("value", ["foo", "=bar"])
+def test_malformed_param_is_a_usage_error(value, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        cli.build_parser().parse_args(["probe", "--param", value])
+    assert exit_info.value.code == 2
+    assert "--param expects name=value" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize(
+    "argv, cycles, duration",
+    [
+        ([], None, None),
+        (["--duration", "120"], None, 120.0),
+        (["--duration", "120", "--cycles", "50"], 50, 120.0),
+    ],
+)
+def test_soak_cycles_only_when_given(argv, cycles, duration):
+    args = cli.build_parser().parse_args(["soak", *argv])
+    assert (args.cycles, args.duration) == (cycles, duration)
+
+
+def test_marking_an_unknown_run_as_baseline_fails(tmp_path, capsys):
+    args = cli.build_parser().parse_args(["bench-runs", "--db", str(tmp_path / "bench.sqlite"), "--mark-baseline", "7"])
+
+    assert asyncio.run(args.handler(args)) == 1
+    assert "No run with id 7" in capsys.readouterr().err
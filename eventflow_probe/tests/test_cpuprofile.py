@@ -0,0 +1,92 @@
+from types import SimpleNamespace
+
+import pytest
+
+from eventflow_probe import cpuprofile
+
+APP = "http://127.0.0.1:4173/assets/index-abc.js"
+
+
+def _frame(name, line=0, url=APP):
+    return {"functionName": name, "url": url, "lineNumber": line, "columnNumber": 0, "scriptId": "1"}
+
+
+def _profile():
+    """(root) → render → diff, plus (idle); 500 us in diff, 100 us in render, 400 us idle."""
+    return {
+        "nodes": [
+            {"id": 1, "callFrame": _frame("(root)", url=""), "children": [2, 3]},
+            {"id": 2, "callFrame": _frame("(idle)", url="")},
+            {"id": 3, "callFrame": _frame("render", 9), "children": [4]},
+            {"id": 4, "callFrame": _frame("diff", 19)},
+        ],
+        "startTime": 0,
+        "endTime": 1000,
+        "samples": [3, 4, 4, 2, 3],
+        "timeDeltas": [0, 100, 200, 300, 400],
+    }
+
+
+def test_self_times_charge_each_gap_to_the_sample_before_it():
+    assert cpuprofile.self_times(_profile()) == {3: 100, 4: 500, 2: 400}
+
+
+def test_top_functions_rank_busy_self_time():
+    assert cpuprofile.top_functions(_profile()) == [
+        {"function": "diff /assets/index-abc.js:20", "self_ms": 0.5, "self_pct": 83.3, "total_ms": 0.5},
+        {"function": "render /assets/index-abc.js:10", "self_ms": 0.1, "self_pct": 16.7, "total_ms": 0.6},
+    ]
+    assert len(cpuprofile.top_functions(_profile(), limit=1)) == 1
+
+
+def test_folded_stacks():
+    profile = _profile()
+    profile["nodes"][3]["callFrame"]["functionName"] = "diff;children"
+
+    assert cpuprofile.folded_stacks(profile) == [
+        "(idle) 400",
+        "render /assets/index-abc.js:10 100",
+        "render /assets/index-abc.js:10;diff:children /assets/index-abc.js:20 500",
+    ]
+
+
+def _trace():
+    main, compositor = {"pid": 1, "tid": 7}, {"pid": 1, "tid": 8}
+    return {"traceEvents": [
+        {"ph": "M", "name": "thread_name", "args": {"name": "CrRendererMain"}, **main},
+        {"ph": "M", "name": "thread_name", "args": {"name": "Compositor"}, **compositor},
+        {"ph": "X", "name": "RunTask", "ts": 0, "dur": 80_000, **main},
+        {"ph": "X", "name": "FunctionCall", "ts": 1_000, "dur": 30_000, **main},
+        {"ph": "X", "name": "FunctionCall", "ts": 5_000, "dur": 1_000, **main},  # nested, already counted
+        {"ph": "X", "name": "Layout", "ts": 40_000, "dur": 5_000, **main},
+        {"ph": "X", "name": "Paint", "ts": 50_000, "dur": 2_000, **main},
+        {"ph": "X", "name": "RunTask", "ts": 100_000, "dur": 10_000, **main},
+        {"ph": "X", "name": "EvaluateScript", "ts": 101_000, "dur": 4_000, **main},
+        {"ph": "X", "name": "Paint", "ts": 0, "dur": 99_000, **compositor},
+    ]}
+
+
+def test_trace_summary_counts_the_renderer_main_thread_once():
+    expected = {"scripting_ms": 34.0, "rendering_ms": 5.0, "painting_ms": 2.0, "long_tasks": 1, "long_task_ms": 80.0}
+
+    assert cpuprofile.trace_summary(_trace()) == expected
+    assert cpuprofile.trace_summary(_trace()["traceEvents"]) == expected
+
+
+@pytest.mark.parametrize(
+    "urls, saved",
+    [
+        (["http://127.0.0.1:54321/rest/v1/table_assignments?on_conflict=participant_id"], True),
+        (["http://127.0.0.1:54321/rest/v1/participants?id=eq.1"], False),
+        ([], False),
+    ],
+)
+def test_seating_drag_requires_a_saved_assignment(urls, saved):
+    writes = [SimpleNamespace(url=url) for url in urls]
+    drag = cpuprofile.INTERACTIONS["seating-drag"]
+
+    if saved:
+        drag.verify(writes)
+    else:
+        with pytest.raises(cpuprofile.InteractionError):
+            drag.verify(writes)
@@ -0,0 +1,187 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from eventflow_probe import edgebench, fixtures
+from eventflow_probe.standin import SupabaseStandIn
+
+STANDIN = SimpleNamespace(session={"access_token": "token"})
+
+
+class _Pool:
+    """Answers every call after ``delay_s``, recording the payload indexes."""
+
+    def __init__(self, delay_s=0.0, status=200):
+        self.delay_s, self.status = delay_s, status
+        self.indexes = []
+
+    async def request(self, method, path, headers, body=b""):
+        self.indexes.append(json.loads(body)["index"])
+        await asyncio.sleep(self.delay_s)
+        return self.status, b"{}"
+
+
+def _scenario():
+    return edgebench.Scenario("send-whatsapp", "service", lambda standin, i: {"index": i})
+
+
+async def _serve(responses, close_after=None):
+    """A local server that answers request ``n`` with ``responses[n]``; returns ``(server, port, connections)``."""
+    connections = []
+    served = 0
+
+    async def handle(reader, writer):
+        nonlocal served
+        connections.append(writer)
+        while await edgebench._read_message(reader):
+            writer.write(responses[served])
+            served += 1
+            await writer.drain()
+            if close_after is not None and served >= close_after:
+                break
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1], connections
+
+
+def test_uniform_arrivals_are_evenly_spaced():
+    assert edgebench.arrival_times(4, 1.0) == [0.0, 0.25, 0.5, 0.75]
+
+
+def test_poisson_arrivals_are_seeded():
+    times = edgebench.arrival_times(200, 5.0, "poisson", seed=3)
+
+    assert times == edgebench.arrival_times(200, 5.0, "poisson", seed=3)
+    assert times != edgebench.arrival_times(200, 5.0, "poisson", seed=4)
+    assert times == sorted(times) and times[-1] < 5.0
+    assert 900 < len(times) < 1100
+
+
+def test_open_loop_keeps_the_schedule_when_responses_are_slow():
+    pool = _Pool(delay_s=0.2)
+
+    results, dropped, elapsed = asyncio.run(
+        edgebench.open_loop(pool, "/", _scenario(), STANDIN, rps=50, duration_s=0.2, batch=2, first_index=7)
+    )
+
+    # All 20 requests go out within the 0.2 s window instead of one per 0.2 s response.
+    assert sorted(pool.indexes) == list(range(7, 27))
+    assert dropped == 0 and len(results) == 20
+    assert all(status == 200 and latency >= 190 for latency, status in results)
+    assert elapsed < 1.0
+
+
+def test_open_loop_drops_over_max_inflight_and_times_out_on_drain():
+    results, dropped, _ = asyncio.run(edgebench.open_loop(
+        _Pool(delay_s=5.0), "/", _scenario(), STANDIN, rps=100, duration_s=0.05, max_inflight=3, drain_timeout_s=0.05,
+    ))
+
+    assert dropped == 2
+    assert results == [(None, "timeout")] * 3
+
+
+def test_open_loop_counts_connection_errors():
+    class Refused:
+        async def request(self, *args):
+            raise ConnectionRefusedError
+
+    results, _, _ = asyncio.run(edgebench.open_loop(Refused(), "/", _scenario(), STANDIN, rps=10, duration_s=0.2))
+
+    assert [status for _, status in results] == [None, None]
+
+
+def test_histogram_buckets_are_upper_bounds():
+    assert edgebench.histogram([1, 5, 5.1, 99, 100, 101, 20_000]) == {
+        "le_5ms": 2, "le_10ms": 1, "le_25ms": 0, "le_50ms": 0, "le_100ms": 2, "le_250ms": 1, "le_500ms": 0,
+        "le_1000ms": 0, "le_2500ms": 0, "le_5000ms": 0, "le_10000ms": 0, "inf": 1,
+    }
+
+
+def test_http_pool_reuses_connections_and_reads_chunked_bodies():
+    sized = b"HTTP/1.1 201 Created\r\ncontent-length: 2\r\n\r\nok"
+    chunked = b"HTTP/1.1 200 OK\r\ntransfer-encoding: chunked\r\n\r\n3\r\nabc\r\n2\r\nde\r\n0\r\n\r\n"
+
+    async def run():
+        server, port, connections = await _serve([sized, chunked])
+        pool = edgebench.HttpPool("127.0.0.1", port)
+        responses = [await pool.request("POST", "/", {}, b"{}"), await pool.request("GET", "/", {})]
+        pool.close()
+        server.close()
+        await server.wait_closed()
+        return responses, len(connections)
+
+    responses, connections = asyncio.run(run())
+
+    assert responses == [(201, b"ok"), (200, b"abcde")]
+    assert connections == 1
+
+
+def test_http_pool_retries_when_the_server_closed_an_idle_connection():
+    response = b"HTTP/1.1 200 OK\r\ncontent-length: 0\r\n\r\n"
+
+    async def run():
+        server, port, connections = await _serve([response, response], close_after=1)
+        pool = edgebench.HttpPool("127.0.0.1", port)
+        await pool.request("GET", "/", {})
+        await asyncio.sleep(0.05)
+        status, _ = await pool.request("GET", "/", {})
+        pool.close()
+        server.close()
+        await server.wait_closed()
+        return status, len(connections)
+
+    assert asyncio.run(run()) == (200, 2)
+
+
+@pytest.mark.parametrize(
+    "path, kind",
+    [
+        ("/gemini/v1beta/models/gemini-2.0-flash:generateContent", "gemini"),
+        ("/green-api/waInstance1101000001/sendMessage/token", "green-api"),
+        ("/functions/v1/send-whatsapp", "function:send-whatsapp"),
+        ("/rest/v1/events?select=id", "supabase:rest"),
+    ],
+)
+def test_upstream_stub_answers_and_counts(path, kind):
+    standin = SupabaseStandIn(fixtures.generate(participants=10, events=1))
+
+    async def run():
+        stub = await edgebench.UpstreamStub(standin, ai_latency_ms=0, whatsapp_latency_ms=0).start()
+        pool = edgebench.HttpPool("127.0.0.1", int(stub.origin.rsplit(":", 1)[1]))
+        status, body = await pool.request("POST" if "rest" not in path else "GET", path, {}, b"{}")
+        pool.close()
+        await stub.close()
+        return status, json.loads(body), stub.counts
+
+    status, body, counts = asyncio.run(run())
+
+    assert status == 200 and body
+    assert counts == {kind: 1}
+
+
+def test_approved_actions_are_created_and_removed():
+    dataset = fixtures.generate(participants=10, events=1)
+    store = SupabaseStandIn(dataset).store
+
+    undo = edgebench._create_approved_actions(store, dataset, 3)
+    _, rows, _ = store.select("ai_insights_log", "execution_status=eq.approved&select=id", {})
+    assert [row["id"] for row in rows] == [edgebench._action_id(i) for i in range(3)]
+
+    undo()
+    assert store.select("ai_insights_log", "execution_status=eq.approved&select=id", {})[1] == []
+
+
+def test_activation_reminders_restore_the_settings():
+    dataset = fixtures.generate(participants=10, events=2)
+    store = SupabaseStandIn(dataset).store
+    before = store.select("events", "status=eq.active&select=id,settings", {})[1]
+
+    undo = edgebench._enable_activation_reminders(store, dataset, 1)
+    during = store.select("events", "status=eq.active&select=id,settings", {})[1]
+    assert during and all(event["settings"]["reminder_activation"] is True for event in during)
+
+    undo()
+    assert store.select("events", "status=eq.active&select=id,settings", {})[1] == before
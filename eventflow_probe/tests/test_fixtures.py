@@ -0,0 +1,103 @@
+from eventflow_probe import fixtures
+
+SEED_SQL = """
+-- reference rows; this comment has a 'quote and a (paren
+INSERT INTO message_templates (name, content, variables, settings, is_default, sort_order, ratio, note)
+VALUES
+  ('ברוכים הבאים', 'It''s {{name}}, see you (soon); bye', '["name","event"]', '{"k": [1, 2]}', TRUE, 3, 1.5, NULL),
+  ('second', 'plain', '[not json', '{}', false, -1, 0.25, 'x');
+
+INSERT INTO events (id, start_date) VALUES ('e1', '2026-01-30 08:00:00+02');
+"""
+
+
+def test_parse_seed_inserts(tmp_path):
+    path = tmp_path / "seed.sql"
+    path.write_text(SEED_SQL, encoding="utf-8")
+
+    tables = fixtures.parse_seed_inserts(path)
+
+    assert tables["message_templates"] == [
+        {"name": "ברוכים הבאים", "content": "It's {{name}}, see you (soon); bye", "variables": ["name", "event"],
+         "settings": {"k": [1, 2]}, "is_default": True, "sort_order": 3, "ratio": 1.5, "note": None},
+        {"name": "second", "content": "plain", "variables": "[not json", "settings": {}, "is_default": False,
+         "sort_order": -1, "ratio": 0.25, "note": "x"},
+    ]
+    assert tables["events"] == [{"id": "e1", "start_date": "2026-01-30T08:00:00+02:00"}]
+
+
+def test_three_day_seed_parses():
+    counts = {table: len(rows) for table, rows in fixtures.parse_seed_inserts(fixtures.THREE_DAY_EVENT_SQL).items()}
+    assert counts == {"events": 1, "schedules": 33, "participants": 45}
+
+
+def test_generate_is_deterministic():
+    first, second = fixtures.generate(participants=50, seed=7), fixtures.generate(participants=50, seed=7)
+    assert first.tables == second.tables
+    assert len([p for p in first.tables["participants"] if p["event_id"] == first.primary_event_id]) == 50
+
+
+def test_generate_builds_on_seeded_event():
+    dataset = fixtures.generate(
+        participants=100, events=2, seed_sql=fixtures.DEFAULT_SEED_SQL + (fixtures.THREE_DAY_EVENT_SQL,)
+    )
+    seeded = fixtures.parse_seed_inserts(fixtures.THREE_DAY_EVENT_SQL)
+    main = dataset.primary_event_id
+
+    assert main == seeded["events"][0]["id"]
+    assert len(dataset.tables["events"]) == 2
+    assert dataset.tables["events"][0]["organization_id"] == dataset.organization_id
+    guests = [p for p in dataset.tables["participants"] if p["event_id"] == main]
+    assert len(guests) == 100
+    assert [p["id"] for p in guests[:45]] == [p["id"] for p in seeded["participants"]]
+    assert guests[0]["full_name"] and guests[0]["phone_normalized"].startswith("972")
+    sessions = [s["id"] for s in dataset.tables["schedules"] if s["event_id"] == main]
+    assert sessions == [s["id"] for s in seeded["schedules"]]
+
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS public.rooms (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  name TEXT NOT NULL DEFAULT '', -- shown on the floor plan, e.g. 'Hall A, north'
+  equipment TEXT[] DEFAULT '{}',
+  languages TEXT[] DEFAULT ARRAY['he', 'en'],
+  settings JSONB NOT NULL DEFAULT '{"a": 1, "b": [2]}'::jsonb,
+  capacity INTEGER DEFAULT 100,
+  is_available BOOLEAN DEFAULT TRUE,
+  created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+ALTER TABLE rooms
+  ADD COLUMN IF NOT EXISTS room_type VARCHAR(50) DEFAULT 'standard', -- standard, suite
+  ADD COLUMN floor INTEGER,
+  ADD COLUMN capacity INTEGER DEFAULT 40;
+"""
+
+
+def test_parse_column_defaults(tmp_path):
+    path = tmp_path / "schema.sql"
+    path.write_text(SCHEMA_SQL, encoding="utf-8")
+
+    assert fixtures.parse_column_defaults([path]) == {
+        "rooms": {"name": "", "equipment": [], "languages": ["he", "en"], "settings": {"a": 1, "b": [2]},
+                  "capacity": 40, "is_available": True, "room_type": "standard"},
+    }
+
+
+def test_generate_fills_schema_defaults():
+    dataset = fixtures.generate(participants=20)
+    schedules = dataset.tables["schedules"]
+
+    assert all(s["is_deleted"] is False and s["session_type"] == "presentation" for s in schedules)
+    assert all(p["networking_opt_in"] is False for p in dataset.tables["participants"])
+    custom_fields = [p["custom_fields"] for p in dataset.tables["participants"]]
+    assert len({id(c) for c in custom_fields}) == len(custom_fields)
+
+
+def test_generate_seeds_venue_tables():
+    dataset = fixtures.generate(participants=20, venue_tables=5)
+    tables = dataset.tables["venue_tables"]
+
+    assert [t["table_number"] for t in tables] == [1, 2, 3, 4, 5]
+    assert {t["event_id"] for t in tables} == {dataset.primary_event_id}
+    assert (tables[4]["x"], tables[4]["y"]) == (80, 400)
@@ -0,0 +1,147 @@
+import asyncio
+
+import pytest
+
+from eventflow_probe import network
+
+APP = "http://127.0.0.1:4173"
+MANUAL_CHUNKS = {
+    "vendor-react": ["react", "react-dom", "react-router-dom"],
+    "vendor-supabase": ["@supabase/supabase-js"],
+}
+
+
+def _row(i, url, type_="Script", start_ms=0.0, end_ms=10.0, parent=None, depth=1, initiator="parser", **extra):
+    return {"id": i, "url": url, "method": "GET", "type": type_, "chunk": network.chunk_for(url, MANUAL_CHUNKS),
+            "initiator": initiator, "parent": parent, "depth": depth, "status": 200,
+            "start_ms": start_ms, "ttfb_ms": None, "end_ms": end_ms,
+            "transfer_bytes": 100, "decoded_bytes": 300, "from_cache": False, "failed": None, **extra}
+
+
+def _page_load():
+    """Document → index → lazy page chunk, plus a vendor chunk and a late image."""
+    return [
+        _row(0, f"{APP}/events", "Document", 0.0, 20.0),
+        _row(1, f"{APP}/assets/index-DaT4kq9z.js", start_ms=25.0, end_ms=60.0, parent=0, depth=2),
+        _row(2, f"{APP}/assets/vendor-react-B2x9Qf1a.js", start_ms=25.0, end_ms=80.0, parent=0, depth=2),
+        _row(3, f"{APP}/assets/EventsPage-C1d2E3f4.js", start_ms=90.0, end_ms=120.0, parent=1, depth=3,
+             initiator="script"),
+        _row(4, f"{APP}/assets/logo-A1b2C3d4.png", "Image", 130.0, 400.0, parent=3, depth=4),
+    ]
+
+
+@pytest.mark.parametrize(
+    "url, chunk",
+    [
+        (f"{APP}/assets/vendor-react-B2x9Qf1a.js", "vendor-react"),
+        (f"{APP}/assets/index-DaT4kq9z.js", "index"),
+        (f"{APP}/assets/EventsPage-C1d2E3f4.js", "lazy:EventsPage"),
+        ("http://localhost:5173/node_modules/.vite/deps/react-dom_client.js?v=1f2e", "vendor-react"),
+        ("http://localhost:5173/node_modules/.vite/deps/@supabase_supabase-js.js", "vendor-supabase"),
+        ("http://localhost:5173/node_modules/.vite/deps/date-fns.js", "deps:date-fns"),
+        ("http://localhost:5173/src/pages/events/EventsPage.tsx", "src:pages/events"),
+        ("http://127.0.0.1:54321/rest/v1/events?select=*", "supabase:table"),
+        (f"{APP}/favicon.ico", None),
+    ],
+)
+def test_chunk_for(url, chunk):
+    assert network.chunk_for(url, MANUAL_CHUNKS) == chunk
+
+
+def test_critical_path_is_the_deepest_chain_before_render():
+    rows = _page_load()
+
+    assert [r["id"] for r in network.critical_path(rows, render_ms=150.0)] == [0, 1, 3]
+    assert [r["id"] for r in network.critical_path(rows, render_ms=70.0)] == [0, 1]
+    assert network.critical_path(rows, render_ms=10.0) == []
+
+
+def test_critical_path_without_render_time_uses_every_asset():
+    rows = _page_load()
+    rows.append(_row(5, f"{APP}/assets/SeatingChart-E5f6G7h8.js", start_ms=125.0, end_ms=200.0, parent=3, depth=4,
+                     initiator="script"))
+
+    assert [r["id"] for r in network.critical_path(rows, render_ms=None)] == [0, 1, 3, 5]
+
+
+def test_summarize_reports_preloadable_chunks_after_the_html():
+    summary = network.summarize(_page_load(), render_ms=150.0)
+
+    assert summary["critical_path"] == ["/events", "index", "lazy:EventsPage"]
+    assert summary["critical_path_depth"] == 3
+    assert summary["critical_path_ms"] == 120.0
+    assert summary["preloadable"] == [{"chunk": "lazy:EventsPage", "url": f"{APP}/assets/EventsPage-C1d2E3f4.js",
+                                       "late_by_ms": 70.0}]
+    assert summary["preloadable_ms"] == 70.0
+
+
+def test_summarize_sizes_by_chunk_and_budgets():
+    rows = _page_load()
+    rows[2]["decoded_bytes"] = 200_000
+
+    summary = network.summarize(rows, render_ms=150.0, budgets={"vendor-react": 150_000, "index": 150_000})
+
+    assert summary["requests"] == 5
+    assert summary["js_decoded_bytes"] == 200_600
+    assert list(summary["by_chunk"]) == ["vendor-react", "index", "lazy:EventsPage"]
+    assert summary["over_budget"] == [{"chunk": "vendor-react", "decoded_bytes": 200_000, "max_bytes": 150_000}]
+
+
+def test_summarize_finds_duplicate_fetches_and_chunks():
+    rows = _page_load()
+    rows.append(_row(5, f"{APP}/assets/index-DaT4kq9z.js", start_ms=95.0, end_ms=110.0, parent=3, depth=4))
+    rows.append(_row(6, f"{APP}/assets/vendor-react-Z9y8X7w6.js", start_ms=95.0, end_ms=130.0, parent=3, depth=4))
+    rows.append(_row(7, f"{APP}/assets/index-DaT4kq9z.js", start_ms=140.0, end_ms=141.0, from_cache=True))
+
+    summary = network.summarize(rows, render_ms=150.0)
+
+    assert summary["duplicates"] == [{"url": f"{APP}/assets/index-DaT4kq9z.js", "count": 2, "wasted_bytes": 100}]
+    assert summary["duplicate_chunks"] == {
+        "vendor-react": ["/assets/vendor-react-B2x9Qf1a.js", "/assets/vendor-react-Z9y8X7w6.js"],
+    }
+
+
+class _Session:
+    def on(self, event, handler):
+        pass
+
+
+class _Page:
+    def __init__(self, marks):
+        self.marks = marks
+
+    async def evaluate(self, script):
+        return self.marks
+
+
+def _recorder(marks):
+    recorder = network.NetworkRecorder(_Session(), _Page(marks))
+    # A redirect hop before the document: the waterfall starts 50 ms before the page's time origin.
+    recorder._on_request_will_be_sent({"requestId": "1", "timestamp": 100.000, "type": "Document",
+                                       "request": {"url": f"{APP}/", "method": "GET"}})
+    recorder._on_request_will_be_sent({"requestId": "1", "timestamp": 100.050, "type": "Document",
+                                       "request": {"url": f"{APP}/events", "method": "GET"},
+                                       "redirectResponse": {"status": 302}})
+    recorder._on_response_received({"requestId": "1", "response": {
+        "status": 200, "timing": {"requestTime": 100.052, "sendStart": 3.0, "receiveHeadersEnd": 15.0},
+    }})
+    return recorder
+
+
+def test_render_ms_is_moved_onto_the_waterfall_clock():
+    # The page sent the document 4 ms after its time origin; CDP saw it go out 55 ms after the first request.
+    recorder = _recorder({"render": 204.0, "requestStart": 4.0})
+
+    assert asyncio.run(recorder.render_ms()) == 255.0
+    assert recorder.waterfall(MANUAL_CHUNKS)[1]["ttfb_ms"] == 67.0
+
+
+@pytest.mark.parametrize(
+    "marks, expected",
+    [
+        ({"render": None, "requestStart": 4.0}, None),
+        ({"render": 204.0, "requestStart": None}, 204.0),
+    ],
+)
+def test_render_ms_without_both_marks(marks, expected):
+    assert asyncio.run(_recorder(marks).render_ms()) == expected
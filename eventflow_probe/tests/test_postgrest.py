@@ -0,0 +1,218 @@
+import pytest
+
+from eventflow_probe.postgrest import OBJECT_MEDIA_TYPE, PostgrestError, PostgrestStore
+
+REPRESENTATION = {"prefer": "return=representation"}
+
+
+@pytest.fixture
+def store():
+    return PostgrestStore({
+        "events": [
+            {"id": "e1", "name": "Alpha Conf", "status": "active"},
+            {"id": "e2", "name": "beta", "status": "draft"},
+        ],
+        "participants": [
+            {"id": "p1", "event_id": "e1", "first_name": "Noa", "status": "confirmed", "is_vip": True,
+             "checked_in_at": None, "seats": 2},
+            {"id": "p2", "event_id": "e1", "first_name": "Yossi", "status": "invited", "is_vip": False,
+             "checked_in_at": "2026-01-01T09:00:00+00:00", "seats": 1},
+            {"id": "p3", "event_id": "e1", "first_name": "Dana", "status": "declined", "is_vip": False,
+             "checked_in_at": None, "seats": 1},
+            {"id": "p4", "event_id": "e2", "first_name": "Noam", "status": "confirmed", "is_vip": False,
+             "checked_in_at": None, "seats": 3},
+        ],
+        "schedules": [{"id": "s1", "event_id": "e1", "title": "Opening"}],
+        "participant_schedules": [{"id": "ps1", "participant_id": "p1", "schedule_id": "s1", "attended": None}],
+    })
+
+
+def _ids(store, query, table="participants"):
+    _, body, _ = store.select(table, "select=id&order=id&" + query, {})
+    return [row["id"] for row in body]
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("event_id=eq.e1", ["p1", "p2", "p3"]),
+        ("event_id=eq.e1&status=eq.confirmed", ["p1"]),
+        ("status=neq.confirmed", ["p2", "p3"]),
+        ("seats=gte.2", ["p1", "p4"]),
+        ("status=in.(confirmed,invited)", ["p1", "p2", "p4"]),
+        ('status=in.("declined")', ["p3"]),
+        ("checked_in_at=is.null", ["p1", "p3", "p4"]),
+        ("is_vip=is.true", ["p1"]),
+        ("is_vip=eq.false", ["p2", "p3", "p4"]),
+        ("first_name=ilike.no*", ["p1", "p4"]),
+        ("first_name=ilike.%25SSI", ["p2"]),
+        ("first_name=like.no*", []),
+        ("status=not.eq.confirmed", ["p2", "p3"]),
+        ("status=not.in.(confirmed,declined)", ["p2"]),
+        ("checked_in_at=not.is.null", ["p2"]),
+        ("or=(status.eq.declined,is_vip.is.true)", ["p1", "p3"]),
+        ("or=(status.eq.declined,and(event_id.eq.e2,status.eq.confirmed))", ["p3", "p4"]),
+        ("event_id=eq.e1&or=(first_name.ilike.y*,status.eq.declined)", ["p2", "p3"]),
+        ("id=eq.missing", []),
+    ],
+)
+def test_filters(store, query, expected):
+    assert _ids(store, query) == expected
+
+
+@pytest.mark.parametrize(
+    "table, query, expected",
+    [
+        ("participants", "select=id,events(name)&id=eq.p1", [{"id": "p1", "events": {"name": "Alpha Conf"}}]),
+        ("participants", "select=id,event:event_id(name)&id=eq.p4", [{"id": "p4", "event": {"name": "beta"}}]),
+        ("participants", "select=first_name,ev:events(*)&id=eq.p4",
+         [{"first_name": "Noam", "ev": {"id": "e2", "name": "beta", "status": "draft"}}]),
+        ("events", "select=id,participants(count)&order=id",
+         [{"id": "e1", "participants": [{"count": 3}]}, {"id": "e2", "participants": [{"count": 1}]}]),
+        ("events", "select=id,schedules!inner(title)", [{"id": "e1", "schedules": [{"title": "Opening"}]}]),
+        ("events", "select=id,schedules(title)&order=id",
+         [{"id": "e1", "schedules": [{"title": "Opening"}]}, {"id": "e2", "schedules": []}]),
+        ("participants", "select=id,participant_schedules(schedules(title))&id=eq.p1",
+         [{"id": "p1", "participant_schedules": [{"schedules": {"title": "Opening"}}]}]),
+        ("participants", "select=name:first_name&id=eq.p2", [{"name": "Yossi"}]),
+    ],
+)
+def test_embeds(store, table, query, expected):
+    status, body, _ = store.select(table, query, {})
+    assert status == 200
+    assert body == expected
+
+
+@pytest.mark.parametrize(
+    "table, query, expected",
+    [
+        ("participant_schedules", "select=id,schedules(title)&schedules.event_id=eq.e1",
+         [{"id": "ps1", "schedules": {"title": "Opening"}}]),
+        ("participant_schedules", "select=id,schedules(title)&schedules.event_id=eq.e2",
+         [{"id": "ps1", "schedules": None}]),
+        ("participant_schedules", "select=id,schedules!inner(title)&schedules.event_id=eq.e2", []),
+        ("events", "select=id,participants(id)&participants.status=eq.confirmed&order=id",
+         [{"id": "e1", "participants": [{"id": "p1"}]}, {"id": "e2", "participants": [{"id": "p4"}]}]),
+        ("events", "select=id,guests:participants!inner(id)&guests.or=(is_vip.is.true,seats.gte.3)&order=id",
+         [{"id": "e1", "guests": [{"id": "p1"}]}, {"id": "e2", "guests": [{"id": "p4"}]}]),
+        ("events", "select=id,participants(count)&participants.status=neq.confirmed&order=id",
+         [{"id": "e1", "participants": [{"count": 2}]}, {"id": "e2", "participants": [{"count": 0}]}]),
+        ("participants", "select=id,participant_schedules(schedules(title))&participant_schedules.schedules.title=eq.x"
+         "&id=eq.p1", [{"id": "p1", "participant_schedules": [{"schedules": None}]}]),
+    ],
+)
+def test_embedded_filters(store, table, query, expected):
+    assert store.select(table, query, {})[1] == expected
+
+
+@pytest.mark.parametrize(
+    "query, code",
+    [
+        ("select=id&schedules.event_id=eq.e1", "PGRST108"),
+        ("select=id,schedules(title)&schedules.order=title.asc", "PGRST100"),
+        ("select=id,schedules(title)&order=schedules.start_time.asc", "PGRST100"),
+        ("select=id&order=id.upward", "PGRST100"),
+    ],
+)
+def test_unsupported_syntax_is_a_400(store, query, code):
+    with pytest.raises(PostgrestError) as error:
+        store.select("participant_schedules", query, {})
+    assert (error.value.status, error.value.code) == (400, code)
+
+
+def test_insert_fills_column_defaults(store):
+    store.column_defaults = {"schedules": {"is_deleted": False, "equipment": []}}
+    rows = [{"event_id": "e1"}, {"event_id": "e1", "is_deleted": True}]
+    _, body, _ = store.insert("schedules", "", REPRESENTATION, rows)
+
+    assert [(row["is_deleted"], row["equipment"]) for row in body] == [(False, []), (True, [])]
+    assert body[0]["equipment"] is not body[1]["equipment"]
+
+
+@pytest.mark.parametrize(
+    "query, headers, expected_ids, content_range",
+    [
+        ("order=id", {"range": "1-2", "prefer": "count=exact"}, ["p2", "p3"], "1-2/4"),
+        ("order=id&limit=2", {}, ["p1", "p2"], "0-1/*"),
+        ("order=id&limit=2&offset=3", {"prefer": "count=exact"}, ["p4"], "3-3/4"),
+        ("order=seats.desc,id", {"prefer": "count=planned"}, ["p4", "p1", "p2", "p3"], "0-3/4"),
+        ("id=eq.missing", {"prefer": "count=exact"}, [], "*/0"),
+    ],
+)
+def test_ranges_and_content_range(store, query, headers, expected_ids, content_range):
+    _, body, extra = store.select("participants", "select=id&" + query, headers)
+    assert [row["id"] for row in body] == expected_ids
+    assert extra["content-range"] == content_range
+
+
+def test_head_and_max_rows(store):
+    store.max_rows = 2
+    _, body, extra = store.select("participants", "select=id", {"prefer": "count=exact"}, head=True)
+    assert body is None
+    assert extra["content-range"] == "0-1/4"
+
+
+def test_order_nulls(store):
+    assert _ids(store, "order=checked_in_at.desc,id") == ["p1", "p3", "p4", "p2"]
+    assert _ids(store, "order=checked_in_at.asc,id") == ["p2", "p1", "p3", "p4"]
+
+
+def test_single_object(store):
+    headers = {"accept": OBJECT_MEDIA_TYPE}
+    _, body, _ = store.select("participants", "select=id,status&id=eq.p1", headers)
+    assert body == {"id": "p1", "status": "confirmed"}
+
+    for query in ("event_id=eq.e1", "id=eq.missing"):
+        with pytest.raises(PostgrestError) as error:
+            store.select("participants", "select=id&" + query, headers)
+        assert error.value.status == 406
+        assert error.value.code == "PGRST116"
+
+
+def test_upsert_on_conflict(store):
+    query = "on_conflict=participant_id,schedule_id"
+    merge = {"prefer": "resolution=merge-duplicates,return=representation"}
+
+    status, body, _ = store.insert(
+        "participant_schedules", query, merge, {"participant_id": "p1", "schedule_id": "s1", "attended": True}
+    )
+    assert status == 201
+    assert body[0]["id"] == "ps1" and body[0]["attended"] is True
+    assert len(store.tables["participant_schedules"]) == 1
+
+    _, body, _ = store.insert(
+        "participant_schedules", query, merge, [{"participant_id": "p2", "schedule_id": "s1"}]
+    )
+    assert body[0]["id"] != "ps1"
+    assert len(store.tables["participant_schedules"]) == 2
+
+    ignore = {"prefer": "resolution=ignore-duplicates,return=representation"}
+    _, body, _ = store.insert(
+        "participant_schedules", query, ignore, {"participant_id": "p1", "schedule_id": "s1", "attended": False}
+    )
+    assert body[0]["attended"] is True
+    assert len(store.tables["participant_schedules"]) == 2
+
+    status, body, _ = store.insert("participant_schedules", "", {}, {"participant_id": "p1", "schedule_id": "s1"})
+    assert (status, body) == (201, None)
+    assert len(store.tables["participant_schedules"]) == 3
+
+
+def test_writes_keep_indexes_current(store):
+    assert _ids(store, "event_id=eq.e2") == ["p4"]
+    assert _ids(store, "id=eq.p2") == ["p2"]
+
+    status, body, _ = store.update("participants", "id=eq.p2&select=id,event_id", REPRESENTATION, {"event_id": "e2"})
+    assert (status, body) == (200, [{"id": "p2", "event_id": "e2"}])
+    assert _ids(store, "event_id=eq.e2") == ["p2", "p4"]
+    assert _ids(store, "event_id=eq.e1") == ["p1", "p3"]
+
+    _, body, _ = store.insert("participants", "", REPRESENTATION, {"event_id": "e2", "first_name": "Tal"})
+    new_id = body[0]["id"]
+    assert _ids(store, f"id=eq.{new_id}") == [new_id]
+    assert len(_ids(store, "event_id=eq.e2")) == 3
+
+    status, body, _ = store.delete("participants", "event_id=eq.e2&status=eq.confirmed", {})
+    assert (status, body) == (204, None)
+    assert _ids(store, "id=eq.p4") == []
+    assert sorted(_ids(store, "event_id=eq.e2")) == sorted(["p2", new_id])
@@ -0,0 +1,112 @@
+import math
+
+import pytest
+
+from eventflow_probe import queries
+
+REST = "http://127.0.0.1:54321/rest/v1"
+
+
+def _record(url, start_ms=0.0, end_ms=10.0, method="GET", **extra):
+    kind, name = queries.classify(url)
+    shape, literals = queries.query_shape(method, url)
+    return {"kind": kind, "name": name, "method": method, "shape": shape, "literals": literals,
+            "start_ms": start_ms, "end_ms": end_ms, "bytes": 100, "standin_ms": None, "failed": False, **extra}
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        (f"{REST}/participants?select=*", ("table", "participants")),
+        (f"{REST}/rpc/get_event_stats", ("rpc", "get_event_stats")),
+        ("http://127.0.0.1:54321/functions/v1/send-whatsapp", ("function", "send-whatsapp")),
+        ("http://127.0.0.1:54321/auth/v1/token?grant_type=refresh_token", ("auth", "token")),
+        ("http://localhost:5173/src/main.tsx", None),
+    ],
+)
+def test_classify(url, expected):
+    assert queries.classify(url) == expected
+
+
+def test_eq_literals_collapse_to_one_shape():
+    urls = [f"{REST}/participants?select=id,name&id=eq.{value}" for value in ("A", "B", "A")]
+    summary = queries.summarize([_record(url) for url in urls])
+
+    assert summary["distinct_shapes"] == 1
+    assert summary["repeated_shapes"] == [
+        {"shape": "GET table:participants?id=eq.?&select=id,name", "count": 3, "distinct_values": 2}
+    ]
+
+
+def test_in_lists_of_any_size_share_a_shape():
+    small, small_literals = queries.query_shape("GET", f"{REST}/schedules?id=in.(a,b)&select=id")
+    large, large_literals = queries.query_shape("GET", f"{REST}/schedules?id=in.(a,b,c,d,e)&select=id")
+
+    assert small == large == "GET table:schedules?id=in.(?)&select=id"
+    assert small_literals == ("2:(a,b)",) and large_literals == ("5:(a,b,c,d,e)",)
+
+
+@pytest.mark.parametrize(
+    "query, shape",
+    [
+        ("status=not.eq.declined", "status=not.eq.?"),
+        ("or=(status.eq.confirmed,name.ilike.*dan*)", "or=(status.eq.?,name.ilike.?)"),
+        ("or=(id.in.(a,b),and(seats.gte.2,is_vip.is.true))", "or=(id.in.?,and(seats.gte.?,is_vip.is.?))"),
+        ("order=created_at.desc&limit=20&offset=40", "limit&offset&order=created_at.desc"),
+        ("select=id,%20events(name)", "select=id,events(name)"),
+    ],
+)
+def test_shape_drops_literals(query, shape):
+    assert queries.query_shape("GET", f"{REST}/participants?{query}")[0] == f"GET table:participants?{shape}"
+
+
+def test_repeats_need_the_threshold_and_distinct_values():
+    same = [_record(f"{REST}/events?id=eq.A") for _ in range(5)]
+    pair = [_record(f"{REST}/participants?event_id=eq.{v}") for v in ("A", "B")]
+
+    assert queries.summarize(same + pair)["repeated_shapes"] == []
+    assert queries.summarize(pair, repeat_threshold=2)["repeated_shapes"][0]["distinct_values"] == 2
+
+
+def test_summary_timings():
+    records = [
+        _record(f"{REST}/events?id=eq.A", 0, 10, standin_ms=1.5),
+        _record(f"{REST}/participants?event_id=eq.A", 5, 20, standin_ms=2.0),
+        _record(f"{REST}/schedules?event_id=eq.A", 30, 40),
+        _record("http://127.0.0.1:54321/auth/v1/user", 0, 50),
+    ]
+    summary = queries.summarize(records)
+
+    assert summary["round_trips"] == 3 and summary["auth_requests"] == 1
+    assert summary["busy_ms"] == 30.0
+    assert summary["waterfall_depth"] == 2
+    assert summary["standin_ms"] == 3.5
+    assert summary["bytes"] == 300
+
+
+@pytest.mark.parametrize(
+    "counts, tolerance, expected",
+    [
+        ({100: 12, 1000: 12, 10000: 12}, 0, 0),
+        ({100: 12, 10000: 13}, 0, 1),
+        ({100: 12, 10000: 13}, 1, 0),
+        ({10000: 40, 100: 12, 1000: 20}, 5, 28),
+        ({100: 12, 10000: 10}, 0, 0),
+        ({100: 12}, 0, 0),
+    ],
+)
+def test_growth_tolerance(counts, tolerance, expected):
+    assert queries.growth(counts, tolerance) == expected
+
+
+@pytest.mark.parametrize(
+    "counts, scales",
+    [
+        ({100: 12, 10000: None}, None),
+        ({100: None, 10000: 12}, None),
+        ({100: 12}, [100, 10000]),
+        ({100: 12, 10000: 12}, [100, 1000, 10000]),
+    ],
+)
+def test_growth_counts_load_failures(counts, scales):
+    assert queries.growth(counts, tolerance=100, scales=scales) == math.inf
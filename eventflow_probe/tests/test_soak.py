@@ -0,0 +1,122 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from playwright.async_api import Error as PlaywrightError
+
+from eventflow_probe import soak
+
+ROUTES = ("/event/dashboard", "/event/guests", "/event/checkin", "/ai")
+
+
+def _samples(cycles=10, leaking="/ai", leak_bytes=500_000, leak_nodes=100):
+    samples, heap, nodes = [], 40_000_000, 3000
+    for cycle in range(cycles):
+        for index, route in enumerate(ROUTES):
+            if route == leaking:
+                heap += leak_bytes
+                nodes += leak_nodes
+            samples.append({
+                "cycle": cycle, "route": route, "t_s": cycle * 10 + index * 2.5, "error": None,
+                "heap_used_bytes": heap + (cycle % 3) * 1000, "dom_nodes": nodes + (cycle + index) % 2 * 5,
+                "listeners": 120, "detached_nodes": None, "documents": 1,
+            })
+    return samples
+
+
+def test_only_the_leaking_route_is_flagged():
+    rows = {row["route"]: row for row in soak.leak_report(_samples())}
+
+    assert [route for route, row in rows.items() if row["leak"]] == ["/ai"]
+    assert rows["/ai"]["heap_used_bytes_per_cycle"] == pytest.approx(500_000, abs=2000)
+    assert rows["/ai"]["dom_nodes_per_cycle"] == pytest.approx(100, abs=5)
+    for route in ROUTES[:-1]:
+        assert abs(rows[route]["heap_used_bytes_per_cycle"]) <= 2000
+
+
+def test_leak_is_charged_to_its_route():
+    rows = {row["route"]: row for row in soak.leak_report(_samples(leaking="/event/guests", leak_nodes=0))}
+
+    assert [route for route, row in rows.items() if row["leak"]] == ["/event/guests"]
+    assert rows["/event/guests"]["heap_used_bytes_per_cycle"] == pytest.approx(500_000, abs=2000)
+    assert rows["/event/guests"]["dom_nodes_per_cycle"] == pytest.approx(0, abs=5)
+    assert rows["/event/guests"]["heap_mb_per_hour"] > 0
+
+
+def test_no_leak_and_missing_counters():
+    rows = soak.leak_report(_samples(leak_bytes=0, leak_nodes=0), warmup_cycles=2)
+
+    assert not any(row["leak"] for row in rows)
+    assert all(row["samples"] == 8 for row in rows)
+    assert all(row["detached_nodes_per_cycle"] is None for row in rows)
+
+
+class _Session:
+    def __init__(self, page):
+        self.page = page
+
+    def on(self, event, handler):
+        pass
+
+    async def send(self, method, params=None):
+        if method == "Performance.getMetrics":
+            if self.page.visits in self.page.metrics_fail:
+                raise PlaywrightError("Target closed")
+            return {"metrics": [{"name": "JSHeapUsedSize", "value": 40_000_000 + self.page.visits}]}
+        if method == "DOM.getDetachedDomNodes":
+            return {"detachedNodes": []}
+        return {}
+
+    async def detach(self):
+        pass
+
+
+class _Page:
+    """A tab whose ``visits``-th navigation or metrics call fails on demand."""
+
+    def __init__(self, navigate_fail=(), metrics_fail=()):
+        self.navigate_fail, self.metrics_fail = set(navigate_fail), set(metrics_fail)
+        self.visits = 0
+        self.context = SimpleNamespace(new_cdp_session=self._session)
+
+    async def _session(self, page):
+        return _Session(self)
+
+    async def goto(self, url, timeout):
+        self.visits += 1
+
+    async def evaluate(self, script, path):
+        self.visits += 1
+        if self.visits in self.navigate_fail:
+            raise PlaywrightError("Execution context was destroyed, most likely because of a navigation\nmore")
+
+    async def wait_for_function(self, script, arg, timeout):
+        pass
+
+    def is_closed(self):
+        return False
+
+
+def _run(page, cycles):
+    return asyncio.run(soak.SoakRun(page, "http://app", ROUTES, dwell_ms=0).run(cycles))
+
+
+def test_failed_visits_are_recorded_and_the_run_goes_on():
+    samples = _run(_Page(navigate_fail={3}, metrics_fail={6}), cycles=2)
+
+    assert len(samples) == 8
+    assert samples[2]["error"] == "Execution context was destroyed, most likely because of a navigation"
+    assert samples[2]["heap_used_bytes"] == 40_000_003
+    assert samples[5]["error"] == "metrics: Target closed"
+    assert samples[5]["heap_used_bytes"] is None
+    assert [bool(s["error"]) for s in samples].count(True) == 2
+
+    rows = {row["route"]: row for row in soak.leak_report(samples, warmup_cycles=0)}
+    assert rows["/event/guests"]["errors"] == 1 and rows["/event/guests"]["heap_end_mb"] is not None
+
+
+def test_a_cycle_of_failures_ends_the_run():
+    samples = _run(_Page(metrics_fail=set(range(3, 100))), cycles=10)
+
+    assert len(samples) == 2 + len(ROUTES)
+    assert all(s["error"] for s in samples[2:])
@@ -0,0 +1,38 @@
+import asyncio
+import json
+
+from eventflow_probe import fixtures
+from eventflow_probe.standin import SERVICE_TIME_HEADER, SupabaseStandIn
+
+REST = "http://127.0.0.1:54321/rest/v1"
+
+
+def _standin():
+    return SupabaseStandIn(fixtures.generate(participants=20, events=1))
+
+
+def test_respond_reports_service_time():
+    standin = _standin()
+    status, text, headers = asyncio.run(standin.respond("GET", f"{REST}/events?select=id", {}, None))
+
+    assert status == 200 and len(json.loads(text)) == 1
+    assert float(headers[SERVICE_TIME_HEADER]) >= 0
+    assert standin.service_summary()["requests"] == 1
+
+
+def test_postgrest_errors_keep_their_status():
+    status, text, _ = asyncio.run(_standin().respond("GET", f"{REST}/events?select=id&order=id.upward", {}, None))
+    assert status == 400 and json.loads(text)["code"] == "PGRST100"
+
+
+def test_unexpected_errors_become_a_500(caplog):
+    standin = _standin()
+    standin.rpc_handlers["broken"] = lambda store, payload: payload["missing"]
+
+    status, text, _ = asyncio.run(standin.respond("POST", f"{REST}/rpc/broken", {}, "{}"))
+
+    body = json.loads(text)
+    assert status == 500
+    assert body["code"] == "XX000" and "KeyError" in body["message"]
+    assert set(body) == {"code", "message", "details", "hint"}
+    assert caplog.records[0].exc_info[0] is KeyError
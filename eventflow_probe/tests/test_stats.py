@@ -0,0 +1,49 @@
+import pytest
+
+from eventflow_probe import stats
+
+
+def test_percentile_interpolates():
+    assert stats.percentile([1, 2, 3, 4], 50) == 2.5
+    assert stats.percentile([5], 95) == 5
+    assert stats.percentile([], 50) is None
+
+
+def test_mann_whitney_separated_samples():
+    u, p = stats.mann_whitney_greater(list(range(1, 9)), list(range(9, 17)))
+
+    assert u == 64
+    assert p == pytest.approx(0.000470, abs=1e-6)
+
+
+def test_mann_whitney_with_ties():
+    # Tied ranks: 2s share rank 3, 3s share rank 6; tie term (3^3-3) * 2 = 48.
+    u, p = stats.mann_whitney_greater([1, 2, 2, 3], [2, 3, 3, 4])
+
+    assert u == 13
+    assert p == pytest.approx(0.08602, abs=1e-5)
+
+
+def test_mann_whitney_direction():
+    _, p_greater = stats.mann_whitney_greater(list(range(1, 9)), list(range(9, 17)))
+    _, p_smaller = stats.mann_whitney_greater(list(range(9, 17)), list(range(1, 9)))
+
+    assert p_greater < 0.001 < 0.999 < p_smaller
+
+
+def test_mann_whitney_degenerate_inputs():
+    assert stats.mann_whitney_greater([], [1, 2]) == (None, None)
+    assert stats.mann_whitney_greater([5, 5], [5, 5]) == (2.0, 1.0)
+
+
+@pytest.mark.parametrize(
+    "p_values, expected",
+    [
+        ([0.01, 0.04, 0.03, 0.005], [0.03, 0.06, 0.06, 0.02]),
+        ([0.6, 0.9], [1.0, 1.0]),
+        ([0.02], [0.02]),
+        ([], []),
+    ],
+)
+def test_holm_adjust(p_values, expected):
+    assert stats.holm_adjust(p_values) == pytest.approx(expected)